@@ -86,11 +86,59 @@ class InMemoryRepository(Repository):
 
     Stores objects in a dictionary for quick access during development
     and testing. Data is not persisted between application restarts.
+
+    Attributes listed in ``unique_indexes`` or ``indexes`` are kept in
+    secondary hash indexes so that ``get_by_attribute`` on them is O(1)
+    instead of a scan over every stored object.
     """
 
-    def __init__(self):
-        """Initialize an in-memory repository with a storage dictionary."""
+    def __init__(self, unique_indexes=None, indexes=None):
+        """
+        Initialize an in-memory repository with a storage dictionary.
+
+        Args:
+            unique_indexes (iterable, optional): Attribute names whose
+            values must be unique across stored objects
+            indexes (iterable, optional): Attribute names indexed
+            without a uniqueness constraint
+        """
         self._storage = {}
+        # valeur -> objet
+        self._unique_indexes = {
+            attr: {} for attr in (unique_indexes or ())
+        }
+        # valeur -> {id: objet}, dans l'ordre d'insertion
+        self._indexes = {attr: {} for attr in (indexes or ())}
+
+    def _check_unique(self, obj_id, values):
+        """Raise ValueError if a unique value is already used elsewhere."""
+        for attr, value in values.items():
+            if attr not in self._unique_indexes:
+                continue
+            existing = self._unique_indexes[attr].get(value)
+            if existing is not None and existing.id != obj_id:
+                raise ValueError(f"{attr} '{value}' already exists")
+
+    def _index(self, obj):
+        """Add an object to every secondary index."""
+        for attr, index in self._unique_indexes.items():
+            index[getattr(obj, attr, None)] = obj
+        for attr, index in self._indexes.items():
+            index.setdefault(getattr(obj, attr, None), {})[obj.id] = obj
+
+    def _unindex(self, obj):
+        """Remove an object from every secondary index."""
+        for attr, index in self._unique_indexes.items():
+            value = getattr(obj, attr, None)
+            if index.get(value) is obj:
+                del index[value]
+        for attr, index in self._indexes.items():
+            value = getattr(obj, attr, None)
+            bucket = index.get(value)
+            if bucket is not None:
+                bucket.pop(obj.id, None)
+                if not bucket:
+                    del index[value]
 
     def add(self, obj):
         """
@@ -98,8 +146,18 @@ class InMemoryRepository(Repository):
 
         Args:
             obj: The object to add (must have an 'id' attribute)
+
+        Raises:
+            ValueError: If a uniquely indexed attribute is already taken
         """
+        self._check_unique(obj.id, {
+            attr: getattr(obj, attr, None) for attr in self._unique_indexes
+        })
+        previous = self._storage.get(obj.id)
+        if previous is not None:
+            self._unindex(previous)
         self._storage[obj.id] = obj
+        self._index(obj)
 
     def get(self, obj_id):
         """Retrieve an object by its ID from storage."""
@@ -110,20 +168,49 @@ class InMemoryRepository(Repository):
         return list(self._storage.values())
 
     def update(self, obj_id, data):
-        """Update an object's attributes with the provided data."""
+        """
+        Update an object's attributes with the provided data.
+
+        Secondary indexes are refreshed so lookups see the new values.
+
+        Raises:
+            ValueError: If a uniquely indexed attribute is already taken
+        """
         obj = self.get(obj_id)
         if obj:
-            obj.update(data)
+            self._check_unique(obj_id, data)
+            self._unindex(obj)
+            try:
+                obj.update(data)
+            finally:
+                self._index(obj)
 
     def delete(self, obj_id):
         """Delete an object from storage by its ID."""
         if obj_id in self._storage:
-            del self._storage[obj_id]
+            self._unindex(self._storage.pop(obj_id))
 
     def get_by_attribute(self, attr_name, attr_value):
         """Retrieve the first object matching a given attribute value."""
+        if attr_name in self._unique_indexes:
+            return self._unique_indexes[attr_name].get(attr_value)
+        if attr_name in self._indexes:
+            bucket = self._indexes[attr_name].get(attr_value, {})
+            return next(iter(bucket.values()), None)
         objs = (
             obj for obj in self._storage.values()
             if getattr(obj, attr_name) == attr_value
         )
         return next(objs, None)
+
+    def get_all_by_attribute(self, attr_name, attr_value):
+        """Retrieve every object matching a given attribute value."""
+        if attr_name in self._unique_indexes:
+            obj = self._unique_indexes[attr_name].get(attr_value)
+            return [obj] if obj is not None else []
+        if attr_name in self._indexes:
+            return list(self._indexes[attr_name].get(attr_value, {}).values())
+        return [
+            obj for obj in self._storage.values()
+            if getattr(obj, attr_name) == attr_value
+        ]
@@ -17,10 +17,10 @@ class HBnBFacade:
 
     def __init__(self):
         """Initialize repositories for all entities."""
-        self.user_repo = InMemoryRepository()
-        self.place_repo = InMemoryRepository()
-        self.review_repo = InMemoryRepository()
-        self.amenity_repo = InMemoryRepository()
+        self.user_repo = InMemoryRepository(unique_indexes=('email',))
+        self.place_repo = InMemoryRepository(indexes=('title', 'owner_id'))
+        self.review_repo = InMemoryRepository(indexes=('place_id',))
+        self.amenity_repo = InMemoryRepository(indexes=('name',))
 
     # User operations
     def create_user(self, user_data):
@@ -136,10 +136,7 @@ class HBnBFacade:
         return self.review_repo.get_all()
 
     def get_reviews_by_place(self, place_id):
-        place = self.place_repo.get(place_id)
-        reviews = [r for r in self.review_repo.get_all()
-                   if r.place_id == place_id]
-        return reviews
+        return self.review_repo.get_all_by_attribute('place_id', place_id)
 
     def update_review(self, review_id, review_data):
         review = self.review_repo.get(review_id)
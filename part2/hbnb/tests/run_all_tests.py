@@ -13,6 +13,7 @@ from tests.test_user_endpoints import TestUserEndpoints
 from tests.test_amenity_endpoints import TestAmenityEndpoints
 from tests.test_place_endpoints import TestPlaceEndpoints
 from tests.test_review_endpoints import TestReviewEndpoints
+from tests.test_repository import TestInMemoryRepository
 
 # Add the parent directory to the path so we can import the app
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -27,7 +28,8 @@ def create_test_suite():
         TestUserEndpoints,
         TestAmenityEndpoints,
         TestPlaceEndpoints,
-        TestReviewEndpoints
+        TestReviewEndpoints,
+        TestInMemoryRepository
     ]
 
     for test_class in test_classes:
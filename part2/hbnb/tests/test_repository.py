@@ -0,0 +1,49 @@
+"""Test module for the in-memory repository."""
+
+import unittest
+from app.models.user import User
+from app.persistence.repository import InMemoryRepository
+
+
+class TestInMemoryRepository(unittest.TestCase):
+    """Test cases for InMemoryRepository secondary indexes."""
+
+    def setUp(self):
+        self.repo = InMemoryRepository(unique_indexes=('email',),
+                                       indexes=('last_name',))
+        self.user = User("Jane", "Doe", "jane.doe@example.com")
+        self.repo.add(self.user)
+
+    def test_get_by_unique_index(self):
+        found = self.repo.get_by_attribute('email', 'jane.doe@example.com')
+        self.assertIs(found, self.user)
+
+    def test_unique_index_rejects_duplicate(self):
+        with self.assertRaises(ValueError):
+            self.repo.add(User("John", "Doe", "jane.doe@example.com"))
+
+    def test_non_unique_index(self):
+        other = User("John", "Doe", "john.doe@example.com")
+        self.repo.add(other)
+        self.assertEqual(
+            self.repo.get_all_by_attribute('last_name', 'Doe'),
+            [self.user, other]
+        )
+
+    def test_index_follows_update_and_delete(self):
+        self.repo.update(self.user.id, {'email': 'jane@example.com'})
+        self.assertIsNone(
+            self.repo.get_by_attribute('email', 'jane.doe@example.com'))
+        self.assertIs(
+            self.repo.get_by_attribute('email', 'jane@example.com'),
+            self.user)
+
+        self.repo.delete(self.user.id)
+        self.assertIsNone(
+            self.repo.get_by_attribute('email', 'jane@example.com'))
+        self.assertEqual(self.repo.get_all_by_attribute('last_name', 'Doe'),
+                         [])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -198,10 +198,16 @@ def add_review():
 
 @app.route('/api/v1/places/', methods=['GET'])
 def get_places():
-    """Retourne la liste de tous les logements"""
+    """Retourne la liste des logements (filtres min_price/max_price)"""
+    min_price = request.args.get('min_price', type=float)
+    max_price = request.args.get('max_price', type=float)
     # Retourner une version simplifiée pour la liste
     places_list = []
     for p in PLACES:
+        if min_price is not None and p["price_per_night"] < min_price:
+            continue
+        if max_price is not None and p["price_per_night"] > max_price:
+            continue
         places_list.append({
             "id": p["id"],
             "name": p["name"],
@@ -209,6 +215,8 @@ def get_places():
             "price_per_night": p["price_per_night"],
             "image_url": p["image_url"]
         })
+    if request.args.get('sort') == 'price':
+        places_list.sort(key=lambda p: p["price_per_night"])
     return jsonify(places_list)
 
 
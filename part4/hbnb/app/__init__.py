@@ -4,12 +4,14 @@ from flask import Flask
 from flask_restx import Api
 from flask_bcrypt import Bcrypt
 from flask_sqlalchemy import SQLAlchemy
-from flask_jwt_extended import JWTManager
+from app.hashing import PasswordHasher
+from app.jwt_manager import CachingJWTManager
 
 
 bcrypt = Bcrypt()
-jwt = JWTManager()
+jwt = CachingJWTManager()
 db = SQLAlchemy()
+password_hasher = PasswordHasher(bcrypt)
 
 
 def create_app(config_class="config.DevelopmentConfig"):
@@ -29,8 +31,24 @@ def create_app(config_class="config.DevelopmentConfig"):
     app = Flask(__name__)
     app.config.from_object(config_class)
     bcrypt.init_app(app)
+    password_hasher.init_app(app)
     jwt.init_app(app)
     db.init_app(app)
+
+    if app.config.get('UNIT_OF_WORK', False):
+        from app.persistence.repository import init_unit_of_work
+        init_unit_of_work(app)
+
+    from app.services import facade
+    facade.init_app(app)
+
+    @jwt.token_in_blocklist_loader
+    def check_if_token_revoked(jwt_header, jwt_payload):
+        return facade.is_token_revoked(jwt_payload['jti'])
+
+    from app import commands
+    commands.init_app(app)
+
     api = Api(
         app,
         version='1.0',
@@ -45,6 +63,7 @@ def create_app(config_class="config.DevelopmentConfig"):
     from app.api.v1.places import api as places_ns
     from app.api.v1.auth import api as auth_ns
     from app.api.v1.protected import api as protected_ns
+    from app.api.v1.stats import api as stats_ns
 
     api.add_namespace(users_ns, path='/api/v1/users')
     api.add_namespace(amenities_ns, path='/api/v1/amenities')
@@ -52,5 +71,6 @@ def create_app(config_class="config.DevelopmentConfig"):
     api.add_namespace(places_ns, path='/api/v1/places')
     api.add_namespace(auth_ns, path='/api/v1/auth')
     api.add_namespace(protected_ns, path='/api/v1/protected')
+    api.add_namespace(stats_ns, path='/api/v1/stats')
 
     return app
@@ -1 +1,243 @@
-# This file can remain empty or contain shared API utilities
+"""Shared utilities for the API namespaces."""
+
+import hashlib
+import json
+from datetime import datetime
+from functools import wraps
+from urllib.parse import urlencode
+from flask import current_app, request, stream_with_context
+from flask_restx.utils import unpack
+from werkzeug.wrappers import Response
+
+
+def get_page_args():
+    """
+    Read the ``limit`` and ``after`` pagination query parameters.
+
+    Returns:
+        tuple: (limit, after) where after is None on the first page
+
+    Raises:
+        ValueError: If limit is not a positive integer
+    """
+    limit = request.args.get('limit', current_app.config.get('PAGE_SIZE', 50))
+    try:
+        limit = int(limit)
+    except (TypeError, ValueError):
+        raise ValueError("limit must be a positive integer")
+    if limit <= 0:
+        raise ValueError("limit must be a positive integer")
+    limit = min(limit, current_app.config.get('MAX_PAGE_SIZE', 500))
+    return limit, request.args.get('after') or None
+
+
+def page_headers(limit, next_cursor):
+    """
+    Build the response headers advertising the next page.
+
+    The body of list endpoints stays a plain JSON array; the cursor of
+    the next page is sent in ``X-Next-Cursor`` and a ``Link`` header.
+
+    Args:
+        limit (int): Page size used for the current request
+        next_cursor (str): Cursor of the next page, None on the last page
+
+    Returns:
+        dict: Headers to attach to the response
+    """
+    if not next_cursor:
+        return {}
+    args = request.args.to_dict()
+    args.update({'limit': limit, 'after': next_cursor})
+    return {
+        'X-Next-Cursor': next_cursor,
+        'Link': f'<{request.base_url}?{urlencode(args)}>; rel="next"'
+    }
+
+
+def make_etag(*parts):
+    """
+    Build a strong ETag from the values a representation depends on.
+
+    Returns:
+        str: Quoted entity tag, ready for the ``ETag`` header
+    """
+    digest = hashlib.sha256(
+        '\x1f'.join(str(part) for part in parts).encode('utf-8'))
+    return f'"{digest.hexdigest()[:32]}"'
+
+
+def entity_etag(obj, *extra):
+    """
+    Build the ETag of an entity representation.
+
+    The ID and updated_at identify a version of the row; extra adds
+    the values shown in the representation that change without
+    touching updated_at (e.g. the rating aggregates of a place).
+    """
+    updated_at = obj.updated_at.isoformat() if obj.updated_at else ''
+    return make_etag(type(obj).__name__, obj.id, updated_at, *extra)
+
+
+def list_etag(*models):
+    """
+    Build the ETag of a list response over the tables of models.
+
+    The tag covers the full query string, so each page and filter of a
+    list has its own tag, and the version of the tables, so any write
+    to them changes it.
+    """
+    from app.services import facade
+    return make_etag(request.full_path, facade.get_table_version(*models))
+
+
+def not_modified(etag):
+    """
+    Answer a conditional GET whose If-None-Match matches etag.
+
+    Call it before building the representation, so a client holding
+    the current version costs neither serialization nor bandwidth.
+
+    Returns:
+        tuple: A 304 response, or None when the client copy is stale
+    """
+    if request.if_none_match.contains_weak(etag.strip('"')):
+        return '', 304, {'ETag': etag}
+    return None
+
+
+PRECONDITION_FAILED = ({'error': 'Resource was modified, fetch it again'},
+                       412)
+
+
+def precondition_failed(etag):
+    """
+    Check the If-Match header of a write against the current etag.
+
+    Returns:
+        tuple: A 412 response when the client edited an older version,
+        None when the write may proceed (or If-Match is absent)
+    """
+    if_match = request.if_match
+    if not if_match or if_match.star_tag:
+        return None
+    if if_match.contains(etag.strip('"')):
+        return None
+    return PRECONDITION_FAILED
+
+
+def if_match_version(obj):
+    """
+    Return the updated_at a conditional write must still find.
+
+    precondition_failed() compares If-Match with the entity as read,
+    possibly from a cache; passing this value to the facade's update
+    makes the write itself conditional, so a concurrent write of the
+    same version is answered with PRECONDITION_FAILED too.
+
+    Returns:
+        datetime: updated_at of obj, or None without If-Match (or with
+        If-Match: *)
+    """
+    if_match = request.if_match
+    if not if_match or if_match.star_tag:
+        return None
+    return obj.updated_at
+
+
+def _response_cache_key():
+    """Path and query string of the request, with sorted parameters."""
+    args = sorted(request.args.items(multi=True))
+    return f"{request.path}?{urlencode(args)}"
+
+
+def cached_response(*tags, dynamic_tags=None):
+    """
+    Serve a public GET endpoint from the facade's response cache.
+
+    Successful responses are stored serialized, keyed by path and query
+    string, so a hit costs neither SQL nor JSON encoding; a hit whose
+    ETag matches If-None-Match is answered with 304. Only decorate
+    endpoints whose output does not depend on the caller.
+
+    Args:
+        *tags: Surrogate keys of the cached responses: table names for
+            lists, 'table:{view_arg}' templates for single rows, e.g.
+            'places:{place_id}'. Writes to those tables or rows purge
+            the responses (see ResponseCache.purge_writes).
+        dynamic_tags (callable, optional): Returns extra tags for the
+            current request, e.g. the tables of embedded relations
+    """
+    def decorator(method):
+        @wraps(method)
+        def wrapper(resource, *args, **kwargs):
+            from app.services import facade
+            cache = facade.response_cache
+            key = _response_cache_key()
+            entry = cache.get(key)
+            if entry is not None:
+                body, headers = entry
+                etag = headers.get('ETag')
+                if etag and request.if_none_match.contains_weak(
+                        etag.strip('"')):
+                    return current_app.response_class(
+                        status=304, headers={'ETag': etag})
+                return current_app.response_class(body, headers=headers)
+
+            generation = cache.generation
+            result = method(resource, *args, **kwargs)
+            if isinstance(result, Response):
+                return result
+            data, code, headers = unpack(result)
+            if code != 200:
+                return result
+            response = resource.api.make_response(data, code,
+                                                  headers=headers)
+            keys = [tag.format(**kwargs) for tag in tags]
+            if dynamic_tags is not None:
+                keys.extend(dynamic_tags())
+            cache.set(key, (response.get_data(), dict(response.headers)),
+                      keys, generation)
+            return response
+        return wrapper
+    return decorator
+
+
+def _json_value(value):
+    return value.isoformat() if isinstance(value, datetime) else value
+
+
+def ndjson_response(rows, columns, filename):
+    """
+    Stream rows as newline-delimited JSON, one object per line.
+
+    rows is consumed lazily by the response body, a chunk of
+    EXPORT_BATCH_SIZE lines at a time, so the first bytes leave as soon
+    as the first batch is read and memory stays bounded whatever the
+    number of rows.
+
+    Args:
+        rows (iterable): Rows exposing the attributes in columns
+        columns (tuple): Attribute names written for each row
+        filename (str): Suggested name of the downloaded file
+
+    Returns:
+        Response: Streamed application/x-ndjson response
+    """
+    chunk_size = current_app.config.get('EXPORT_BATCH_SIZE', 1000)
+
+    def generate():
+        lines = []
+        for row in rows:
+            lines.append(json.dumps(
+                {name: _json_value(getattr(row, name)) for name in columns},
+                separators=(',', ':')))
+            if len(lines) >= chunk_size:
+                yield '\n'.join(lines) + '\n'
+                lines = []
+        if lines:
+            yield '\n'.join(lines) + '\n'
+
+    return current_app.response_class(
+        stream_with_context(generate()), mimetype='application/x-ndjson',
+        headers={'Content-Disposition': f'attachment; filename={filename}'})
@@ -3,6 +3,13 @@
 
 from flask_restx import Namespace, Resource, fields
 from flask_jwt_extended import jwt_required, get_jwt_identity, get_jwt
+from app.api import (
+    PRECONDITION_FAILED, cached_response, entity_etag, get_page_args,
+    if_match_version, list_etag, not_modified, page_headers,
+    precondition_failed
+)
+from app.models import Amenity
+from app.persistence.repository import ConcurrentUpdateError
 from app.services import facade
 
 # Create namespace for amenity-related routes
@@ -60,17 +67,63 @@ class AmenityList(Resource):
             return {"error": "Invalid input data"}, 400
 
     @api.response(200, 'List of amenities retrieved successfully')
+    @api.response(304, 'Not modified since the ETag in If-None-Match')
+    @api.response(400, 'Invalid pagination parameters')
+    @api.doc(params={
+        'limit': 'Maximum number of items to return',
+        'after': 'Cursor returned in X-Next-Cursor by the previous page'
+    })
+    @cached_response('amenities')
     def get(self):
         """
-        Retrieve list of all amenities.
+        Retrieve a page of amenities.
 
-        Returns a list of all available amenities with their IDs and names.
+        Returns available amenities with their IDs and names. The cursor
+        of the next page, if any, is sent in the X-Next-Cursor header.
         """
-        amenities = facade.get_all_amenities()
-        if amenities is None:
-            amenities = []
-        amenities_dicts = [a.to_dict() for a in amenities]
-        return amenities_dicts, 200
+        etag = list_etag(Amenity)
+        cached = not_modified(etag)
+        if cached:
+            return cached
+        try:
+            limit, after = get_page_args()
+            amenities, next_cursor = facade.get_amenities_page(
+                limit, after, columns=('id', 'name'))
+        except ValueError as e:
+            return {"error": str(e)}, 400
+        amenities_dicts = [{'id': a.id, 'name': a.name} for a in amenities]
+        return amenities_dicts, 200, {**page_headers(limit, next_cursor),
+                                      'ETag': etag}
+
+
+@api.route('/bulk')
+class AmenityBulk(Resource):
+    """Resource for admin bulk imports."""
+
+    @jwt_required()
+    @api.expect([amenity_model])
+    @api.response(201, 'Amenities successfully imported')
+    @api.response(400, 'Invalid input data')
+    @api.response(403, 'Admin privileges required')
+    def post(self):
+        """
+        Import a list of amenities in a single transaction.
+
+        Every item is validated first; if any item is invalid nothing
+        is written and the errors are reported by item index.
+        """
+        claims = get_jwt()
+        if not claims.get('is_admin', False):
+            return {"error": "Admin privileges required"}, 403
+
+        data = api.payload
+        if not isinstance(data, list):
+            return {"error": "Expected a list"}, 400
+
+        created, errors = facade.create_amenities(data)
+        if errors:
+            return {"errors": errors}, 400
+        return {"ids": [obj.id for obj in created]}, 201
 
 
 @api.route('/<amenity_id>')
@@ -78,7 +131,9 @@ class AmenityResource(Resource):
     """Resource for individual amenity operations (GET, PUT)."""
 
     @api.response(200, 'Amenity details retrieved successfully')
+    @api.response(304, 'Not modified since the ETag in If-None-Match')
     @api.response(404, 'Amenity not found')
+    @cached_response('amenities:{amenity_id}')
     def get(self, amenity_id):
         """
         Get amenity details by ID.
@@ -92,13 +147,18 @@ class AmenityResource(Resource):
         amenity = facade.get_amenity(amenity_id)
         if amenity is None:
             return {"error": 'Amenity not found'}, 404
-        return amenity.to_dict(), 200
+        etag = entity_etag(amenity)
+        cached = not_modified(etag)
+        if cached:
+            return cached
+        return amenity.to_dict(), 200, {'ETag': etag}
 
     @jwt_required()
     @api.expect(amenity_model)
     @api.response(200, 'Amenity updated successfully')
     @api.response(404, 'Amenity not found')
     @api.response(400, 'Invalid input data')
+    @api.response(412, 'Amenity changed since the ETag in If-Match')
     def put(self, amenity_id):
         """Met à jour les informations d'une amenity"""
         current_user_id = get_jwt_identity()
@@ -116,9 +176,16 @@ class AmenityResource(Resource):
         existing_amenity = facade.get_amenity(amenity_id)
         if not existing_amenity:
             return {"error": "Amenity not found"}, 404
+        conflict = precondition_failed(entity_etag(existing_amenity))
+        if conflict:
+            return conflict
 
         try:
-            updated_amenity = facade.update_amenity(amenity_id, data)
-            return {"message": "Amenity updated successfully"}, 200
+            updated_amenity = facade.update_amenity(
+                amenity_id, data, if_match_version(existing_amenity))
+            return {"message": "Amenity updated successfully"}, 200, {
+                'ETag': entity_etag(updated_amenity)}
+        except ConcurrentUpdateError:
+            return PRECONDITION_FAILED
         except ValueError as e:
             return {"error": str(e)}, 400
@@ -1,5 +1,10 @@
 from flask_restx import Namespace, Resource, fields
-from flask_jwt_extended import create_access_token
+from flask_jwt_extended import (
+    create_access_token, create_refresh_token, get_jwt, get_jwt_identity,
+    jwt_required
+)
+from app import password_hasher
+from app.hashing import PasswordHasherBusy
 from app.services import facade
 
 api = Namespace('auth', description='Authentication operations')
@@ -14,6 +19,7 @@ login_model = api.model('Login', {
 @api.route('/login')
 class Login(Resource):
     @api.expect(login_model)
+    @api.response(503, 'Too many authentication requests')
     def post(self):
         """Authenticate user and return a JWT token"""
         credentials = api.payload
@@ -21,14 +27,57 @@ class Login(Resource):
         user = facade.get_user_by_email(credentials['email'])
 
         # Step 2: Check if the user exists and the password is correct
-        if not user or not user.verify_password(credentials['password']):
-            return {'error': 'Invalid credentials'}, 401
+        try:
+            if not user or not user.verify_password(credentials['password']):
+                return {'error': 'Invalid credentials'}, 401
+        except PasswordHasherBusy as e:
+            return {'error': str(e)}, 503, {'Retry-After': '1'}
+
+        # Re-hash at the configured cost if the stored hash uses another one
+        if password_hasher.needs_rehash(user.password):
+            try:
+                facade.rehash_password(user, credentials['password'])
+            except PasswordHasherBusy:
+                pass  # best effort, retried on the next login
 
         # Step 3: Create a JWT token with the user's id and is_admin flag
         access_token = create_access_token(
                 identity=str(user.id),   # only user ID goes here
                 additional_claims={"is_admin": user.is_admin}
         )
+        refresh_token = create_refresh_token(identity=str(user.id))
+
+        # Step 4: Return the JWT tokens to the client
+        return {
+            'access_token': access_token,
+            'refresh_token': refresh_token
+        }, 200
+
 
-        # Step 4: Return the JWT token to the client
+@api.route('/refresh')
+class Refresh(Resource):
+    @jwt_required(refresh=True)
+    @api.response(200, 'New access token issued')
+    @api.response(401, 'Unknown user')
+    def post(self):
+        """Exchange a refresh token for a new access token"""
+        # is_admin est relu : un changement de rôle prend effet ici
+        user = facade.get_user(get_jwt_identity())
+        if not user:
+            return {'error': 'Unknown user'}, 401
+        access_token = create_access_token(
+                identity=str(user.id),
+                additional_claims={"is_admin": user.is_admin}
+        )
         return {'access_token': access_token}, 200
+
+
+@api.route('/logout')
+class Logout(Resource):
+    @jwt_required(verify_type=False)
+    @api.response(200, 'Token revoked')
+    def post(self):
+        """Revoke the access or refresh token sent with the request"""
+        claims = get_jwt()
+        facade.revoke_token(claims['jti'], claims['exp'])
+        return {'message': f"{claims['type'].capitalize()} token revoked"}, 200
@@ -1,6 +1,14 @@
 """Place API endpoints for HBnB application."""
 
+from flask import current_app, request
 from flask_restx import Namespace, Resource, fields
+from app.api import (
+    PRECONDITION_FAILED, cached_response, entity_etag, get_page_args,
+    if_match_version, list_etag, ndjson_response, not_modified,
+    page_headers, precondition_failed
+)
+from app.models import Amenity, Place, Review, User
+from app.persistence.repository import ConcurrentUpdateError
 from app.services import facade
 from flask_jwt_extended import jwt_required, get_jwt_identity, get_jwt
 
@@ -48,6 +56,243 @@ place_model = api.model('Place', {
 })
 
 
+def _parse_floats(value, count, name):
+    """Parse a comma-separated list of count numbers from a query arg."""
+    try:
+        numbers = [float(part) for part in value.split(',')]
+    except ValueError:
+        numbers = []
+    if len(numbers) != count:
+        raise ValueError(f"{name} must be {count} comma-separated numbers")
+    return numbers
+
+
+# Champs sélectionnables par ?fields= et colonnes lues pour chacun
+PLACE_FIELDS = {
+    'id': ('id',),
+    'title': ('title',),
+    'description': ('description',),
+    'price': ('price',),
+    'latitude': ('latitude',),
+    'longitude': ('longitude',),
+    'owner_id': ('owner_id',),
+    'review_count': ('review_count',),
+    'average_rating': ('review_count', 'rating_sum'),
+    'rating_histogram': tuple(f'rating_{stars}' for stars in range(1, 6)),
+    'created_at': ('created_at',),
+    'updated_at': ('updated_at',),
+}
+# Champs renvoyés sans ?fields=
+LIST_FIELDS = ('id', 'title', 'price', 'review_count', 'average_rating')
+DETAIL_FIELDS = ('id', 'title', 'description', 'price', 'latitude',
+                 'longitude', 'review_count', 'average_rating',
+                 'rating_histogram')
+# Relations intégrables par ?expand= et modèle de leurs lignes
+PLACE_EXPANSIONS = {'owner': User, 'amenities': Amenity, 'reviews': Review}
+
+VIEW_PARAMS = {
+    'fields': 'Comma-separated fields to return: '
+              + ', '.join(PLACE_FIELDS),
+    'expand': 'Comma-separated relations to embed: '
+              + ', '.join(PLACE_EXPANSIONS)
+}
+
+
+def _csv_arg(name):
+    """Read a comma-separated query parameter as a list of values."""
+    value = request.args.get(name, '')
+    return list(dict.fromkeys(
+        part.strip() for part in value.split(',') if part.strip()))
+
+
+def _view_args(default_fields):
+    """
+    Read the ?fields= and ?expand= parameters of a place endpoint.
+
+    Returns:
+        tuple: (fields, expand) where fields defaults to default_fields
+
+    Raises:
+        ValueError: If a field or relation is unknown
+    """
+    fields = tuple(_csv_arg('fields')) or default_fields
+    for name in fields:
+        if name not in PLACE_FIELDS:
+            raise ValueError(f"Unknown field: {name}")
+    expand = tuple(_csv_arg('expand'))
+    for name in expand:
+        if name not in PLACE_EXPANSIONS:
+            raise ValueError(
+                f"expand must be among {', '.join(PLACE_EXPANSIONS)}")
+    return fields, expand
+
+
+def _models_of(expand):
+    """Models whose rows are embedded by the given relations."""
+    models = [PLACE_EXPANSIONS[name] for name in expand
+              if name in PLACE_EXPANSIONS]
+    # Les avis intégrés affichent le nom de leur auteur
+    if 'reviews' in expand:
+        models.append(User)
+    return list(dict.fromkeys(models))
+
+
+def _expansion_models():
+    """Models of the relations embedded by ?expand=, for cache tags."""
+    return _models_of(_csv_arg('expand'))
+
+
+def _expansion_tags():
+    return [model.__tablename__ for model in _expansion_models()]
+
+
+def _view_columns(fields, expand, *extra):
+    """Columns to load for the fields and relations of a response."""
+    names = ['id']
+    for name in fields:
+        names.extend(PLACE_FIELDS[name])
+    if 'owner' in expand:
+        names.append('owner_id')
+    names.extend(extra)
+    return tuple(dict.fromkeys(names))
+
+
+def _field_value(place, name):
+    """Value of a ?fields= field for a place or projected row."""
+    if name in ('review_count', 'average_rating'):
+        return _rating_summary(place)[name]
+    if name == 'rating_histogram':
+        return {str(stars): getattr(place, f'rating_{stars}') or 0
+                for stars in range(1, 6)}
+    value = getattr(place, name)
+    return value.isoformat() if hasattr(value, 'isoformat') else value
+
+
+def _user_summary(user):
+    if user is None:
+        return None
+    return {'id': user.id, 'first_name': user.first_name,
+            'last_name': user.last_name}
+
+
+def _render_places(places, fields, expand):
+    """
+    Serialize places with the requested fields and relations.
+
+    Relations are loaded for the whole batch at once (see
+    HBnBFacade.get_place_relations): a page with owners, amenities and
+    reviews costs a handful of queries whatever its size.
+    """
+    relations = facade.get_place_relations(places, expand) if expand else {}
+    authors = {}
+    if 'reviews' in relations:
+        authors = facade.get_review_authors(
+            review for reviews in relations['reviews'].values()
+            for review in reviews)
+    items = []
+    for place in places:
+        item = {name: _field_value(place, name) for name in fields}
+        if 'owner' in relations:
+            item['owner'] = _user_summary(relations['owner'][place.id])
+        if 'amenities' in relations:
+            item['amenities'] = [
+                {'id': amenity.id, 'name': amenity.name}
+                for amenity in relations['amenities'][place.id]
+            ]
+        if 'reviews' in relations:
+            item['reviews'] = [
+                {
+                    'id': review.id,
+                    'text': review.text,
+                    'rating': review.rating,
+                    'user': _user_summary(authors.get(review.user_id))
+                } for review in relations['reviews'][place.id]
+            ]
+        items.append(item)
+    return items
+
+
+def _rating_summary(place):
+    """Review count and average rating of a place or projected row."""
+    count = place.review_count or 0
+    return {
+        'review_count': count,
+        'average_rating': (round(place.rating_sum / count, 2)
+                           if count else None)
+    }
+
+
+def _place_etag(place, fields=DETAIL_FIELDS, expand=()):
+    """
+    ETag of a place detail, which shows its rating aggregates.
+
+    Each fields/expand view has its own tag; embedded relations add the
+    version of their tables. If-Match takes the tag of the plain view.
+    """
+    # Les agrégats des notes changent sans toucher à updated_at
+    if fields == DETAIL_FIELDS and not expand:
+        return entity_etag(place, place.rating_histogram)
+    return entity_etag(
+        place, place.rating_histogram, ','.join(fields), ','.join(expand),
+        facade.get_table_version(*_models_of(expand)))
+
+
+def _search_places_by_location(limit, after, columns):
+    """Run the near/bbox search of the query string, if any."""
+    near, bbox = request.args.get('near'), request.args.get('bbox')
+    if near and bbox:
+        raise ValueError("Use either near or bbox, not both")
+    if near:
+        latitude, longitude = _parse_floats(near, 2, 'near')
+        try:
+            radius_km = float(request.args.get('radius_km', 10))
+        except ValueError:
+            raise ValueError("radius_km must be a number")
+        max_radius = current_app.config.get('GEO_MAX_RADIUS_KM', 1000)
+        if radius_km > max_radius:
+            raise ValueError(f"radius_km must not exceed {max_radius}")
+        return facade.search_places_near(latitude, longitude, radius_km,
+                                         limit, after, columns)
+    min_lat, min_lon, max_lat, max_lon = _parse_floats(bbox, 4, 'bbox')
+    max_side = current_app.config.get('GEO_MAX_BBOX_DEG', 20)
+    # Une boîte dont min_lon > max_lon traverse l'antiméridien
+    lon_span = max_lon - min_lon + (360 if min_lon > max_lon else 0)
+    if max_lat - min_lat > max_side or lon_span > max_side:
+        raise ValueError(f"bbox sides must not exceed {max_side} degrees")
+    return facade.search_places_in_bbox(min_lat, min_lon, max_lat, max_lon,
+                                        limit, after, columns)
+
+
+# Tris acceptés par ?sort= (préfixe '-' pour l'ordre décroissant)
+PLACE_SORTS = ('price', '-price', 'created_at', '-created_at')
+
+
+def _price_arg(name):
+    """Read an optional non-negative price from the query string."""
+    value = request.args.get(name)
+    if value in (None, ''):
+        return None
+    try:
+        value = float(value)
+    except ValueError:
+        raise ValueError(f"{name} must be a number")
+    if value < 0:
+        raise ValueError(f"{name} must not be negative")
+    return value
+
+
+def _place_filter_args():
+    """Read the min_price, max_price and amenities list filters."""
+    amenities = request.args.get('amenities', '')
+    amenity_ids = list(dict.fromkeys(
+        part.strip() for part in amenities.split(',') if part.strip()))
+    return {
+        'min_price': _price_arg('min_price'),
+        'max_price': _price_arg('max_price'),
+        'amenity_ids': amenity_ids or None
+    }
+
+
 @api.route('/')
 class PlaceList(Resource):
     """Resource for place list operations (GET, POST)."""
@@ -89,45 +334,255 @@ class PlaceList(Resource):
             return {'error': 'Invalid input data'}, 400
 
     @api.response(200, 'List of places retrieved successfully')
+    @api.response(304, 'Not modified since the ETag in If-None-Match')
+    @api.response(400, 'Invalid pagination parameters')
+    @api.doc(params={
+        'limit': 'Maximum number of items to return',
+        'after': 'Cursor returned in X-Next-Cursor by the previous page',
+        'near': 'lat,lon: only places around this point, nearest first',
+        'radius_km': 'Radius of the near search in km (default 10)',
+        'bbox': 'min_lat,min_lon,max_lat,max_lon: only places in this '
+                'box, nearest to its center first',
+        'min_price': 'Only places at or above this price',
+        'max_price': 'Only places at or below this price',
+        'amenities': 'id1,id2: only places having all these amenities',
+        'sort': 'price, -price, created_at or -created_at',
+        **VIEW_PARAMS
+    })
+    @cached_response('places', dynamic_tags=_expansion_tags)
     def get(self):
-        """Retrieve a list of all places"""
-        places = facade.get_all_places()
-        return [
-            {
-                'id': place.id,
-                'title': place.title,
-                'price': place.price
-            } for place in places
-        ], 200
+        """
+        Retrieve a page of places
+
+        ?fields= picks the returned fields and ?expand= embeds the
+        owner, amenities and reviews of every place, so a client
+        renders a full page with a single request.
+        """
+        etag = list_etag(Place, *_expansion_models())
+        cached = not_modified(etag)
+        if cached:
+            return cached
+        if request.args.get('near') or request.args.get('bbox'):
+            try:
+                limit, after = get_page_args()
+                fields, expand = _view_args(
+                    LIST_FIELDS[:3] + ('latitude', 'longitude') +
+                    LIST_FIELDS[3:])
+                hits, next_cursor = _search_places_by_location(
+                    limit, after,
+                    _view_columns(fields, expand, 'latitude', 'longitude'))
+            except ValueError as e:
+                return {'error': str(e)}, 400
+            items = _render_places([place for _, place in hits], fields,
+                                   expand)
+            for item, (distance, _) in zip(items, hits):
+                item['distance_km'] = round(distance, 3)
+            return items, 200, {**page_headers(limit, next_cursor),
+                                'ETag': etag}
+
+        try:
+            limit, after = get_page_args()
+            fields, expand = _view_args(LIST_FIELDS)
+            sort = request.args.get('sort') or 'id'
+            if sort != 'id' and sort not in PLACE_SORTS:
+                raise ValueError(
+                    f"sort must be one of {', '.join(PLACE_SORTS)}")
+            places, next_cursor = facade.get_places_page(
+                limit, after, columns=_view_columns(fields, expand),
+                sort=sort, **_place_filter_args())
+        except ValueError as e:
+            return {'error': str(e)}, 400
+        return _render_places(places, fields, expand), 200, {
+            **page_headers(limit, next_cursor), 'ETag': etag}
+
+
+@api.route('/facets')
+class PlaceFacets(Resource):
+    """Resource for the amenity counts of a filtered place list."""
+
+    @api.response(200, 'Number of matching places, in total and per amenity')
+    @api.response(304, 'Not modified since the ETag in If-None-Match')
+    @api.response(400, 'Invalid filter')
+    @api.doc(params={
+        'min_price': 'Only places at or above this price',
+        'max_price': 'Only places at or below this price',
+        'amenities': 'id1,id2: only places having all these amenities'
+    })
+    @cached_response('places', 'amenities')
+    def get(self):
+        """
+        Count the places matching the list filters, per amenity.
+
+        Takes the same filters as GET /places/, whose body stays a plain
+        array, so a filter UI can show every count with one request.
+        """
+        etag = list_etag(Place, Amenity)
+        cached = not_modified(etag)
+        if cached:
+            return cached
+        try:
+            return facade.get_place_facets(**_place_filter_args()), 200, {
+                'ETag': etag}
+        except ValueError as e:
+            return {'error': str(e)}, 400
+
+
+@api.route('/search')
+class PlaceSearch(Resource):
+    """Resource for full-text search over places."""
+
+    @api.response(200, 'Matching places, best first')
+    @api.response(304, 'Not modified since the ETag in If-None-Match')
+    @api.response(400, 'Missing query or invalid pagination parameters')
+    @api.doc(params={
+        'q': 'Words to look for in titles and descriptions (prefixes '
+             'match: "pool" finds "pools")',
+        'limit': 'Maximum number of items to return',
+        'after': 'Cursor returned in X-Next-Cursor by the previous page',
+        **VIEW_PARAMS
+    })
+    @cached_response('places', dynamic_tags=_expansion_tags)
+    def get(self):
+        """Search places by keyword"""
+        etag = list_etag(Place, *_expansion_models())
+        cached = not_modified(etag)
+        if cached:
+            return cached
+        try:
+            limit, after = get_page_args()
+            fields, expand = _view_args(LIST_FIELDS)
+            places, next_cursor = facade.search_places(
+                request.args.get('q', ''), limit, after,
+                columns=_view_columns(fields, expand))
+        except ValueError as e:
+            return {'error': str(e)}, 400
+        return _render_places(places, fields, expand), 200, {
+            **page_headers(limit, next_cursor), 'ETag': etag}
+
+
+@api.route('/top')
+class PlaceTop(Resource):
+    """Resource for the best rated places."""
+
+    @api.response(200, 'Reviewed places, best Bayesian average first')
+    @api.response(304, 'Not modified since the ETag in If-None-Match')
+    @api.response(400, 'Invalid pagination parameters')
+    @api.doc(params={
+        'limit': 'Maximum number of items to return',
+        'after': 'Cursor returned in X-Next-Cursor by the previous page',
+        **VIEW_PARAMS
+    })
+    @cached_response('places', dynamic_tags=_expansion_tags)
+    def get(self):
+        """
+        Retrieve the best rated places.
+
+        Places are ranked by Bayesian average rating, which pulls the
+        average of places with few reviews towards a prior, so one
+        5-star review does not outrank fifty 4.8 averages.
+        """
+        etag = list_etag(Place, *_expansion_models())
+        cached = not_modified(etag)
+        if cached:
+            return cached
+        try:
+            limit, after = get_page_args()
+            fields, expand = _view_args(LIST_FIELDS)
+            places, next_cursor = facade.get_top_places(
+                limit, after,
+                columns=_view_columns(fields, expand, 'rating_score'))
+        except ValueError as e:
+            return {'error': str(e)}, 400
+        items = _render_places(places, fields, expand)
+        for item, place in zip(items, places):
+            item['score'] = round(place.rating_score, 3)
+        return items, 200, {**page_headers(limit, next_cursor), 'ETag': etag}
+
+
+# Colonnes des exports NDJSON
+EXPORT_COLUMNS = ('id', 'title', 'description', 'price', 'latitude',
+                  'longitude', 'owner_id', 'review_count', 'rating_sum',
+                  'created_at', 'updated_at')
+
+
+@api.route('/export')
+class PlaceExport(Resource):
+    """Resource for the admin export of every place."""
+
+    @jwt_required()
+    @api.response(200, 'Every place, one JSON object per line')
+    @api.response(403, 'Admin privileges required')
+    @api.produces(['application/x-ndjson'])
+    def get(self):
+        """
+        Export all places as NDJSON.
+
+        The body is streamed while the database is read, batch by
+        batch: the first lines arrive at once and memory does not grow
+        with the number of places.
+        """
+        claims = get_jwt()
+        if not claims.get('is_admin', False):
+            return {'error': 'Admin privileges required'}, 403
+        rows = facade.iter_places(
+            EXPORT_COLUMNS, current_app.config.get('EXPORT_BATCH_SIZE', 1000))
+        return ndjson_response(rows, EXPORT_COLUMNS, 'places.ndjson')
+
+
+@api.route('/bulk')
+class PlaceBulk(Resource):
+    """Resource for admin bulk imports."""
+
+    @jwt_required()
+    @api.expect([place_model])
+    @api.response(201, 'Places successfully imported')
+    @api.response(400, 'Invalid input data')
+    @api.response(403, 'Admin privileges required')
+    def post(self):
+        """
+        Import a list of places in a single transaction.
+
+        Every item is validated first; if any item is invalid nothing
+        is written and the errors are reported by item index.
+        """
+        claims = get_jwt()
+        if not claims.get('is_admin', False):
+            return {'error': 'Admin privileges required'}, 403
+
+        data = api.payload
+        if not isinstance(data, list):
+            return {'error': 'Expected a list'}, 400
+
+        created, errors = facade.create_places(data)
+        if errors:
+            return {'errors': errors}, 400
+        return {'ids': [obj.id for obj in created]}, 201
 
 
 @api.route('/<place_id>')
 class PlaceResource(Resource):
     @api.response(200, 'Place details retrieved successfully')
+    @api.response(304, 'Not modified since the ETag in If-None-Match')
     @api.response(404, 'Place not found')
+    @api.response(400, 'Unknown field or relation')
+    @api.doc(params=VIEW_PARAMS)
+    @cached_response('places:{place_id}', dynamic_tags=_expansion_tags)
     def get(self, place_id):
         """Get place details by ID."""
+        try:
+            fields, expand = _view_args(DETAIL_FIELDS)
+        except ValueError as e:
+            return {'error': str(e)}, 400
         place = facade.get_place(place_id)
         if not place:
             return {'error': 'Place not found'}, 404
+        etag = _place_etag(place, fields, expand)
+        cached = not_modified(etag)
+        if cached:
+            return cached
 
-        # Récupérer les amenities associées à cette place spécifique
-        place_amenities = [
-            {
-                'id': amenity.id,
-                'name': amenity.name
-            }
-            for amenity in place.amenities
-        ]
-
-        return {
-            'id': place.id,
-            'title': place.title,
-            'description': place.description,
-            'price': place.price,
-            'latitude': place.latitude,
-            'longitude': place.longitude,
-        }, 200
+        return _render_places([place], fields, expand)[0], 200, {
+            'ETag': etag}
 
     @jwt_required()
     @api.expect(place_model)
@@ -135,6 +590,7 @@ class PlaceResource(Resource):
     @api.response(404, 'Place not found')
     @api.response(400, 'Invalid input data')
     @api.response(403, 'Unauthorized action')
+    @api.response(412, 'Place changed since the ETag in If-Match')
     def put(self, place_id):
         """Update a place's information"""
         current_user_id = get_jwt_identity()
@@ -150,6 +606,9 @@ class PlaceResource(Resource):
         is_admin = claims.get('is_admin', False)
         if not is_admin and place.owner_id != current_user_id:
             return {'error': 'Unauthorized action'}, 403
+        conflict = precondition_failed(_place_etag(place))
+        if conflict:
+            return conflict
 
         # Validate input data
         if 'title' in place_data:
@@ -192,8 +651,12 @@ class PlaceResource(Resource):
                 }, 400
 
         try:
-            update_place = facade.update_place(place_id, place_data)
-            return {"message": "Place updated successfully"}, 200
+            update_place = facade.update_place(place_id, place_data,
+                                               if_match_version(place))
+            return {"message": "Place updated successfully"}, 200, {
+                'ETag': _place_etag(update_place)}
+        except ConcurrentUpdateError:
+            return PRECONDITION_FAILED
         except ValueError as e:
             return {'error': str(e)}, 400
         except Exception:
@@ -203,9 +666,15 @@ class PlaceResource(Resource):
 @api.route('/<place_id>/reviews')
 class PlaceReviewList(Resource):
     @api.response(200, 'List of reviews for the place retrieved successfully')
+    @api.response(304, 'Not modified since the ETag in If-None-Match')
     @api.response(404, 'Place not found')
+    @cached_response('places:{place_id}', 'reviews')
     def get(self, place_id):
         """Get all reviews for a specific place"""
+        etag = list_etag(Place, Review)
+        cached = not_modified(etag)
+        if cached:
+            return cached
         # Vérifier que la place existe
         place = facade.get_place(place_id)
         if not place:
@@ -218,21 +687,27 @@ class PlaceReviewList(Resource):
                 'text': review.text,
                 'rating': review.rating
             } for review in reviews
-        ], 200
+        ], 200, {'ETag': etag}
 
 
 @api.route('/<place_id>/amenities')
 class PlaceAmenityList(Resource):
     @api.response(200, 'List of amenities for the place retrieved successfully')
+    @api.response(304, 'Not modified since the ETag in If-None-Match')
     @api.response(404, 'Place not found')
+    @cached_response('places:{place_id}', 'amenities')
     def get(self, place_id):
         """Get all amenities for a specific place"""
         # Vérifier que place_id est fourni
         if not place_id:
             return {"error": "Place ID is required"}, 400
+        etag = list_etag(Place, Amenity)
+        cached = not_modified(etag)
+        if cached:
+            return cached
 
         # Vérifier que la place existe
-        place = facade.get_place(place_id)
+        place = facade.get_place(place_id, load={'amenities': 'joined'})
         if not place:
             return {"error": "Place not found"}, 404
 
@@ -242,7 +717,7 @@ class PlaceAmenityList(Resource):
                 'name': amenity.name
             } for amenity in place.amenities
         ]
-        return amenities, 200
+        return amenities, 200, {'ETag': etag}
 
     @jwt_required()
     @api.expect(amenity_link_model)
@@ -265,7 +740,7 @@ class PlaceAmenityList(Resource):
             return {"error": "Amenity name is required"}, 400
 
         # Vérifier que la place existe
-        place = facade.get_place(place_id)
+        place = facade.get_place(place_id, load={'amenities': 'joined'})
         if not place:
             return {"error": "Place not found"}, 404
 
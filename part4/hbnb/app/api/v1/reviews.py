@@ -1,6 +1,13 @@
-from flask import request
+from flask import current_app, request
 from flask_restx import Namespace, Resource, fields
 from flask_jwt_extended import jwt_required, get_jwt_identity, get_jwt
+from app.api import (
+    PRECONDITION_FAILED, cached_response, entity_etag, get_page_args,
+    if_match_version, list_etag, ndjson_response, not_modified,
+    page_headers, precondition_failed
+)
+from app.models import Review
+from app.persistence.repository import ConcurrentUpdateError
 from app.services import facade
 
 api = Namespace('reviews', description='Review operations')
@@ -42,12 +49,10 @@ class ReviewList(Resource):
                 return {"error": "You cannot review your own place"}, 400
 
             # Check if the user has already reviewed this place
-            existing_reviews = facade.get_reviews_by_place(place_id)
-            for review in existing_reviews:
-                if review.user_id == current_user_id:
-                    return {
-                        "error": "You have already reviewed this place"
-                    }, 400
+            if facade.has_reviewed_place(current_user_id, place_id):
+                return {
+                    "error": "You have already reviewed this place"
+                }, 400
 
             # Set the user_id to the authenticated user
             data['user_id'] = current_user_id
@@ -66,34 +71,115 @@ class ReviewList(Resource):
             return {"error": "Invalid input data"}, 400
 
     @api.response(200, 'List of reviews retrieved successfully')
+    @api.response(304, 'Not modified since the ETag in If-None-Match')
+    @api.response(400, 'Invalid pagination parameters')
+    @api.doc(params={
+        'limit': 'Maximum number of items to return',
+        'after': 'Cursor returned in X-Next-Cursor by the previous page'
+    })
+    @cached_response('reviews')
     def get(self):
-        """Retrieve a list of all reviews"""
-        reviews = facade.get_all_reviews()
+        """Retrieve a page of reviews"""
+        etag = list_etag(Review)
+        cached = not_modified(etag)
+        if cached:
+            return cached
+        try:
+            limit, after = get_page_args()
+            reviews, next_cursor = facade.get_reviews_page(
+                limit, after, columns=('id', 'text', 'rating'))
+        except ValueError as e:
+            return {"error": str(e)}, 400
         return [
             {
                 'id': review.id,
                 'text': review.text,
                 'rating': review.rating
             } for review in reviews
-        ], 200
+        ], 200, {**page_headers(limit, next_cursor), 'ETag': etag}
+
+
+# Colonnes des exports NDJSON
+EXPORT_COLUMNS = ('id', 'text', 'rating', 'user_id', 'place_id',
+                  'created_at', 'updated_at')
+
+
+@api.route('/export')
+class ReviewExport(Resource):
+    """Resource for the admin export of every review."""
+
+    @jwt_required()
+    @api.response(200, 'Every review, one JSON object per line')
+    @api.response(403, 'Admin privileges required')
+    @api.produces(['application/x-ndjson'])
+    def get(self):
+        """
+        Export all reviews as NDJSON.
+
+        The body is streamed while the database is read, batch by
+        batch: the first lines arrive at once and memory does not grow
+        with the number of reviews.
+        """
+        claims = get_jwt()
+        if not claims.get('is_admin', False):
+            return {"error": "Admin privileges required"}, 403
+        rows = facade.iter_reviews(
+            EXPORT_COLUMNS, current_app.config.get('EXPORT_BATCH_SIZE', 1000))
+        return ndjson_response(rows, EXPORT_COLUMNS, 'reviews.ndjson')
+
+
+@api.route('/bulk')
+class ReviewBulk(Resource):
+    """Resource for admin bulk imports."""
+
+    @jwt_required()
+    @api.expect([review_model])
+    @api.response(201, 'Reviews successfully imported')
+    @api.response(400, 'Invalid input data')
+    @api.response(403, 'Admin privileges required')
+    def post(self):
+        """
+        Import a list of reviews in a single transaction.
+
+        Every item is validated first; if any item is invalid nothing
+        is written and the errors are reported by item index.
+        """
+        claims = get_jwt()
+        if not claims.get('is_admin', False):
+            return {"error": "Admin privileges required"}, 403
+
+        data = api.payload
+        if not isinstance(data, list):
+            return {"error": "Expected a list"}, 400
+
+        created, errors = facade.create_reviews(data)
+        if errors:
+            return {"errors": errors}, 400
+        return {"ids": [obj.id for obj in created]}, 201
 
 
 @api.route('/<review_id>')
 class ReviewResource(Resource):
     @api.response(200, 'Review details retrieved successfully')
+    @api.response(304, 'Not modified since the ETag in If-None-Match')
     @api.response(404, 'Review not found')
+    @cached_response('reviews:{review_id}')
     def get(self, review_id):
         """Get review details by ID"""
         review = facade.get_review(review_id)
         if not review:
             return {"error": "Review not found"}, 404
+        etag = entity_etag(review)
+        cached = not_modified(etag)
+        if cached:
+            return cached
         return {
             'id': review.id,
             'text': review.text,
             'rating': review.rating,
             'user_id': review.user_id,
             'place_id': review.place_id
-        }, 200
+        }, 200, {'ETag': etag}
 
     @jwt_required()
     @api.expect(review_model)
@@ -101,6 +187,7 @@ class ReviewResource(Resource):
     @api.response(404, 'Review not found')
     @api.response(400, 'Invalid input data')
     @api.response(403, 'Unauthorized action')
+    @api.response(412, 'Review changed since the ETag in If-Match')
     def put(self, review_id):
         """Update a review's information"""
         current_user_id = get_jwt_identity()
@@ -116,10 +203,17 @@ class ReviewResource(Resource):
             is_admin = claims.get('is_admin', False)
             if not is_admin and review.user_id != current_user_id:
                 return {'error': 'Unauthorized action'}, 403
+            conflict = precondition_failed(entity_etag(review))
+            if conflict:
+                return conflict
 
             data = request.get_json()
-            facade.update_review(review_id, data)
-            return {"message": "Review updated successfully"}, 200
+            review = facade.update_review(review_id, data,
+                                          if_match_version(review))
+            return {"message": "Review updated successfully"}, 200, {
+                'ETag': entity_etag(review)}
+        except ConcurrentUpdateError:
+            return PRECONDITION_FAILED
         except ValueError as e:
             return {"error": str(e)}, 400
         except Exception:
@@ -0,0 +1,29 @@
+"""Runtime statistics endpoint for HBnB administrators."""
+
+from flask_restx import Namespace, Resource
+from flask_jwt_extended import jwt_required, get_jwt
+from app import jwt, password_hasher
+from app.services import facade
+
+api = Namespace('stats', description='Runtime statistics (admin only)')
+
+
+@api.route('/')
+class StatsResource(Resource):
+    """Resource exposing cache and worker pool counters."""
+
+    @jwt_required()
+    @api.response(200, 'Statistics retrieved successfully')
+    @api.response(403, 'Admin privileges required')
+    def get(self):
+        """Get cache hit/miss counters and password pool queue depth."""
+        claims = get_jwt()
+        if not claims.get('is_admin', False):
+            return {'error': 'Admin privileges required'}, 403
+        return {
+            'entity_cache': facade.cache.stats(),
+            'response_cache': facade.response_cache.stats(),
+            'jwt_claims_cache': jwt.claims_cache.stats(),
+            'password_hasher': password_hasher.stats(),
+            'token_blocklist': facade.token_blocklist.stats()
+        }, 200
@@ -1,6 +1,15 @@
 """User API endpoints for HBnB application."""
+from flask import current_app
 from flask_restx import Namespace, Resource, fields
 from flask_jwt_extended import jwt_required, get_jwt_identity, get_jwt
+from app.api import (
+    PRECONDITION_FAILED, cached_response, entity_etag, get_page_args,
+    if_match_version, list_etag, not_modified, page_headers,
+    precondition_failed
+)
+from app.hashing import PasswordHasherBusy
+from app.models import User
+from app.persistence.repository import ConcurrentUpdateError
 from app.services import facade
 
 api = Namespace('users', description='User operations')
@@ -42,6 +51,7 @@ class UserList(Resource):
     @api.response(201, 'User successfully created')
     @api.response(400, 'Email already registered')
     @api.response(400, 'Invalid input data')
+    @api.response(503, 'Too many authentication requests')
     @jwt_required(optional=True)
     def post(self):
         """
@@ -77,15 +87,34 @@ class UserList(Resource):
                 'message': 'User successfully created'
             }, 201
 
+        except PasswordHasherBusy as e:
+            return {'error': str(e)}, 503, {'Retry-After': '1'}
         except ValueError as e:
             return {'error': str(e)}, 400
         except Exception as e:
             return {'error': 'Invalid input data'}, 400
 
     @api.response(200, 'List of users retrieved successfully')
+    @api.response(304, 'Not modified since the ETag in If-None-Match')
+    @api.response(400, 'Invalid pagination parameters')
+    @api.doc(params={
+        'limit': 'Maximum number of items to return',
+        'after': 'Cursor returned in X-Next-Cursor by the previous page'
+    })
+    @cached_response('users')
     def get(self):
-        """Get list of all users."""
-        users = facade.get_all_users()
+        """Get a page of users."""
+        etag = list_etag(User)
+        cached = not_modified(etag)
+        if cached:
+            return cached
+        try:
+            limit, after = get_page_args()
+            users, next_cursor = facade.get_users_page(
+                limit, after,
+                columns=('id', 'first_name', 'last_name', 'email'))
+        except ValueError as e:
+            return {'error': str(e)}, 400
         return [
             {
                 'id': user.id,
@@ -93,7 +122,75 @@ class UserList(Resource):
                 'last_name': user.last_name,
                 'email': user.email
             } for user in users
-        ], 200
+        ], 200, {**page_headers(limit, next_cursor), 'ETag': etag}
+
+
+@api.route('/bulk')
+class UserBulk(Resource):
+    """Resource for admin bulk imports."""
+
+    @jwt_required()
+    @api.expect([user_create_model])
+    @api.response(201, 'Users successfully imported')
+    @api.response(400, 'Invalid input data')
+    @api.response(403, 'Admin privileges required')
+    def post(self):
+        """
+        Import a list of users in a single transaction.
+
+        Every item is validated first; if any item is invalid nothing
+        is written and the errors are reported by item index.
+        """
+        claims = get_jwt()
+        if not claims.get('is_admin', False):
+            return {'error': 'Admin privileges required'}, 403
+
+        data = api.payload
+        if not isinstance(data, list):
+            return {'error': 'Expected a list'}, 400
+
+        try:
+            created, errors = facade.create_users(data)
+        except PasswordHasherBusy as e:
+            return {'error': str(e)}, 503, {'Retry-After': '1'}
+        if errors:
+            return {'errors': errors}, 400
+        return {'ids': [obj.id for obj in created]}, 201
+
+
+@api.route('/provision')
+class UserProvision(Resource):
+    """Resource for admin provisioning of large user batches."""
+
+    @jwt_required()
+    @api.expect([user_create_model])
+    @api.response(201, 'Users provisioned, rejected rows reported')
+    @api.response(400, 'No user could be created')
+    @api.response(403, 'Admin privileges required')
+    @api.response(503, 'Too many authentication requests')
+    def post(self):
+        """
+        Create a large list of users, skipping the invalid rows.
+
+        Passwords are hashed on every core and users are committed in
+        batches; rejected rows are reported by item index.
+        """
+        claims = get_jwt()
+        if not claims.get('is_admin', False):
+            return {'error': 'Admin privileges required'}, 403
+
+        data = api.payload
+        if not isinstance(data, list):
+            return {'error': 'Expected a list'}, 400
+
+        batch_size = current_app.config.get('PROVISION_BATCH_SIZE', 1000)
+        try:
+            ids, errors = facade.provision_users(data, batch_size)
+        except PasswordHasherBusy as e:
+            return {'error': str(e)}, 503, {'Retry-After': '1'}
+        if errors and not ids:
+            return {'errors': errors}, 400
+        return {'created': len(ids), 'ids': ids, 'errors': errors}, 201
 
 
 @api.route('/<user_id>')
@@ -101,18 +198,24 @@ class UserResource(Resource):
     """Resource for individual user operations (GET, PUT)."""
 
     @api.response(200, 'User details retrieved successfully')
+    @api.response(304, 'Not modified since the ETag in If-None-Match')
     @api.response(404, 'User not found')
+    @cached_response('users:{user_id}')
     def get(self, user_id):
         """Get user details by ID."""
         user = facade.get_user(user_id)
         if not user:
             return {'error': 'User not found'}, 404
+        etag = entity_etag(user)
+        cached = not_modified(etag)
+        if cached:
+            return cached
         return {
             'id': user.id,
             'first_name': user.first_name,
             'last_name': user.last_name,
             'email': user.email
-        }, 200
+        }, 200, {'ETag': etag}
 
     @jwt_required()
     @api.expect(user_update_model, validate=True)
@@ -120,6 +223,7 @@ class UserResource(Resource):
     @api.response(404, 'User not found')
     @api.response(400, 'Invalid input data')
     @api.response(403, 'Unauthorized action')
+    @api.response(412, 'User changed since the ETag in If-Match')
     def put(self, user_id):
         """
         Update a user by ID.
@@ -152,10 +256,20 @@ class UserResource(Resource):
             existing_user = facade.get_user(user_id)
             if not existing_user:
                 return {'error': 'User not found'}, 404
+            conflict = precondition_failed(entity_etag(existing_user))
+            if conflict:
+                return conflict
 
             try:
-                updated_user = facade.update_user(user_id, user_data)
-                return {"message": "User successfully updated by admin"}, 200
+                updated_user = facade.update_user(
+                    user_id, user_data, if_match_version(existing_user))
+                return {
+                    "message": "User successfully updated by admin"
+                }, 200, {'ETag': entity_etag(updated_user)}
+            except ConcurrentUpdateError:
+                return PRECONDITION_FAILED
+            except PasswordHasherBusy as e:
+                return {'error': str(e)}, 503, {'Retry-After': '1'}
             except ValueError as e:
                 return {'error': str(e)}, 400
             except Exception:
@@ -169,15 +283,21 @@ class UserResource(Resource):
         existing_user = facade.get_user(user_id)
         if not existing_user:
             return {'error': 'User not found'}, 404
+        conflict = precondition_failed(entity_etag(existing_user))
+        if conflict:
+            return conflict
 
         try:
-            updated_user = facade.update_user(user_id, user_data)
+            updated_user = facade.update_user(
+                user_id, user_data, if_match_version(existing_user))
             return {
                 'id': updated_user.id,
                 'first_name': updated_user.first_name,
                 'last_name': updated_user.last_name,
                 'email': updated_user.email
-            }, 200
+            }, 200, {'ETag': entity_etag(updated_user)}
+        except ConcurrentUpdateError:
+            return PRECONDITION_FAILED
         except ValueError as e:
             return {'error': str(e)}, 400
         except Exception:
@@ -0,0 +1,63 @@
+"""Flask CLI commands for the HBnB application."""
+
+import json
+import click
+from app import db
+
+
+def init_app(app):
+    """Register the HBnB commands on the Flask CLI of app."""
+
+    @app.cli.command('upgrade-db')
+    def upgrade_db():
+        """Create missing tables, columns and indexes without touching data."""
+        from app.persistence.migrations import upgrade_schema
+        db.create_all()
+        created = upgrade_schema()
+        for name in created:
+            kind = 'column' if '.' in name else 'index'
+            click.echo(f"Created {kind} {name}")
+        click.echo(f"Schema up to date ({len(created)} change(s))")
+
+    @app.cli.command('calibrate-bcrypt')
+    @click.option('--target-ms', type=float, default=None,
+                  help='Wanted duration of one hash.')
+    def calibrate_bcrypt(target_ms):
+        """Suggest the BCRYPT_LOG_ROUNDS of the cluster for this machine."""
+        from app import password_hasher
+        if target_ms is None:
+            target_ms = app.config.get('BCRYPT_TARGET_MS', 250)
+        rounds = password_hasher.calibrate(
+            target_ms, app.config.get('BCRYPT_MIN_ROUNDS', 10),
+            app.config.get('BCRYPT_MAX_ROUNDS', 16))
+        click.echo(f"BCRYPT_LOG_ROUNDS={rounds} "
+                   f"(currently {password_hasher.rounds})")
+        click.echo("Use the same value on every node: hashes of another "
+                   "cost are recomputed at login")
+
+    @app.cli.command('provision-users')
+    @click.argument('path', type=click.File('r', encoding='utf-8'))
+    @click.option('--batch-size', type=int, default=None,
+                  help='Users committed per transaction.')
+    def provision_users(path, batch_size):
+        """Create the users of a JSON file (a list of user objects)."""
+        from app.services import facade
+        try:
+            rows = json.load(path)
+        except ValueError as e:
+            raise click.ClickException(f"Invalid JSON: {e}")
+        if not isinstance(rows, list):
+            raise click.ClickException("Expected a list of users")
+        batch_size = batch_size or app.config.get('PROVISION_BATCH_SIZE',
+                                                  1000)
+        ids, errors = facade.provision_users(rows, batch_size)
+        for error in errors:
+            click.echo(f"Row {error['index']}: {error['error']}", err=True)
+        click.echo(f"Created {len(ids)} user(s), rejected {len(errors)}")
+
+    @app.cli.command('repair-ratings')
+    def repair_ratings():
+        """Recompute the rating aggregates of every place from its reviews."""
+        from app.services import facade
+        count = facade.recompute_place_ratings()
+        click.echo(f"Recomputed rating aggregates of {count} place(s)")
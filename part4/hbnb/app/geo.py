@@ -0,0 +1,112 @@
+"""Geographic helpers: distances, bounding boxes and the grid index."""
+
+import math
+
+EARTH_RADIUS_KM = 6371.0088
+
+# Grille de cellules de CELL_DEG degrés, numérotées ligne par ligne
+# (une ligne par bande de latitude) : les cellules d'une bande qui
+# recouvrent un intervalle de longitudes ont des numéros consécutifs
+CELL_DEG = 0.1
+GRID_ROWS = int(round(180 / CELL_DEG))
+GRID_COLS = int(round(360 / CELL_DEG))
+
+# Au-delà, les bandes de latitude d'une boîte sont fusionnées en une
+# seule plage de cellules
+MAX_CELL_RANGES = 64
+
+
+def _row(latitude):
+    return min(int((latitude + 90) / CELL_DEG), GRID_ROWS - 1)
+
+
+def _col(longitude):
+    return min(int((longitude + 180) / CELL_DEG), GRID_COLS - 1)
+
+
+def geocell(latitude, longitude):
+    """
+    Return the number of the grid cell containing a point.
+
+    Args:
+        latitude (float): Latitude, -90 to 90
+        longitude (float): Longitude, -180 to 180
+
+    Returns:
+        int: Cell number, stored in the indexed Place.geocell column
+    """
+    return _row(latitude) * GRID_COLS + _col(longitude)
+
+
+def haversine_km(lat1, lon1, lat2, lon2):
+    """Return the great-circle distance between two points in km."""
+    phi1, phi2 = math.radians(lat1), math.radians(lat2)
+    dphi = phi2 - phi1
+    dlambda = math.radians(lon2 - lon1)
+    a = (math.sin(dphi / 2) ** 2 +
+         math.cos(phi1) * math.cos(phi2) * math.sin(dlambda / 2) ** 2)
+    return 2 * EARTH_RADIUS_KM * math.asin(min(1.0, math.sqrt(a)))
+
+
+def split_bbox(min_lat, min_lon, max_lat, max_lon):
+    """
+    Split a bounding box crossing the antimeridian in two.
+
+    A box whose min_lon is greater than its max_lon wraps around
+    longitude 180.
+
+    Returns:
+        list: One or two (min_lat, min_lon, max_lat, max_lon) tuples
+    """
+    if min_lon <= max_lon:
+        return [(min_lat, min_lon, max_lat, max_lon)]
+    return [(min_lat, min_lon, max_lat, 180.0),
+            (min_lat, -180.0, max_lat, max_lon)]
+
+
+def bbox_around(latitude, longitude, radius_km):
+    """
+    Return the boxes enclosing the circle of radius_km around a point.
+
+    Returns:
+        list: (min_lat, min_lon, max_lat, max_lon) tuples, two when the
+        circle crosses the antimeridian
+    """
+    dlat = math.degrees(radius_km / EARTH_RADIUS_KM)
+    min_lat, max_lat = latitude - dlat, latitude + dlat
+    if min_lat <= -90 or max_lat >= 90:
+        # Le cercle contient un pôle : toutes les longitudes
+        return [(max(min_lat, -90.0), -180.0, min(max_lat, 90.0), 180.0)]
+    dlon = math.degrees(math.asin(
+        min(1.0, math.sin(radius_km / EARTH_RADIUS_KM) /
+            math.cos(math.radians(latitude)))))
+    if dlon >= 180:
+        return [(min_lat, -180.0, max_lat, 180.0)]
+    min_lon = longitude - dlon
+    max_lon = longitude + dlon
+    if min_lon < -180:
+        min_lon += 360
+    if max_lon > 180:
+        max_lon -= 360
+    return split_bbox(min_lat, min_lon, max_lat, max_lon)
+
+
+def cell_ranges(min_lat, min_lon, max_lat, max_lon):
+    """
+    Return the geocell ranges covering a box that does not wrap.
+
+    Each latitude band of the box is one contiguous range of cells; past
+    MAX_CELL_RANGES bands, a single range from the first cell to the
+    last is returned and the caller's exact bounds do the rest.
+
+    Returns:
+        list: Inclusive (first_cell, last_cell) tuples
+    """
+    first_row, last_row = _row(min_lat), _row(max_lat)
+    first_col, last_col = _col(min_lon), _col(max_lon)
+    whole_rows = first_col == 0 and last_col == GRID_COLS - 1
+    if whole_rows or last_row - first_row + 1 > MAX_CELL_RANGES:
+        return [(first_row * GRID_COLS + first_col,
+                 last_row * GRID_COLS + last_col)]
+    return [(row * GRID_COLS + first_col, row * GRID_COLS + last_col)
+            for row in range(first_row, last_row + 1)]
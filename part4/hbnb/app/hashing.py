@@ -0,0 +1,243 @@
+"""Bounded worker pool for bcrypt password hashing."""
+
+import multiprocessing
+import os
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+
+class PasswordHasherBusy(RuntimeError):
+    """Raised when the hashing queue is full."""
+
+
+def _hash_chunk(bcrypt, passwords, rounds):
+    """Hash a list of passwords; runs in a worker process of hash_many."""
+    return [bcrypt.generate_password_hash(password, rounds).decode('utf-8')
+            for password in passwords]
+
+
+class PasswordHasher:
+    """
+    Run bcrypt hashing and verification on a dedicated thread pool.
+
+    bcrypt releases the GIL, so at most ``workers`` hashes burn CPU at
+    once whatever the number of request threads, and at most
+    ``queue_size`` more may wait for a worker. Callers beyond that get
+    PasswordHasherBusy straight away instead of tying up a request
+    thread, so a burst of logins cannot starve cheap reads.
+    """
+
+    def __init__(self, bcrypt, workers=2, queue_size=32, rounds=12,
+                 processes=None):
+        """
+        Initialize the hasher.
+
+        Args:
+            bcrypt (flask_bcrypt.Bcrypt): Extension doing the hashing
+            workers (int): Maximum number of concurrent bcrypt calls
+            queue_size (int): Maximum number of calls waiting for a worker
+            rounds (int): bcrypt cost factor (log2 of the iterations)
+            processes (int, optional): Size of the process pool used by
+            hash_many. Defaults to the number of CPUs.
+        """
+        self._bcrypt = bcrypt
+        self.processes = processes
+        self._lock = threading.Lock()
+        self._executor = None
+        self.rounds = rounds
+        self._configure(workers, queue_size)
+
+    def _configure(self, workers, queue_size):
+        """(Re)size the pool; the executor is created on first use."""
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=False)
+                self._executor = None
+            self.workers = workers
+            self.queue_size = queue_size
+            self._slots = threading.BoundedSemaphore(workers + queue_size)
+            self._pending = 0
+            self._running = 0
+            self.completed = 0
+            self.rejected = 0
+
+    def init_app(self, app):
+        """
+        Configure the pool and the cost factor from app.config.
+
+        The pool is sized by PASSWORD_HASH_WORKERS/_QUEUE_SIZE and the
+        cost is BCRYPT_LOG_ROUNDS, which must be the same on every node
+        (the calibrate-bcrypt command helps choose it).
+        """
+        self._configure(app.config.get('PASSWORD_HASH_WORKERS', 2),
+                        app.config.get('PASSWORD_HASH_QUEUE_SIZE', 32))
+        self.processes = app.config.get('PASSWORD_HASH_PROCESSES')
+        self.rounds = app.config.get('BCRYPT_LOG_ROUNDS', 12)
+
+    def calibrate(self, target_ms, min_rounds=10, max_rounds=16):
+        """
+        Pick the highest cost whose hash time stays under target_ms.
+
+        Each extra round doubles the work, so costs are timed upwards
+        from min_rounds until one exceeds the target; the total time
+        spent is about twice the target.
+
+        Args:
+            target_ms (float): Wanted duration of one hash
+            min_rounds (int): Lowest cost accepted, whatever the machine
+            max_rounds (int): Highest cost tried
+
+        Returns:
+            int: The chosen cost factor
+        """
+        rounds = min_rounds
+        while rounds < max_rounds:
+            start = time.perf_counter()
+            self._bcrypt.generate_password_hash('calibration', rounds + 1)
+            if (time.perf_counter() - start) * 1000 > target_ms:
+                break
+            rounds += 1
+        return rounds
+
+    def _submit(self, func, *args):
+        """Run func on the pool and wait for its result."""
+        if not self._slots.acquire(blocking=False):
+            with self._lock:
+                self.rejected += 1
+            raise PasswordHasherBusy(
+                "Too many authentication requests, retry later")
+        try:
+            with self._lock:
+                if self._executor is None:
+                    self._executor = ThreadPoolExecutor(
+                        max_workers=self.workers,
+                        thread_name_prefix='bcrypt')
+                self._pending += 1
+                executor = self._executor
+            return executor.submit(self._run, func, *args).result()
+        finally:
+            with self._lock:
+                self._pending -= 1
+            self._slots.release()
+
+    def _run(self, func, *args):
+        """Worker side of _submit, keeping the running counter."""
+        with self._lock:
+            self._running += 1
+        try:
+            return func(*args)
+        finally:
+            with self._lock:
+                self._running -= 1
+                self.completed += 1
+
+    def hash(self, password):
+        """
+        Hash a password on the pool.
+
+        Returns:
+            str: The bcrypt hash
+
+        Raises:
+            PasswordHasherBusy: If the queue is full
+        """
+        return self._submit(self._bcrypt.generate_password_hash,
+                            password, self.rounds).decode('utf-8')
+
+    def hash_many(self, passwords):
+        """
+        Hash a batch of passwords on every core.
+
+        This is meant for bulk imports, not request traffic: the batch is
+        split across a process pool started for the call (bcrypt
+        releases the GIL, but the request pool is deliberately small),
+        bypassing the bounded queue. Small batches, which would not pay
+        for starting the processes, go through hash() instead.
+
+        Args:
+            passwords (list): Passwords to hash
+
+        Returns:
+            list: bcrypt hashes, in the order of passwords
+
+        Raises:
+            ValueError: If a password is empty
+            PasswordHasherBusy: If a small batch finds the queue full
+        """
+        passwords = list(passwords)
+        processes = self.processes or os.cpu_count() or 1
+        if processes < 2 or len(passwords) < 4 * processes:
+            return [self.hash(password) for password in passwords]
+
+        # Quelques morceaux par processus pour équilibrer la charge
+        size = -(-len(passwords) // (4 * processes))
+        chunks = [passwords[i:i + size]
+                  for i in range(0, len(passwords), size)]
+        # spawn : pas de fork d'un processus qui a déjà des threads
+        context = multiprocessing.get_context('spawn')
+        with ProcessPoolExecutor(max_workers=processes,
+                                 mp_context=context) as executor:
+            results = executor.map(_hash_chunk,
+                                   [self._bcrypt] * len(chunks), chunks,
+                                   [self.rounds] * len(chunks))
+            hashes = [h for chunk in results for h in chunk]
+        with self._lock:
+            self.completed += len(hashes)
+        return hashes
+
+    def verify(self, password_hash, password):
+        """
+        Check a password against a bcrypt hash on the pool.
+
+        Returns:
+            bool: True if the password matches, False otherwise
+            (including when the stored hash is malformed)
+
+        Raises:
+            PasswordHasherBusy: If the queue is full
+        """
+        def check():
+            try:
+                return self._bcrypt.check_password_hash(password_hash,
+                                                        password)
+            except ValueError:
+                return False
+        return self._submit(check)
+
+    def needs_rehash(self, password_hash):
+        """
+        Tell whether a stored hash uses another cost than the current one.
+
+        Hashes are moved to the configured cost both ways, so a cost
+        that turned out too expensive is corrected too. This relies on
+        BCRYPT_LOG_ROUNDS being the same on every node.
+
+        Args:
+            password_hash (str): bcrypt hash such as '$2b$12$...'
+
+        Returns:
+            bool: True if the hash should be recomputed at self.rounds
+        """
+        try:
+            return int(password_hash.split('$')[2]) != self.rounds
+        except (AttributeError, IndexError, ValueError):
+            return True
+
+    def stats(self):
+        """
+        Return the pool counters.
+
+        Returns:
+            dict: workers, running, queued (waiting for a worker),
+            queue_size, completed and rejected calls
+        """
+        with self._lock:
+            return {
+                'workers': self.workers,
+                'running': self._running,
+                'queued': self._pending - self._running,
+                'queue_size': self.queue_size,
+                'completed': self.completed,
+                'rejected': self.rejected
+            }
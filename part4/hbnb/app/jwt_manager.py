@@ -0,0 +1,53 @@
+"""JWT manager caching the claims of verified tokens."""
+
+import hashlib
+import time
+from flask_jwt_extended import JWTManager
+
+
+class CachingJWTManager(JWTManager):
+    """
+    JWTManager that remembers the claims of tokens it has verified.
+
+    Clients send the same token many times; a cache hit skips the
+    signature check and JSON decoding. Entries are keyed by a SHA-256
+    digest of the token (the token itself is never stored) and expire
+    with the token. Revocation callbacks still run on every request.
+    """
+
+    def __init__(self, app=None, add_context_processor=False):
+        self.claims_cache = None
+        self._claims_cache_max_ttl = 300
+        super().__init__(app, add_context_processor)
+
+    def init_app(self, app, add_context_processor=False):
+        """Register the manager and size the claims cache from config."""
+        from app.services.cache import LRUCache, NullCache
+        super().init_app(app, add_context_processor)
+        size = app.config.get('JWT_CLAIMS_CACHE_SIZE', 4096)
+        self.claims_cache = LRUCache(maxsize=size) if size else NullCache()
+        self._claims_cache_max_ttl = app.config.get(
+            'JWT_CLAIMS_CACHE_MAX_TTL', 300)
+
+    # Surcharge d'une méthode privée de flask-jwt-extended : la version
+    # est épinglée dans requirements.txt et test_jwt_cache vérifie que le
+    # point d'entrée est toujours appelé
+    def _decode_jwt_from_config(self, encoded_token, csrf_value=None,
+                                allow_expired=False):
+        if (self.claims_cache is None or csrf_value is not None or
+                allow_expired):
+            return super()._decode_jwt_from_config(
+                encoded_token, csrf_value, allow_expired)
+
+        key = hashlib.sha256(encoded_token.encode('utf-8')).digest()
+        claims = self.claims_cache.get(key)
+        if claims is not None:
+            return dict(claims)
+
+        claims = super()._decode_jwt_from_config(encoded_token)
+        ttl = self._claims_cache_max_ttl
+        if 'exp' in claims:
+            ttl = min(ttl, claims['exp'] - time.time())
+        if ttl > 0:
+            self.claims_cache.set(key, dict(claims), ttl=ttl)
+        return claims
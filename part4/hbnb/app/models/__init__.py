@@ -5,5 +5,6 @@ from .user import User
 from .amenity import Amenity
 from .place import Place
 from .review import Review
+from .revoked_token import RevokedToken
 
-__all__ = ['BaseModel', 'User', 'Amenity', 'Place', 'Review']
+__all__ = ['BaseModel', 'User', 'Amenity', 'Place', 'Review', 'RevokedToken']
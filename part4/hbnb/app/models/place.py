@@ -3,6 +3,8 @@
 
 from .base_model import BaseModel
 from app import db
+from app.geo import geocell
+from app.persistence.search import register_fts
 from sqlalchemy.orm import validates
 
 # Table d'association pour la relation many-to-many Place <-> Amenity
@@ -12,7 +14,11 @@ place_amenity = db.Table('place_amenity',
                                    primary_key=True),
                          db.Column('amenity_id', db.String(36),
                                    db.ForeignKey('amenities.id'),
-                                   primary_key=True)
+                                   primary_key=True),
+                         # Index inverse : places ayant un équipement
+                         # donné (filtre ?amenities= et facettes)
+                         db.Index('ix_place_amenity_amenity_id',
+                                  'amenity_id', 'place_id')
                          )
 
 
@@ -24,21 +30,58 @@ class Place(BaseModel):
     and amenities associated with it.
     """
     __tablename__ = 'places'
+    # Champs de la recherche plein texte (table FTS5 places_fts) et
+    # leur poids dans le classement
+    __searchable__ = ('title', 'description')
+    __search_weights__ = (10.0, 1.0)
+    # Index (colonne de tri, id) : pagination par curseur des listes
+    # triées/filtrées par prix ou par date sans tri en mémoire
+    __table_args__ = (
+        db.Index('ix_places_price_id', 'price', 'id'),
+        db.Index('ix_places_created_at_id', 'created_at', 'id'),
+        db.Index('ix_places_rating_score_id', 'rating_score', 'id'),
+    )
 
-    title = db.Column(db.String(100), nullable=False)
+    title = db.Column(db.String(100), nullable=False, index=True)
     description = db.Column(db.Text)
     price = db.Column(db.Float, nullable=False)
     latitude = db.Column(db.Float, nullable=False)
     longitude = db.Column(db.Float, nullable=False)
+    # Cellule de la grille géographique (app.geo), tenue à jour par les
+    # validateurs de latitude/longitude, pour les recherches par zone
+    geocell = db.Column(db.Integer, index=True)
+    # Agrégats des notes, tenus à jour par la façade à chaque écriture
+    # d'avis (voir PlaceRepository.apply_ratings) : nombre d'avis, somme
+    # des notes et histogramme par nombre d'étoiles
+    review_count = db.Column(db.Integer, nullable=False, default=0,
+                             server_default='0')
+    rating_sum = db.Column(db.Integer, nullable=False, default=0,
+                           server_default='0')
+    rating_1 = db.Column(db.Integer, nullable=False, default=0,
+                         server_default='0')
+    rating_2 = db.Column(db.Integer, nullable=False, default=0,
+                         server_default='0')
+    rating_3 = db.Column(db.Integer, nullable=False, default=0,
+                         server_default='0')
+    rating_4 = db.Column(db.Integer, nullable=False, default=0,
+                         server_default='0')
+    rating_5 = db.Column(db.Integer, nullable=False, default=0,
+                         server_default='0')
+    # Moyenne bayésienne des notes, NULL sans avis : clé du classement
+    # des meilleures places (GET /places/top)
+    rating_score = db.Column(db.Float)
 
     # Foreign key to User
     owner_id = db.Column(
         db.String(36),
         db.ForeignKey('users.id'),
-        nullable=False
+        nullable=False,
+        index=True
     )
 
     # Relationships
+    # Chargement paresseux par défaut : chaque requête choisit ce qu'elle
+    # charge (voir SQLAlchemyRepository.get(load=...))
     reviews = db.relationship(
         'Review',
         backref='place',
@@ -48,7 +91,7 @@ class Place(BaseModel):
     amenities = db.relationship(
         'Amenity',
         secondary=place_amenity,
-        lazy='subquery',
+        lazy='select',
         backref=db.backref('places', lazy=True)
     )
 
@@ -117,6 +160,8 @@ class Place(BaseModel):
         if (not isinstance(latitude, (int, float)) or
                 latitude < -90 or latitude > 90):
             raise ValueError("Latitude must be between -90 and 90")
+        if self.longitude is not None:
+            self.geocell = geocell(latitude, self.longitude)
         return float(latitude)
 
     @validates('longitude')
@@ -124,8 +169,23 @@ class Place(BaseModel):
         if (not isinstance(longitude, (int, float)) or
                 longitude < -180 or longitude > 180):
             raise ValueError("Longitude must be between -180 and 180")
+        if self.latitude is not None:
+            self.geocell = geocell(self.latitude, longitude)
         return float(longitude)
 
+    @property
+    def average_rating(self):
+        """Mean rating of the place's reviews, None without reviews."""
+        if not self.review_count:
+            return None
+        return self.rating_sum / self.review_count
+
+    @property
+    def rating_histogram(self):
+        """Number of reviews per rating, keyed '1' to '5'."""
+        return {str(stars): getattr(self, f'rating_{stars}') or 0
+                for stars in range(1, 6)}
+
     def add_review(self, review):
         """
         Add a review to this place.
@@ -143,3 +203,6 @@ class Place(BaseModel):
             amenity (Amenity): The amenity to add
         """
         self.amenities.append(amenity)
+
+
+register_fts(Place)
@@ -14,6 +14,12 @@ class Review(BaseModel):
     and must be associated with both a user and a place.
     """
     __tablename__ = 'reviews'
+    # Un utilisateur ne peut noter une place qu'une seule fois ; l'index
+    # de la contrainte sert aussi les recherches par user_id
+    __table_args__ = (
+        db.UniqueConstraint('user_id', 'place_id',
+                            name='uq_reviews_user_place'),
+    )
 
     text = db.Column(db.String(255), nullable=False)
     rating = db.Column(db.Integer, nullable=False)
@@ -25,7 +31,8 @@ class Review(BaseModel):
     place_id = db.Column(
         db.String(36),
         db.ForeignKey('places.id'),
-        nullable=False
+        nullable=False,
+        index=True
     )
 
     def __init__(
@@ -0,0 +1,21 @@
+#!/usr/bin/python3
+"""RevokedToken model module for the JWT blocklist."""
+
+from app import db
+
+
+class RevokedToken(db.Model):
+    """
+    A revoked JWT, identified by its jti claim.
+
+    Rows are only needed until the token would have expired anyway, so
+    expires_at is indexed for purging. revoked_at is set by the database
+    clock, shared by every process, and indexed so that each process can
+    read the revocations made by the others since its last sync.
+    """
+    __tablename__ = 'revoked_tokens'
+
+    jti = db.Column(db.String(36), primary_key=True)
+    expires_at = db.Column(db.DateTime, nullable=False, index=True)
+    # NULL pour les lignes antérieures à la colonne
+    revoked_at = db.Column(db.DateTime, default=db.func.now(), index=True)
@@ -3,8 +3,7 @@
 
 import re
 from .base_model import BaseModel
-import flask_bcrypt as bcrypt
-from app import db
+from app import db, password_hasher
 from sqlalchemy.orm import validates
 
 
@@ -75,14 +74,15 @@ class User(BaseModel):
             self.hash_password(password)
 
     # sert à enregistrer un mot de passe de façon sécurisée
+    # (le hachage tourne sur le pool borné de password_hasher)
     def hash_password(self, password):
         """Hashes the password before storing it."""
-        self.password = bcrypt.generate_password_hash(password).decode('utf-8')
+        self.password = password_hasher.hash(password)
 
     # permet de vérifier un mot de passe lors de la connexion
     def verify_password(self, password):
         """Verifies if the provided password matches the hashed password."""
-        return bcrypt.check_password_hash(self.password, password)
+        return password_hasher.verify(self.password, password)
 
     @validates('first_name')
     def validate_first_name(self, key, first_name):
@@ -0,0 +1,134 @@
+"""In-place schema upgrades for existing databases."""
+
+from flask import current_app
+from sqlalchemy import UniqueConstraint, inspect, text
+from sqlalchemy.schema import CreateColumn
+from app import db
+from app.geo import geocell
+from app.persistence.search import create_fts_table, fill_fts_table
+
+# Remplissage des colonnes ajoutées à une table existante :
+# (table, colonne) -> fonction(conn), appelée une fois toutes les
+# colonnes manquantes de la table ajoutées
+BACKFILLS = {}
+
+
+def backfill(table_name, *column_names):
+    """Register the function filling columns added by upgrade_schema."""
+    def register(func):
+        for column_name in column_names:
+            BACKFILLS[(table_name, column_name)] = func
+        return func
+    return register
+
+
+@backfill('places', 'review_count', 'rating_sum', 'rating_1', 'rating_2',
+          'rating_3', 'rating_4', 'rating_5', 'rating_score')
+def _backfill_ratings(conn):
+    from app.services.repositories.place_repository import (
+        rating_aggregate_updates, rating_prior)
+    prior = rating_prior(current_app.config)
+    for statement in rating_aggregate_updates(prior):
+        conn.execute(statement)
+
+
+@backfill('places', 'geocell')
+def _backfill_geocell(conn):
+    rows = conn.execute(text(
+        "SELECT id, latitude, longitude FROM places"
+    )).fetchall()
+    if rows:
+        conn.execute(
+            text("UPDATE places SET geocell = :cell WHERE id = :id"),
+            [{'id': row.id, 'cell': geocell(row.latitude, row.longitude)}
+             for row in rows]
+        )
+
+
+def _existing_indexes(inspector, table_name):
+    """Return the names and column tuples of a table's indexes."""
+    names, unique_columns = set(), set()
+    for index in inspector.get_indexes(table_name):
+        names.add(index['name'])
+        if index.get('unique'):
+            unique_columns.add(tuple(index['column_names']))
+    for constraint in inspector.get_unique_constraints(table_name):
+        names.add(constraint['name'])
+        unique_columns.add(tuple(constraint['column_names']))
+    return names, unique_columns
+
+
+def _add_missing_columns(conn, inspector, table):
+    """Add the declared columns a table lacks and run their backfill."""
+    existing = {column['name'] for column in inspector.get_columns(table.name)}
+    added, fills = [], []
+    for column in table.columns:
+        if column.name in existing:
+            continue
+        spec = CreateColumn(column).compile(dialect=conn.dialect)
+        conn.execute(text(f"ALTER TABLE {table.name} ADD COLUMN {spec}"))
+        fill = BACKFILLS.get((table.name, column.name))
+        if fill and fill not in fills:
+            fills.append(fill)
+        added.append(f"{table.name}.{column.name}")
+    for fill in fills:
+        fill(conn)
+    return added
+
+
+def upgrade_schema(engine=None):
+    """
+    Add the columns and indexes declared on the models to an existing
+    database.
+
+    Tables are created by db.create_all(), which leaves tables that
+    already exist untouched. This adds every declared column that is
+    missing (filled by its registered backfill, if any; a NOT NULL
+    column needs a server_default), creates every declared index that
+    is missing, and turns declared UNIQUE constraints that the table
+    lacks into unique indexes (SQLite cannot add a constraint to an
+    existing table without rebuilding it). Models declaring
+    __searchable__ get their FTS5 table, filled from existing rows.
+    Existing rows are kept.
+
+    Args:
+        engine (optional): Engine to upgrade, defaults to db.engine
+
+    Returns:
+        list: Added columns, as 'table.column', then created index and
+        full-text table names
+    """
+    engine = engine or db.engine
+    created = []
+    with engine.begin() as conn:
+        inspector = inspect(conn)
+        for table in db.metadata.sorted_tables:
+            if not inspector.has_table(table.name):
+                continue
+            created.extend(_add_missing_columns(conn, inspector, table))
+            names, unique_columns = _existing_indexes(inspector, table.name)
+            for index in table.indexes:
+                if index.name not in names:
+                    index.create(conn)
+                    created.append(index.name)
+            for constraint in table.constraints:
+                if not isinstance(constraint, UniqueConstraint):
+                    continue
+                columns = tuple(column.name for column in constraint.columns)
+                if columns in unique_columns:
+                    continue
+                name = (constraint.name or
+                        f"uq_{table.name}_{'_'.join(columns)}")
+                conn.execute(text(
+                    f"CREATE UNIQUE INDEX {name} "
+                    f"ON {table.name} ({', '.join(columns)})"
+                ))
+                created.append(name)
+        for mapper in db.Model.registry.mappers:
+            model = mapper.class_
+            if (getattr(model, '__searchable__', None) and
+                    inspector.has_table(model.__tablename__) and
+                    create_fts_table(conn, model)):
+                fill_fts_table(conn, model)
+                created.append(f"{model.__tablename__}_fts")
+    return created
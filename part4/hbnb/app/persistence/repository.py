@@ -1,6 +1,144 @@
 """Repository pattern implementation for data persistence."""
+import base64
+import json
 from abc import ABC, abstractmethod
+from datetime import datetime
+from contextlib import contextmanager
+from flask import g, has_app_context
+from sqlalchemy import DateTime, inspect, text, tuple_, update
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import (
+    joinedload, lazyload, make_transient_to_detached, noload, raiseload,
+    selectinload, subqueryload
+)
+from sqlalchemy.orm.attributes import set_committed_value
 from app import db
+from app.persistence.search import (
+    TextIndex, bm25_weights, fts_match, fts_table, has_fts, like_criteria
+)
+
+# Taille maximale d'une clause IN (limite de variables de SQLite)
+IN_CHUNK_SIZE = 500
+
+# Stratégies de chargement des relations, par nom
+LOADER_STRATEGIES = {
+    'select': lazyload,
+    'selectin': selectinload,
+    'joined': joinedload,
+    'subquery': subqueryload,
+    'raise': raiseload,
+    'noload': noload
+}
+
+
+def encode_cursor(values):
+    """
+    Encode the sort key of the last row of a page as an opaque cursor.
+
+    Args:
+        values (list): JSON-serializable sort key values
+
+    Returns:
+        str: URL-safe cursor string
+    """
+    raw = json.dumps(values, separators=(',', ':')).encode('utf-8')
+    return base64.urlsafe_b64encode(raw).decode('ascii').rstrip('=')
+
+
+def decode_cursor(cursor, size=1):
+    """
+    Decode a cursor produced by encode_cursor.
+
+    Args:
+        cursor (str): Cursor string received from a client
+        size (int, optional): Expected number of sort key values
+
+    Returns:
+        list: The sort key values stored in the cursor
+
+    Raises:
+        ValueError: If the cursor is malformed
+    """
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode('ascii')))
+    except (ValueError, TypeError, UnicodeError):
+        raise ValueError("Invalid cursor")
+    if not isinstance(values, list) or len(values) != size:
+        raise ValueError("Invalid cursor")
+    return values
+
+
+def _to_cursor_value(value):
+    """Make a sort key value JSON-serializable (datetimes as ISO 8601)."""
+    return value.isoformat() if isinstance(value, datetime) else value
+
+
+class ConcurrentUpdateError(RuntimeError):
+    """Raised when a conditional update finds the row already changed."""
+
+
+def in_unit_of_work():
+    """Return True when a unit of work owns the current transaction."""
+    return has_app_context() and g.get('unit_of_work', False)
+
+
+@contextmanager
+def unit_of_work():
+    """
+    Group every repository write of a block into one transaction.
+
+    Inside the block SQLAlchemy repositories only flush; the block
+    commits once on success and rolls back on any exception. Nested
+    blocks join the outer transaction.
+
+    Yields:
+        The SQLAlchemy session
+    """
+    outer = in_unit_of_work()
+    g.unit_of_work = True
+    try:
+        yield db.session
+        if not outer:
+            db.session.commit()
+    except Exception:
+        if not outer:
+            db.session.rollback()
+        raise
+    finally:
+        g.unit_of_work = outer
+
+
+def init_unit_of_work(app):
+    """
+    Make each request of app a single unit of work.
+
+    Repositories flush during the request and the transaction is
+    committed once after the view returns, or rolled back if the
+    response is an error.
+    """
+    @app.before_request
+    def begin_unit_of_work():
+        g.unit_of_work = True
+
+    @app.after_request
+    def end_unit_of_work(response):
+        if not g.pop('unit_of_work', False):
+            return response
+        if response.status_code >= 400:
+            db.session.rollback()
+            return response
+        try:
+            db.session.commit()
+        except Exception:
+            db.session.rollback()
+            raise
+        return response
+
+    @app.teardown_request
+    def discard_unit_of_work(exc):
+        if g.pop('unit_of_work', False):
+            db.session.rollback()
 
 
 class Repository(ABC):
@@ -34,6 +172,19 @@ class Repository(ABC):
         """
         pass
 
+    @abstractmethod
+    def get_many(self, obj_ids):
+        """
+        Retrieve several objects by their IDs in one lookup.
+
+        Args:
+            obj_ids (iterable): The unique identifiers of the objects
+
+        Returns:
+            dict: Found objects keyed by ID (missing IDs are absent)
+        """
+        pass
+
     @abstractmethod
     def get_all(self):
         """
@@ -45,13 +196,56 @@ class Repository(ABC):
         pass
 
     @abstractmethod
-    def update(self, obj_id, data):
+    def iter_all(self, columns=None, batch_size=1000):
+        """
+        Iterate over all objects without loading them all at once.
+
+        Args:
+            columns (iterable, optional): Attribute names to load, as in
+            get_page
+            batch_size (int, optional): Rows fetched per round trip
+
+        Yields:
+            The objects (or projected rows) ordered by ID
+        """
+        pass
+
+    @abstractmethod
+    def get_page(self, limit, after=None, columns=None, order_by='id',
+                 ranges=None):
+        """
+        Retrieve one page of objects ordered by ID (keyset pagination).
+
+        Args:
+            limit (int): Maximum number of objects to return
+            after (str, optional): Cursor returned with the previous page
+            columns (iterable, optional): Attribute names to load; when
+            given, implementations may return lightweight rows exposing
+            only those attributes instead of full objects
+            order_by (str, optional): Attribute to sort by before the ID,
+            prefixed with '-' for descending order
+            ranges (dict, optional): Attribute name to inclusive
+            (low, high) bounds, None meaning unbounded
+
+        Returns:
+            tuple: (list of objects, cursor of the next page or None)
+        """
+        pass
+
+    @abstractmethod
+    def update(self, obj_id, data, expected_updated_at=None):
         """
         Update an object with new data by its ID.
 
         Args:
             obj_id (str): The unique identifier of the object
             data (dict): Dictionary containing the new data
+            expected_updated_at (datetime, optional): Only update the
+            object if it still has this updated_at (e.g. the version an
+            If-Match header was checked against)
+
+        Raises:
+            ConcurrentUpdateError: If the object was changed since
         """
         pass
 
@@ -65,6 +259,83 @@ class Repository(ABC):
         """
         pass
 
+    @abstractmethod
+    def add_many(self, objs):
+        """
+        Add several objects to the repository in a single operation.
+
+        Args:
+            objs (list): The objects to add
+        """
+        pass
+
+    @abstractmethod
+    def add_in_batches(self, objs, batch_size):
+        """
+        Add objects in independent transactions of batch_size objects.
+
+        Args:
+            objs (list): The objects to add
+            batch_size (int): Number of objects per transaction
+
+        Returns:
+            tuple: (IDs of the added objects, list of (start, stop, error)
+            for every slice of objs that could not be added)
+        """
+        pass
+
+    @abstractmethod
+    def update_many(self, updates):
+        """
+        Update several objects in a single operation.
+
+        Args:
+            updates (dict): Mapping of object ID to the new data
+        """
+        pass
+
+    @abstractmethod
+    def delete_many(self, obj_ids):
+        """
+        Delete several objects in a single operation.
+
+        Args:
+            obj_ids (list): The unique identifiers of the objects
+        """
+        pass
+
+    @abstractmethod
+    def index_text(self, *objs):
+        """
+        Add objects to the full-text index, or refresh their entry.
+
+        Args:
+            *objs: Objects created or updated
+        """
+        pass
+
+    @abstractmethod
+    def search(self, query, limit, after=None, columns=None):
+        """
+        Retrieve one page of full-text search results, best first.
+
+        Every word of the query must match the start of an indexed
+        word (prefix matching).
+
+        Args:
+            query (str): Words to look for
+            limit (int): Maximum number of objects to return
+            after (str, optional): Cursor returned with the previous page
+            columns (iterable, optional): Attribute names to load
+
+        Returns:
+            tuple: (list of objects, cursor of the next page or None)
+
+        Raises:
+            ValueError: If the query has no word or the cursor is invalid
+        """
+        pass
+
     @abstractmethod
     def get_by_attribute(self, attr_name, attr_value):
         """
@@ -88,9 +359,17 @@ class InMemoryRepository(Repository):
     and testing. Data is not persisted between application restarts.
     """
 
-    def __init__(self):
-        """Initialize an in-memory repository with a storage dictionary."""
+    def __init__(self, text_fields=(), text_weights=None):
+        """
+        Initialize an in-memory repository with a storage dictionary.
+
+        Args:
+            text_fields (tuple, optional): Attributes indexed for search()
+            text_weights (tuple, optional): Ranking weight of each field
+        """
         self._storage = {}
+        self._text_index = (TextIndex(text_fields, text_weights)
+                            if text_fields else None)
 
     def add(self, obj):
         """
@@ -105,20 +384,103 @@ class InMemoryRepository(Repository):
         """Retrieve an object by its ID from storage."""
         return self._storage.get(obj_id)
 
+    def get_many(self, obj_ids):
+        """Retrieve several objects by their IDs from storage."""
+        return {obj_id: self._storage[obj_id] for obj_id in obj_ids
+                if obj_id in self._storage}
+
     def get_all(self):
         """Return a list of all stored objects."""
         return list(self._storage.values())
 
-    def update(self, obj_id, data):
+    def iter_all(self, columns=None, batch_size=1000):
+        """Yield the stored objects ordered by ID."""
+        for obj_id in sorted(self._storage):
+            obj = self._storage.get(obj_id)
+            if obj is not None:
+                yield obj
+
+    def get_page(self, limit, after=None, columns=None, order_by='id',
+                 ranges=None):
+        """Return one page of stored objects ordered by order_by, then ID."""
+        descending = order_by.startswith('-')
+        names = list(dict.fromkeys([order_by.lstrip('-'), 'id']))
+
+        def key(obj):
+            return [_to_cursor_value(getattr(obj, name)) for name in names]
+
+        objs = list(self._storage.values())
+        for name, (low, high) in (ranges or {}).items():
+            objs = [obj for obj in objs
+                    if (low is None or getattr(obj, name) >= low) and
+                    (high is None or getattr(obj, name) <= high)]
+        objs.sort(key=key, reverse=descending)
+        if after is not None:
+            last = decode_cursor(after, len(names))
+            objs = [obj for obj in objs
+                    if (key(obj) < last if descending else key(obj) > last)]
+        items = objs[:limit]
+        next_cursor = None
+        if len(objs) > limit:
+            next_cursor = encode_cursor(key(items[-1]))
+        return items, next_cursor
+
+    def update(self, obj_id, data, expected_updated_at=None):
         """Update an object's attributes with the provided data."""
         obj = self.get(obj_id)
         if obj:
+            if (expected_updated_at is not None and
+                    obj.updated_at != expected_updated_at):
+                raise ConcurrentUpdateError(
+                    f"{type(obj).__name__} {obj_id} was modified")
             obj.update(data)
 
     def delete(self, obj_id):
         """Delete an object from storage by its ID."""
         if obj_id in self._storage:
             del self._storage[obj_id]
+            if self._text_index is not None:
+                self._text_index.remove(obj_id)
+
+    def add_many(self, objs):
+        """Add several objects to storage."""
+        for obj in objs:
+            self.add(obj)
+
+    def add_in_batches(self, objs, batch_size):
+        """Add objects to storage; storage has no transactions to split."""
+        self.add_many(objs)
+        return [obj.id for obj in objs], []
+
+    def update_many(self, updates):
+        """Update several objects with their respective data."""
+        for obj_id, data in updates.items():
+            self.update(obj_id, data)
+
+    def delete_many(self, obj_ids):
+        """Delete several objects from storage by their IDs."""
+        for obj_id in obj_ids:
+            self.delete(obj_id)
+
+    def index_text(self, *objs):
+        """Add objects to the token index, replacing their old entry."""
+        if self._text_index is not None:
+            for obj in objs:
+                self._text_index.index(obj)
+
+    def search(self, query, limit, after=None, columns=None):
+        """Return one page of the objects matching query, best first."""
+        if self._text_index is None:
+            raise ValueError("This repository has no text fields")
+        hits = self._text_index.search(query)
+        if after is not None:
+            last = decode_cursor(after, 2)
+            hits = [hit for hit in hits if list(hit) > last]
+        page = hits[:limit]
+        next_cursor = None
+        if len(hits) > limit:
+            next_cursor = encode_cursor(list(page[-1]))
+        return [self._storage[obj_id] for _, obj_id in page], next_cursor
 
     def get_by_attribute(self, attr_name, attr_value):
         """Retrieve the first object matching a given attribute value."""
@@ -133,33 +495,433 @@ class SQLAlchemyRepository(Repository):
     def __init__(self, model):
         self.model = model
 
+    def _commit(self):
+        """Commit, or only flush when a unit of work owns the transaction."""
+        if in_unit_of_work():
+            db.session.flush()
+        else:
+            db.session.commit()
+
+    @contextmanager
+    def _all_or_nothing(self):
+        """
+        Apply the writes of a block atomically.
+
+        Outside a unit of work the block is committed, or rolled back on
+        error. Inside one, it runs in a SAVEPOINT: a failure only undoes
+        the block and the enclosing unit of work decides what happens to
+        the writes made before it.
+        """
+        if in_unit_of_work():
+            with db.session.begin_nested():
+                yield
+            return
+        try:
+            yield
+            db.session.commit()
+        except Exception:
+            db.session.rollback()
+            raise
+
+    def _loader_options(self, load):
+        """
+        Turn a {relationship: strategy} mapping into loader options.
+
+        Args:
+            load (dict): Relationship names mapped to one of the keys of
+            LOADER_STRATEGIES, e.g. {'amenities': 'selectin'}
+
+        Raises:
+            ValueError: If a relationship or strategy is unknown
+        """
+        options = []
+        for name, strategy in (load or {}).items():
+            if strategy not in LOADER_STRATEGIES:
+                raise ValueError(f"Unknown loading strategy '{strategy}'")
+            if name not in inspect(self.model).relationships:
+                raise ValueError(f"Unknown relationship '{name}'")
+            options.append(
+                LOADER_STRATEGIES[strategy](getattr(self.model, name))
+            )
+        return options
+
     def add(self, obj):
         db.session.add(obj)
-        db.session.commit()
+        self._commit()
 
-    def get(self, obj_id):
-        return self.model.query.get(obj_id)
+    def get(self, obj_id, load=None):
+        """
+        Retrieve a row by primary key.
 
-    def get_all(self):
-        return self.model.query.all()
+        Args:
+            obj_id (str): The unique identifier of the row
+            load (dict, optional): Relationship loading strategies, see
+            _loader_options. Ignored if the row is already in the
+            session, whose relationships then load lazily.
+        """
+        return db.session.get(self.model, obj_id,
+                              options=self._loader_options(load))
+
+    def get_many(self, obj_ids, load=None):
+        """
+        Retrieve several rows with a single ``WHERE id IN (...)`` query.
+
+        Lists longer than IN_CHUNK_SIZE are split into several queries.
+        """
+        return {obj.id: obj for obj in self._get_in(set(obj_ids), load)}
 
-    def update(self, obj_id, data):
+    def get_all(self, load=None):
+        return self.model.query.options(*self._loader_options(load)).all()
+
+    def iter_all(self, columns=None, batch_size=1000):
+        """
+        Stream every row ordered by ID, batch_size rows at a time.
+
+        The query runs with yield_per, so rows are fetched from the
+        cursor as they are consumed (a server-side cursor on drivers
+        that have one) instead of being loaded into a list: memory
+        stays bounded by one batch whatever the table size. Projected
+        columns also keep the identity map empty.
+        """
+        if columns is not None:
+            query = self.project(columns)
+        else:
+            query = self.model.query
+        query = query.order_by(self.model.id).execution_options(
+            yield_per=batch_size)
+        yield from query
+
+    def project(self, columns):
+        """
+        Build a query selecting only the named columns.
+
+        Rows come back as lightweight named tuples (``row.title``): no
+        ORM instance is built, nothing enters the identity map and no
+        relationship loader runs.
+
+        Args:
+            columns (iterable): Column attribute names of the model
+
+        Returns:
+            Query: The projected query, ready to be filtered
+        """
+        return db.session.query(
+            *[getattr(self.model, name) for name in columns]
+        )
+
+    def get_page(self, limit, after=None, columns=None, load=None,
+                 order_by='id', ranges=None, criteria=()):
+        """
+        Retrieve one page of rows ordered by primary key.
+
+        The cursor holds the last ID seen, so every page is an index
+        range scan (``WHERE id > :after ORDER BY id LIMIT :limit``)
+        whatever its depth. With columns, rows are projected (see
+        project); the ID and the sort column are always selected.
+        Otherwise load sets the relationship loading strategies of the
+        returned objects.
+
+        With order_by (e.g. 'price', or '-price' for descending), rows
+        are ordered by that column then by ID and the cursor holds both
+        values: ``WHERE (price, id) > (:price, :id)`` stays a range scan
+        of an index on (price, id). ranges adds inclusive bounds on
+        columns, e.g. {'price': (50, None)}, and criteria any other SQL
+        filter expressions.
+
+        Raises:
+            ValueError: If the cursor is malformed or order_by/ranges
+            name an unknown column
+        """
+        descending = order_by.startswith('-')
+        names = list(dict.fromkeys([order_by.lstrip('-'), 'id']))
+        table_columns = self.model.__table__.columns
+        for name in names + list(ranges or {}):
+            if name not in table_columns:
+                raise ValueError(f"Unknown column: {name}")
+        keys = [getattr(self.model, name) for name in names]
+
+        if columns is not None:
+            columns = list(columns)
+            if 'id' not in columns:
+                columns.insert(0, 'id')
+            columns.extend(name for name in names if name not in columns)
+            query = self.project(columns)
+        else:
+            query = self.model.query.options(*self._loader_options(load))
+        query = query.filter(*criteria)
+        for name, (low, high) in (ranges or {}).items():
+            if low is not None:
+                query = query.filter(getattr(self.model, name) >= low)
+            if high is not None:
+                query = query.filter(getattr(self.model, name) <= high)
+        if after is not None:
+            last = decode_cursor(after, len(names))
+            for i, name in enumerate(names):
+                if isinstance(table_columns[name].type, DateTime):
+                    try:
+                        last[i] = datetime.fromisoformat(last[i])
+                    except (TypeError, ValueError):
+                        raise ValueError("Invalid cursor")
+            if len(keys) == 1:
+                key, bound = keys[0], last[0]
+            else:
+                key, bound = tuple_(*keys), tuple_(*last)
+            query = query.filter(key < bound if descending else key > bound)
+        order = [key.desc() for key in keys] if descending else keys
+        items = query.order_by(*order).limit(limit + 1).all()
+        next_cursor = None
+        if len(items) > limit:
+            items = items[:limit]
+            next_cursor = encode_cursor(
+                [_to_cursor_value(getattr(items[-1], name)) for name in names])
+        return items, next_cursor
+
+    def update(self, obj_id, data, expected_updated_at=None):
+        """
+        Update a row through the ORM, so model validation applies.
+
+        With expected_updated_at, the row is first claimed by
+        ``UPDATE ... WHERE id = :id AND updated_at = :expected``: the
+        database takes the write lock and re-checks the version
+        atomically, so of two concurrent writes of the same version
+        only one matches a row and the other raises.
+        """
         obj = self.get(obj_id)
         if obj:
+            if expected_updated_at is not None:
+                self._claim(obj_id, expected_updated_at)
             for key, value in data.items():
                 setattr(obj, key, value)
-            db.session.commit()
+            self._commit()
+
+    def _claim(self, obj_id, expected_updated_at):
+        """Bump updated_at of a row if it still has the expected value."""
+        claimed = db.session.execute(
+            update(self.model)
+            .where(self.model.id == obj_id,
+                   self.model.updated_at == expected_updated_at)
+            .values(updated_at=datetime.utcnow())
+            .execution_options(synchronize_session=False)
+        ).rowcount
+        if not claimed:
+            # Dans une unité de travail, c'est elle qui annule
+            if not in_unit_of_work():
+                db.session.rollback()
+            raise ConcurrentUpdateError(
+                f"{self.model.__name__} {obj_id} was modified")
 
     def delete(self, obj_id):
         obj = self.get(obj_id)
         if obj:
             db.session.delete(obj)
-            db.session.commit()
+            self._unindex_text([obj_id])
+            self._commit()
+
+    def _get_in(self, obj_ids, load=None):
+        """Load the rows whose ID is in obj_ids, IN_CHUNK_SIZE at a time."""
+        obj_ids = list(obj_ids)
+        query = self.model.query.options(*self._loader_options(load))
+        objs = []
+        for start in range(0, len(obj_ids), IN_CHUNK_SIZE):
+            chunk = obj_ids[start:start + IN_CHUNK_SIZE]
+            objs.extend(query.filter(self.model.id.in_(chunk)).all())
+        return objs
+
+    def add_many(self, objs):
+        """
+        Insert several objects in one transaction.
+
+        The session batches the INSERTs into executemany calls and the
+        whole batch costs a single commit (or a flush inside a unit of
+        work). Nothing is written if any row fails.
+        """
+        with self._all_or_nothing():
+            db.session.add_all(objs)
+
+    def add_in_batches(self, objs, batch_size=1000):
+        """
+        Insert objects in independent transactions of batch_size rows.
+
+        Unlike add_many, every batch is committed on its own, even inside
+        a unit of work (whose pending writes are committed with the first
+        batch), so a failing batch is rolled back without undoing the
+        others. IDs are read after the flush: committed objects are
+        expired and reading them afterwards would cost one query each.
+
+        Returns:
+            tuple: (IDs of the inserted rows, list of (start, stop, error)
+            for every batch that was rolled back)
+        """
+        ids, failures = [], []
+        for start in range(0, len(objs), batch_size):
+            batch = objs[start:start + batch_size]
+            try:
+                db.session.add_all(batch)
+                db.session.flush()
+                batch_ids = [obj.id for obj in batch]
+                db.session.commit()
+            except SQLAlchemyError as e:
+                db.session.rollback()
+                failures.append((start, start + len(batch), e))
+            else:
+                ids.extend(batch_ids)
+        return ids, failures
+
+    def update_many(self, updates):
+        """
+        Update several rows in one transaction.
+
+        Rows are loaded with IN queries instead of one SELECT per ID,
+        then every change is flushed and committed together.
+        """
+        with self._all_or_nothing():
+            for obj in self._get_in(updates):
+                for key, value in updates[obj.id].items():
+                    setattr(obj, key, value)
+
+    def delete_many(self, obj_ids):
+        """
+        Delete several rows in one transaction.
+
+        Rows go through the ORM so relationship cascades still apply.
+        """
+        with self._all_or_nothing():
+            objs = self._get_in(obj_ids)
+            for obj in objs:
+                db.session.delete(obj)
+            self._unindex_text([obj.id for obj in objs])
+
+    def detached_copy(self, obj):
+        """
+        Copy the column values of obj into a new detached instance.
+
+        The copy never belongs to a session, so it can be kept across
+        requests (e.g. in a cache) without being expired by a commit.
+        Relationships are not copied.
+        """
+        mapper = inspect(self.model)
+        copy = mapper.class_manager.new_instance()
+        for attr in mapper.column_attrs:
+            set_committed_value(copy, attr.key, getattr(obj, attr.key))
+        make_transient_to_detached(copy)
+        return copy
+
+    def attach(self, copy):
+        """
+        Return a session-bound instance built from a detached copy.
+
+        No SQL is emitted: the current session's instance is returned if
+        it already holds this row, otherwise the copy is merged without
+        loading. Relationships are lazy-loaded on access as usual.
+        """
+        existing = db.session.identity_map.get(inspect(copy).key)
+        if existing is not None:
+            return existing
+        return db.session.merge(copy, load=False)
+
+    def _uses_fts(self):
+        """
+        Tell whether the model has an FTS5 table.
+
+        Only searchable models on SQLite do (see create_fts_table);
+        other backends search with LIKE and keep no index.
+        """
+        return (bool(getattr(self.model, '__searchable__', None)) and
+                has_fts(db.engine.dialect))
+
+    def _unindex_text(self, obj_ids):
+        """Drop the FTS5 entries of deleted rows, if the model has any."""
+        if obj_ids and self._uses_fts():
+            db.session.execute(
+                text(f"DELETE FROM {fts_table(self.model)} WHERE id = :id"),
+                [{'id': obj_id} for obj_id in obj_ids]
+            )
+
+    def index_text(self, *objs):
+        """
+        Refresh the FTS5 entries of objs, in the current transaction.
+
+        Models without an FTS5 table (see _uses_fts) have no index to
+        maintain.
+        """
+        if not self._uses_fts() or not objs:
+            return
+        table = fts_table(self.model)
+        fields = self.model.__searchable__
+        db.session.execute(
+            text(f"DELETE FROM {table} WHERE id = :id"),
+            [{'id': obj.id} for obj in objs]
+        )
+        db.session.execute(
+            text(f"INSERT INTO {table} (id, {', '.join(fields)}) VALUES "
+                 f"(:id, {', '.join(':' + f for f in fields)})"),
+            [dict({f: getattr(obj, f) for f in fields}, id=obj.id)
+             for obj in objs]
+        )
+        self._commit()
+
+    def search(self, query, limit, after=None, columns=None):
+        """
+        Retrieve one page of FTS5 matches, best bm25 rank first.
+
+        Each query word becomes a prefix term ("word"*) and all must
+        match. The cursor holds the rank and ID of the last row; rows
+        are joined to the model's table to load columns or objects.
+
+        Without FTS5 (backends other than SQLite), rows containing every
+        term are filtered with LIKE and paged by ID, unranked.
+        """
+        if not self._uses_fts():
+            return self.get_page(limit, after, columns,
+                                 criteria=(like_criteria(self.model, query),))
+        hits = text(
+            f"SELECT id, bm25({fts_table(self.model)}, "
+            f"{bm25_weights(self.model)}) AS rank "
+            f"FROM {fts_table(self.model)} "
+            f"WHERE {fts_table(self.model)} MATCH :match"
+        ).columns(id=db.String, rank=db.Float).subquery('hits')
+        if columns is not None:
+            columns = list(columns)
+            if 'id' not in columns:
+                columns.insert(0, 'id')
+            q = self.project(columns)
+        else:
+            q = self.model.query
+        q = q.add_columns(hits.c.rank).join(hits, hits.c.id == self.model.id)
+        if after is not None:
+            rank, last_id = decode_cursor(after, 2)
+            q = q.filter(tuple_(hits.c.rank, hits.c.id) >
+                         tuple_(rank, last_id))
+        rows = q.order_by(hits.c.rank, hits.c.id).limit(limit + 1).params(
+            match=fts_match(query)).all()
+        items = rows if columns is not None else [row[0] for row in rows]
+        next_cursor = None
+        if len(rows) > limit:
+            items = items[:limit]
+            next_cursor = encode_cursor([rows[limit - 1][-1],
+                                         items[-1].id])
+        return items, next_cursor
 
     def get_by_attribute(self, attr_name, attr_value):
         return (self.model.query.filter
                 (getattr(self.model, attr_name) == attr_value).first())
 
+    def get_existing_values(self, attr_name, values):
+        """
+        Return the subset of values already stored in a column.
+
+        One IN query per IN_CHUNK_SIZE values, e.g. to check the
+        uniqueness of a whole batch before inserting it.
+        """
+        column = getattr(self.model, attr_name)
+        values = list(values)
+        existing = set()
+        for start in range(0, len(values), IN_CHUNK_SIZE):
+            chunk = values[start:start + IN_CHUNK_SIZE]
+            rows = db.session.query(column).filter(column.in_(chunk))
+            existing.update(value for (value,) in rows)
+        return existing
+
     def save(self, obj):
         """
         Save an object to the database.
@@ -168,4 +930,4 @@ class SQLAlchemyRepository(Repository):
             obj: The object to save
         """
         db.session.add(obj)
-        db.session.commit()
+        self._commit()
@@ -0,0 +1,207 @@
+"""Full-text search: in-memory inverted index and SQLite FTS5 helpers."""
+
+import bisect
+import math
+import re
+import unicodedata
+from collections import defaultdict
+from sqlalchemy import and_, event, or_, text
+
+_WORD = re.compile(r'\w+')
+
+
+def tokenize(value):
+    """
+    Split a text into lowercase tokens without diacritics.
+
+    Mirrors the unicode61 tokenizer of FTS5 with remove_diacritics, so
+    both indexes see the same words.
+
+    Args:
+        value (str): Text to split (None is treated as empty)
+
+    Returns:
+        list: Tokens in order of appearance
+    """
+    if not value:
+        return []
+    stripped = ''.join(
+        char for char in unicodedata.normalize('NFKD', value)
+        if not unicodedata.combining(char)
+    )
+    return _WORD.findall(stripped.lower())
+
+
+def query_terms(query):
+    """
+    Return the terms of a search query.
+
+    Raises:
+        ValueError: If the query has no searchable word
+    """
+    terms = tokenize(query)
+    if not terms:
+        raise ValueError("Search query must contain at least one word")
+    return terms
+
+
+class TextIndex:
+    """
+    Inverted index from tokens to object IDs.
+
+    Each term of a query matches every indexed token it is a prefix of;
+    an object must match all terms. Matches are ranked by TF-IDF with a
+    weight per field (a title word counts more than a description word).
+    Documents are added, replaced and removed one at a time.
+    """
+
+    def __init__(self, fields, weights=None):
+        """
+        Args:
+            fields (tuple): Names of the indexed attributes
+            weights (tuple, optional): Weight of each field, default 1
+        """
+        self.fields = tuple(fields)
+        self.weights = tuple(weights or (1.0,) * len(self.fields))
+        self._postings = defaultdict(dict)  # token -> {obj_id: poids}
+        self._tokens = []                    # tokens triés (préfixes)
+        self._documents = {}                 # obj_id -> tokens indexés
+
+    def index(self, obj):
+        """Index obj, replacing what was indexed for its ID before."""
+        self.remove(obj.id)
+        weights = defaultdict(float)
+        for field, weight in zip(self.fields, self.weights):
+            for token in tokenize(getattr(obj, field, None)):
+                weights[token] += weight
+        for token, weight in weights.items():
+            if token not in self._postings:
+                bisect.insort(self._tokens, token)
+            self._postings[token][obj.id] = weight
+        self._documents[obj.id] = set(weights)
+
+    def remove(self, obj_id):
+        """Forget everything indexed for obj_id."""
+        for token in self._documents.pop(obj_id, ()):
+            postings = self._postings[token]
+            postings.pop(obj_id, None)
+            if not postings:
+                del self._postings[token]
+                del self._tokens[bisect.bisect_left(self._tokens, token)]
+
+    def _prefixed(self, term):
+        start = bisect.bisect_left(self._tokens, term)
+        for token in self._tokens[start:]:
+            if not token.startswith(term):
+                break
+            yield token
+
+    def search(self, query):
+        """
+        Rank the objects matching every term of query.
+
+        Returns:
+            list: (rank, obj_id) tuples, best first; lower rank is better
+        """
+        total = max(len(self._documents), 1)
+        scores = None
+        for term in query_terms(query):
+            term_scores = defaultdict(float)
+            for token in self._prefixed(term):
+                postings = self._postings[token]
+                idf = math.log(1 + total / len(postings))
+                for obj_id, weight in postings.items():
+                    term_scores[obj_id] += weight * idf
+            if scores is None:
+                scores = term_scores
+            else:
+                scores = {obj_id: score + term_scores[obj_id]
+                          for obj_id, score in scores.items()
+                          if obj_id in term_scores}
+        return sorted((-score, obj_id) for obj_id, score in scores.items())
+
+
+# FTS5 (SQLite) : une table virtuelle <table>_fts par modèle déclarant
+# __searchable__, alimentée par les repositories
+
+def has_fts(dialect):
+    """Tell whether a SQL dialect gets FTS5 tables (SQLite only)."""
+    return dialect.name == 'sqlite'
+
+
+def fts_table(model):
+    """Return the name of the FTS5 table of a searchable model."""
+    return f"{model.__tablename__}_fts"
+
+
+def fts_match(query):
+    """Build an FTS5 MATCH expression: every term, as a prefix."""
+    return ' AND '.join(f'"{term}"*' for term in query_terms(query))
+
+
+def like_criteria(model, query):
+    """
+    Build the LIKE filter used for search without FTS5.
+
+    Every query term must appear in one of the searchable columns.
+    Matching is case-insensitive but, unlike FTS5, neither restricted to
+    word prefixes nor blind to diacritics.
+    """
+    # Les termes sont des \w+ : seul '_' est un joker de LIKE
+    terms = [term.replace('_', '\\_') for term in query_terms(query)]
+    return and_(*(
+        or_(*(getattr(model, field).ilike(f'%{term}%', escape='\\')
+              for field in model.__searchable__))
+        for term in terms
+    ))
+
+
+def register_fts(model):
+    """Create and drop the FTS5 table of model along with its table."""
+    event.listen(model.__table__, 'after_create',
+                 lambda target, connection, **kw:
+                 create_fts_table(connection, model))
+    event.listen(model.__table__, 'before_drop',
+                 lambda target, connection, **kw:
+                 drop_fts_table(connection, model))
+
+
+def bm25_weights(model):
+    """Return the bm25() column weights: none for the id column."""
+    weights = getattr(model, '__search_weights__',
+                      (1.0,) * len(model.__searchable__))
+    return ', '.join(str(float(w)) for w in (0.0,) + tuple(weights))
+
+
+def create_fts_table(connection, model):
+    """Create the FTS5 table of model if it does not exist."""
+    if not has_fts(connection.dialect):
+        return False
+    exists = connection.execute(text(
+        "SELECT 1 FROM sqlite_master WHERE name = :name"
+    ), {'name': fts_table(model)}).first()
+    if exists:
+        return False
+    columns = ', '.join(model.__searchable__)
+    connection.execute(text(
+        f"CREATE VIRTUAL TABLE {fts_table(model)} USING fts5("
+        f"id UNINDEXED, {columns}, "
+        f"tokenize='unicode61 remove_diacritics 2')"
+    ))
+    return True
+
+
+def fill_fts_table(connection, model):
+    """Index every existing row of model in its FTS5 table."""
+    columns = ', '.join(model.__searchable__)
+    connection.execute(text(f"DELETE FROM {fts_table(model)}"))
+    connection.execute(text(
+        f"INSERT INTO {fts_table(model)} (id, {columns}) "
+        f"SELECT id, {columns} FROM {model.__tablename__}"
+    ))
+
+
+def drop_fts_table(connection, model):
+    """Drop the FTS5 table of model."""
+    if has_fts(connection.dialect):
+        connection.execute(text(f"DROP TABLE IF EXISTS {fts_table(model)}"))
@@ -0,0 +1,120 @@
+"""Per-table write counters, used to tag list responses."""
+
+import time
+import uuid
+from collections import defaultdict
+from threading import Lock
+from sqlalchemy import event
+
+
+class TableVersions:
+    """
+    Count the committed writes of each table.
+
+    Session hooks record the tables written by a transaction (flushed
+    objects and ORM bulk UPDATE/DELETE statements) and bump their
+    counters once it commits; a rollback discards them. A version
+    string therefore changes whenever a listed table may have changed.
+
+    The rows written are recorded as well: flushed objects by ID, rows
+    of bulk statements through record(). Subscribers are called with
+    both after each commit, e.g. to purge cached responses.
+
+    Counters live in this process only: versions carry a random token
+    of the process, so two processes never produce the same version,
+    and the current TTL period, so writes made by another process are
+    seen after at most ttl seconds, as with the entity cache.
+    """
+
+    def __init__(self, ttl=60, clock=time.monotonic):
+        """
+        Args:
+            ttl (float, optional): Seconds after which every version
+            changes; 0 or None never expires them
+            clock (callable, optional): Returns the current time
+        """
+        self.ttl = ttl
+        self.clock = clock
+        self._token = uuid.uuid4().hex[:8]
+        self._counters = defaultdict(int)
+        self._subscribers = []
+        self._lock = Lock()
+
+    def listen(self, session):
+        """Register the write-tracking hooks on a session (or class)."""
+        event.listen(session, 'after_flush', self._record_flush)
+        event.listen(session, 'do_orm_execute', self._record_statement)
+        event.listen(session, 'after_commit', self._bump)
+        event.listen(session, 'after_rollback', self._discard)
+
+    def subscribe(self, callback):
+        """
+        Call callback(tables, rows) after each commit that wrote data.
+
+        tables is the set of written table names and rows the set of
+        (table, id) pairs known to be written.
+        """
+        self._subscribers.append(callback)
+
+    def record(self, session, table, row_id=None):
+        """
+        Mark a table, and optionally one of its rows, as written.
+
+        Needed for rows changed by bulk statements, whose IDs the hooks
+        cannot see.
+
+        Args:
+            session: Session whose transaction makes the write
+            table (str): Table name
+            row_id (str, optional): ID of the written row
+        """
+        session.info.setdefault('written_tables', set()).add(table)
+        if row_id is not None:
+            session.info.setdefault('written_rows', set()).add(
+                (table, row_id))
+
+    def version(self, *tables):
+        """
+        Return the current version of the given tables.
+
+        Args:
+            *tables (str): Table names
+
+        Returns:
+            str: Opaque version, different after any committed write to
+            one of the tables
+        """
+        period = int(self.clock() // self.ttl) if self.ttl else 0
+        with self._lock:
+            counts = [self._counters[name] for name in tables]
+        return f"{self._token}.{period}." + '.'.join(map(str, counts))
+
+    def bump(self, *tables):
+        """Mark tables as written outside of a tracked session."""
+        with self._lock:
+            for name in tables:
+                self._counters[name] += 1
+
+    def _record_flush(self, session, flush_context):
+        for obj in (*session.new, *session.dirty, *session.deleted):
+            table = getattr(obj, '__table__', None)
+            if table is not None:
+                self.record(session, table.name, getattr(obj, 'id', None))
+
+    def _record_statement(self, orm_execute_state):
+        if orm_execute_state.is_update or orm_execute_state.is_delete:
+            self.record(orm_execute_state.session,
+                        orm_execute_state.statement.table.name)
+
+    def _bump(self, session):
+        tables = session.info.pop('written_tables', set())
+        rows = session.info.pop('written_rows', set())
+        if not tables:
+            return
+        self.bump(*tables)
+        for callback in self._subscribers:
+            callback(tables, rows)
+
+    def _discard(self, session):
+        session.info.pop('written_tables', None)
+        session.info.pop('written_rows', None)
@@ -0,0 +1,200 @@
+"""JWT revocation blocklist with a Bloom filter in front of the database."""
+
+import hashlib
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+
+
+class BloomFilter:
+    """
+    Fixed-size Bloom filter over strings.
+
+    Memory is size_bits / 8 bytes whatever the number of items added;
+    membership tests may return false positives, never false negatives.
+    """
+
+    def __init__(self, size_bits=1 << 23, hashes=7):
+        """
+        Args:
+            size_bits (int): Number of bits of the filter
+            hashes (int): Number of bit positions set per item
+        """
+        self.size_bits = size_bits
+        self.hashes = hashes
+        self._bits = bytearray((size_bits + 7) // 8)
+        self.count = 0
+
+    def _positions(self, item):
+        # Double hachage : k positions dérivées de deux hachages 64 bits
+        digest = hashlib.sha256(item.encode('utf-8')).digest()
+        h1 = int.from_bytes(digest[:8], 'little')
+        h2 = int.from_bytes(digest[8:16], 'little') | 1
+        return ((h1 + i * h2) % self.size_bits for i in range(self.hashes))
+
+    def add(self, item):
+        """Add item to the filter."""
+        for pos in self._positions(item):
+            self._bits[pos >> 3] |= 1 << (pos & 7)
+        self.count += 1
+
+    def __contains__(self, item):
+        return all(self._bits[pos >> 3] & (1 << (pos & 7))
+                   for pos in self._positions(item))
+
+    def clear(self):
+        """Remove every item."""
+        self._bits = bytearray(len(self._bits))
+        self.count = 0
+
+
+class TokenBlocklist:
+    """
+    Set of revoked JWT ids (jti).
+
+    The exact set lives in the revoked_tokens table and is purged of
+    tokens past their expiry; each process keeps a Bloom filter of it so
+    that a token that was never revoked is not looked up by jti. The
+    filter is rebuilt from the table every purge_interval seconds, which
+    drops expired tokens from it.
+
+    A miss of the filter is only final once the filter has caught up
+    with the revocations made by other processes: before answering
+    "not revoked", the tokens revoked since the last sync are read from
+    the revoked_at index (usually no row) and added to the filter. With
+    sync_interval = 0 this happens on every miss, so a token revoked by
+    any process is rejected everywhere at once; a positive interval
+    trades that guarantee for fewer queries.
+    """
+
+    # Marge relue à chaque synchronisation : une révocation horodatée
+    # avant la précédente lecture peut n'avoir été validée qu'après
+    SYNC_OVERLAP = timedelta(seconds=5)
+
+    def __init__(self, repo, size_bits=1 << 23, hashes=7,
+                 purge_interval=300, sync_interval=0,
+                 clock=time.monotonic):
+        """
+        Args:
+            repo (RevokedTokenRepository): Storage of the revoked tokens
+            size_bits (int): Size of the Bloom filter in bits
+            hashes (int): Number of hash functions of the Bloom filter
+            purge_interval (float): Seconds between two purges/rebuilds
+            sync_interval (float): Seconds during which a miss is trusted
+            without reading new revocations (0: never)
+            clock (callable): Monotonic time source, for tests
+        """
+        self.repo = repo
+        self.bloom = BloomFilter(size_bits, hashes)
+        self.purge_interval = purge_interval
+        self.sync_interval = sync_interval
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._next_refresh = None
+        self._next_sync = None
+        self._synced_to = None
+        self._recent = set()
+        self._lookups = 0
+        self._db_lookups = 0
+        self._syncs = 0
+        self._false_positives = 0
+
+    @staticmethod
+    def _now():
+        # Les colonnes DateTime sont naïves et en UTC
+        return datetime.now(timezone.utc).replace(tzinfo=None)
+
+    def _refresh_if_due(self):
+        """Purge expired tokens and rebuild the filter when due."""
+        if (self._next_refresh is not None and
+                self._clock() < self._next_refresh):
+            return
+        with self._lock:
+            if (self._next_refresh is not None and
+                    self._clock() < self._next_refresh):
+                return
+            self._refresh()
+
+    def refresh(self):
+        """Delete expired tokens and rebuild the filter from the table."""
+        with self._lock:
+            self._refresh()
+
+    def _refresh(self):
+        # Appelé avec self._lock, que revoke() prend aussi : une
+        # révocation n'est jamais perdue pendant la reconstruction
+        now = self._now()
+        self.repo.purge_expired(now)
+        # Lu avant la table : les révocations suivantes seront resynchronisées
+        synced_to = self.repo.latest_revocation()
+        bloom = BloomFilter(self.bloom.size_bits, self.bloom.hashes)
+        for jti in self.repo.iter_active_jtis(now):
+            bloom.add(jti)
+        # Révocations locales dont la transaction n'était peut-être pas
+        # encore validée pendant la lecture de la table
+        for jti in self._recent:
+            if jti not in bloom:
+                bloom.add(jti)
+        self._recent = set()
+        self.bloom = bloom
+        self._synced_to = synced_to
+        self._next_refresh = self._clock() + self.purge_interval
+
+    def _sync(self):
+        """Add the tokens revoked by any process since the last sync."""
+        since = self._synced_to
+        rows = self.repo.revoked_since(
+            since - self.SYNC_OVERLAP if since is not None else None)
+        with self._lock:
+            self._syncs += 1
+            for jti, revoked_at in rows:
+                if jti not in self.bloom:
+                    self.bloom.add(jti)
+                if self._synced_to is None or revoked_at > self._synced_to:
+                    self._synced_to = revoked_at
+            self._next_sync = self._clock() + self.sync_interval
+
+    def revoke(self, jti, expires_at):
+        """
+        Revoke a token until its expiry.
+
+        Args:
+            jti (str): Token identifier
+            expires_at (int): Expiry of the token (exp claim, epoch seconds)
+        """
+        self._refresh_if_due()
+        expires = datetime.fromtimestamp(expires_at, timezone.utc)
+        if not self.repo.get(jti):
+            self.repo.add(self.repo.model(
+                jti=jti, expires_at=expires.replace(tzinfo=None)))
+        with self._lock:
+            self.bloom.add(jti)
+            self._recent.add(jti)
+
+    def is_revoked(self, jti):
+        """Return True if the token identified by jti has been revoked."""
+        self._refresh_if_due()
+        self._lookups += 1
+        if jti not in self.bloom:
+            if (self._next_sync is not None and
+                    self._clock() < self._next_sync):
+                return False
+            self._sync()
+            if jti not in self.bloom:
+                return False
+        self._db_lookups += 1
+        revoked = self.repo.is_revoked(jti, self._now())
+        if not revoked:
+            self._false_positives += 1
+        return revoked
+
+    def stats(self):
+        """Return lookup counters and the size of the filter."""
+        return {
+            'lookups': self._lookups,
+            'db_lookups': self._db_lookups,
+            'syncs': self._syncs,
+            'false_positives': self._false_positives,
+            'bloom_items': self.bloom.count,
+            'bloom_bytes': len(self.bloom._bits)
+        }
@@ -0,0 +1,221 @@
+"""In-process caches used by the facade."""
+
+import threading
+import time
+from collections import OrderedDict
+
+
+class LRUCache:
+    """
+    Bounded least-recently-used cache with a time-to-live per entry.
+
+    Safe to share between request threads. Keeps hit, miss and eviction
+    counters so the size and TTL can be tuned from real traffic.
+    """
+
+    def __init__(self, maxsize=1024, ttl=60, clock=time.monotonic):
+        """
+        Initialize an empty cache.
+
+        Args:
+            maxsize (int): Maximum number of entries kept
+            ttl (float): Seconds an entry stays valid after being set
+            clock (callable, optional): Monotonic time source
+        """
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._clock = clock
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key, default=None):
+        """Return the value cached for key, or default if absent/expired."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                value, expires_at = entry
+                if expires_at > self._clock():
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return value
+                del self._entries[key]
+            self.misses += 1
+            return default
+
+    def set(self, key, value, ttl=None):
+        """Cache value under key, evicting the least recently used entry."""
+        expires_at = self._clock() + (self.ttl if ttl is None else ttl)
+        with self._lock:
+            self._entries[key] = (value, expires_at)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def delete(self, key):
+        """Drop key from the cache if present."""
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self):
+        """Drop every entry (counters are kept)."""
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self):
+        """
+        Return the cache counters.
+
+        Returns:
+            dict: hits, misses, evictions, current size and maxsize
+        """
+        with self._lock:
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'size': len(self._entries),
+                'maxsize': self.maxsize
+            }
+
+    def __contains__(self, key):
+        """Check for a live entry without touching counters or order."""
+        with self._lock:
+            entry = self._entries.get(key)
+            return entry is not None and entry[1] > self._clock()
+
+    def __len__(self):
+        return len(self._entries)
+
+
+class NullCache:
+    """Cache that stores nothing, used to disable caching."""
+
+    def get(self, key, default=None):
+        return default
+
+    def set(self, key, value, ttl=None):
+        pass
+
+    def delete(self, key):
+        pass
+
+    def clear(self):
+        pass
+
+    def stats(self):
+        return {'hits': 0, 'misses': 0, 'evictions': 0,
+                'size': 0, 'maxsize': 0}
+
+
+class ResponseCache:
+    """
+    Cache of serialized HTTP responses with surrogate-key purging.
+
+    Each response is stored with surrogate keys naming what it shows:
+    a table ('places') for list pages, a row ('places:<id>') for
+    detail pages. A write purges the responses tagged with the tables
+    and rows it touched, so entries never serve data older than the
+    last local commit; the TTL bounds staleness from other processes.
+    """
+
+    def __init__(self, maxsize=2048, ttl=30, clock=time.monotonic):
+        """
+        Initialize an empty cache.
+
+        Args:
+            maxsize (int): Maximum number of responses kept; 0 disables
+            the cache
+            ttl (float): Seconds a response stays valid after being set
+            clock (callable, optional): Monotonic time source
+        """
+        self._responses = (LRUCache(maxsize, ttl, clock) if maxsize
+                           else NullCache())
+        self.maxsize = maxsize
+        self._keys_by_tag = {}
+        self._lock = threading.Lock()
+        self.purges = 0
+        # Incrémenté à chaque purge : une réponse calculée pendant une
+        # purge peut montrer des données déjà périmées
+        self.generation = 0
+
+    def get(self, key):
+        """Return the response cached for key, or None."""
+        return self._responses.get(key)
+
+    def set(self, key, response, tags, generation=None):
+        """
+        Cache a response under key, tagged with surrogate keys.
+
+        Args:
+            key (str): Cache key, e.g. the normalized request path
+            response: Cached value (body, status, headers...)
+            tags (iterable): Surrogate keys purging this entry
+            generation (int, optional): Value of generation read before
+            building the response; if a purge happened since, the
+            response is not cached
+        """
+        if not self.maxsize:
+            return
+        with self._lock:
+            if generation is not None and generation != self.generation:
+                return
+            self._responses.set(key, response)
+            for tag in tags:
+                self._keys_by_tag.setdefault(tag, set()).add(key)
+            indexed = sum(len(keys) for keys in self._keys_by_tag.values())
+            if indexed > 4 * self.maxsize:
+                self._prune_index()
+
+    def _prune_index(self):
+        # Oublie les clés évincées ou expirées, jamais purgées par tag
+        for tag in list(self._keys_by_tag):
+            keys = {key for key in self._keys_by_tag[tag]
+                    if key in self._responses}
+            if keys:
+                self._keys_by_tag[tag] = keys
+            else:
+                del self._keys_by_tag[tag]
+
+    def purge(self, *tags):
+        """Drop every response tagged with one of tags."""
+        with self._lock:
+            self.generation += 1
+            keys = set()
+            for tag in tags:
+                keys |= self._keys_by_tag.pop(tag, set())
+        for key in keys:
+            self._responses.delete(key)
+        self.purges += len(keys)
+
+    def purge_writes(self, tables, rows):
+        """
+        Drop the responses showing written tables or rows.
+
+        Args:
+            tables (iterable): Names of the written tables
+            rows (iterable): (table, id) pairs of the written rows
+        """
+        self.purge(*tables, *(f'{table}:{row_id}' for table, row_id in rows))
+
+    def clear(self):
+        """Drop every response."""
+        with self._lock:
+            self.generation += 1
+            self._keys_by_tag.clear()
+        self._responses.clear()
+
+    def stats(self):
+        """
+        Return the cache counters.
+
+        Returns:
+            dict: LRU counters plus purged responses and indexed tags
+        """
+        stats = self._responses.stats()
+        with self._lock:
+            stats.update(purges=self.purges, tags=len(self._keys_by_tag))
+        return stats
@@ -1,11 +1,26 @@
 """Facade module for business logic operations."""
 
-from app.persistence.repository import SQLAlchemyRepository
+import heapq
+from sqlalchemy import event
+from app import db, password_hasher
+from app.geo import bbox_around, haversine_km, split_bbox
+from app.persistence.repository import (
+    SQLAlchemyRepository, decode_cursor, encode_cursor, unit_of_work
+)
+from app.persistence.versions import TableVersions
+from app.services.blocklist import TokenBlocklist
+from app.services.cache import LRUCache, ResponseCache
 from app.services.repositories.user_repository import UserRepository
+from app.services.repositories.place_repository import (
+    PlaceRepository, rating_prior)
+from app.services.repositories.review_repository import ReviewRepository
+from app.services.repositories.revoked_token_repository import (
+    RevokedTokenRepository)
 from app.models.user import User
 from app.models.amenity import Amenity
 from app.models.review import Review
 from app.models.place import Place
+from app.models.revoked_token import RevokedToken
 
 
 class HBnBFacade:
@@ -16,12 +31,131 @@ class HBnBFacade:
     different entities (users, places, reviews, amenities).
     """
 
-    def __init__(self):
-        """Initialize repositories for all entities."""
+    def __init__(self, cache=None):
+        """
+        Initialize repositories for all entities.
+
+        Args:
+            cache (optional): Entity cache exposing get/set/delete/clear
+            and stats, e.g. LRUCache or NullCache. Defaults to an
+            LRUCache.
+        """
         self.user_repo = UserRepository(User)
-        self.place_repo = SQLAlchemyRepository(Place)
-        self.review_repo = SQLAlchemyRepository(Review)
+        self.place_repo = PlaceRepository(Place)
+        self.review_repo = ReviewRepository(Review)
         self.amenity_repo = SQLAlchemyRepository(Amenity)
+        self.revoked_token_repo = RevokedTokenRepository(RevokedToken)
+        self.token_blocklist = TokenBlocklist(self.revoked_token_repo)
+        self.cache = cache if cache is not None else LRUCache()
+        event.listen(db.session, 'after_commit', self._drop_stale_entries)
+        event.listen(db.session, 'after_rollback', self._drop_stale_entries)
+        self.table_versions = TableVersions()
+        self.table_versions.listen(db.session)
+        self.response_cache = ResponseCache()
+        self.table_versions.subscribe(self._purge_responses)
+
+    def init_app(self, app):
+        """Size the entity cache from the application configuration."""
+        self.cache = LRUCache(
+            maxsize=app.config.get('ENTITY_CACHE_SIZE', 1024),
+            ttl=app.config.get('ENTITY_CACHE_TTL', 60)
+        )
+        self.place_repo.rating_prior = rating_prior(app.config)
+        self.table_versions.ttl = app.config.get('TABLE_VERSION_TTL', 60)
+        self.response_cache = ResponseCache(
+            maxsize=app.config.get('RESPONSE_CACHE_SIZE', 2048),
+            ttl=app.config.get('RESPONSE_CACHE_TTL', 30)
+        )
+        self.token_blocklist = TokenBlocklist(
+            self.revoked_token_repo,
+            size_bits=app.config.get('TOKEN_BLOCKLIST_BLOOM_BITS', 1 << 23),
+            hashes=app.config.get('TOKEN_BLOCKLIST_BLOOM_HASHES', 7),
+            purge_interval=app.config.get(
+                'TOKEN_BLOCKLIST_PURGE_INTERVAL', 300),
+            sync_interval=app.config.get('TOKEN_BLOCKLIST_SYNC_INTERVAL', 0)
+        )
+
+    # Entity cache
+    def _get_cached(self, repo, obj_id, load=None):
+        """
+        Read-through lookup of an entity by ID.
+
+        The cache holds detached copies of the column values; a hit is
+        attached to the current session without querying the database.
+        On a miss, load gives the relationship loading strategies; on a
+        hit, relationships are lazy-loaded when accessed (one query
+        each, as selectin loading of a single row would cost).
+        """
+        key = (repo.model.__name__, obj_id)
+        copy = self.cache.get(key)
+        if copy is not None:
+            return repo.attach(copy)
+        obj = repo.get(obj_id, load=load)
+        if obj is not None:
+            self.cache.set(key, repo.detached_copy(obj))
+        return obj
+
+    def _get_many_cached(self, repo, obj_ids):
+        """
+        Read-through lookup of several entities by ID.
+
+        Cache hits are attached without SQL and every miss is fetched
+        with one get_many query instead of one query per ID.
+
+        Returns:
+            dict: Found entities keyed by ID
+        """
+        found, missing = {}, set()
+        for obj_id in {i for i in obj_ids if isinstance(i, str)}:
+            copy = self.cache.get((repo.model.__name__, obj_id))
+            if copy is not None:
+                found[obj_id] = repo.attach(copy)
+            elif obj_id:
+                missing.add(obj_id)
+        if missing:
+            loaded = repo.get_many(missing)
+            for obj_id, obj in loaded.items():
+                self.cache.set((repo.model.__name__, obj_id),
+                               repo.detached_copy(obj))
+            found.update(loaded)
+        return found
+
+    def _invalidate(self, repo, obj_id):
+        """
+        Drop an entity from the cache after a write.
+
+        The key is dropped again when the transaction ends, so a copy of
+        uncommitted state cached in the meantime never outlives it.
+        """
+        key = (repo.model.__name__, obj_id)
+        self.cache.delete(key)
+        db.session.info.setdefault('stale_cache_keys', set()).add(key)
+        # Purge aussi les réponses HTTP de l'entité au commit, même quand
+        # l'écriture est une requête UPDATE groupée
+        self.table_versions.record(db.session, repo.model.__tablename__,
+                                   obj_id)
+
+    def _drop_stale_entries(self, session):
+        """Session hook: forget entries written during the transaction."""
+        for key in session.info.pop('stale_cache_keys', ()):
+            self.cache.delete(key)
+
+    def _purge_responses(self, tables, rows):
+        """Commit hook: purge the cached responses showing written data."""
+        self.response_cache.purge_writes(tables, rows)
+
+    def get_table_version(self, *models):
+        """
+        Return a version that changes with every write to the models.
+
+        Args:
+            *models: Model classes whose tables are read
+
+        Returns:
+            str: Opaque version string (see TableVersions)
+        """
+        return self.table_versions.version(
+            *(model.__tablename__ for model in models))
 
     # User operations
     def create_user(self, user_data):
@@ -38,17 +172,31 @@ class HBnBFacade:
         self.user_repo.add(user)
         return user
 
-    def get_user(self, user_id):
+    def get_user(self, user_id, load=None):
         """
         Retrieve a user by their ID.
 
         Args:
             user_id (str): The unique identifier of the user
+            load (dict, optional): Relationships to load with the user,
+            e.g. {'places': 'selectin'}; others stay lazy
 
         Returns:
             User: The user object if found, None otherwise
         """
-        return self.user_repo.get(user_id)
+        return self._get_cached(self.user_repo, user_id, load)
+
+    def get_users(self, user_ids):
+        """
+        Retrieve several users by their IDs in one query.
+
+        Args:
+            user_ids (iterable): The unique identifiers of the users
+
+        Returns:
+            dict: Users keyed by ID (unknown IDs are absent)
+        """
+        return self._get_many_cached(self.user_repo, user_ids)
 
     def get_user_by_email(self, email):
         """
@@ -62,18 +210,70 @@ class HBnBFacade:
         """
         return self.user_repo.get_by_attribute('email', email)
 
+    def rehash_password(self, user, password):
+        """
+        Re-hash a user's password at the current bcrypt cost.
+
+        Called after a successful login when the stored hash was made
+        with another cost factor.
+
+        Args:
+            user (User): The authenticated user
+            password (str): The password that was just verified
+        """
+        user.hash_password(password)
+        self._invalidate(self.user_repo, user.id)
+        self.user_repo.save(user)
+
     def get_all_users(self):
         """Retrieve all users from the repository."""
         return self.user_repo.get_all()
 
-    def update_user(self, user_id, user_data):
-        """Update a user's information by their ID."""
-        self.user_repo.update(user_id, user_data)
+    def get_users_page(self, limit, after=None, columns=None):
+        """
+        Retrieve one page of users and the cursor of the next one.
+
+        Pass columns to load only those fields as lightweight rows.
+        """
+        return self.user_repo.get_page(limit, after, columns)
+
+    def update_user(self, user_id, user_data, expected_updated_at=None):
+        """
+        Update a user's information by their ID.
+
+        A new password is hashed before being stored. With
+        expected_updated_at the write is conditional (see
+        Repository.update) and may raise ConcurrentUpdateError.
+        """
+        if user_data.get('password'):
+            user_data = dict(user_data)
+            user_data['password'] = password_hasher.hash(
+                user_data['password'])
+        self._invalidate(self.user_repo, user_id)
+        self.user_repo.update(user_id, user_data, expected_updated_at)
         return self.get_user(user_id)
 
-    def get_place(self, place_id):
-        """Retrieve a place by its ID."""
-        return self.place_repo.get(place_id)
+    def get_place(self, place_id, load=None):
+        """
+        Retrieve a place by its ID.
+
+        Args:
+            place_id (str): The unique identifier of the place
+            load (dict, optional): Relationships to load with the place,
+            e.g. {'amenities': 'joined'}; others stay lazy
+
+        Returns:
+            Place: The place object if found, None otherwise
+        """
+        return self._get_cached(self.place_repo, place_id, load)
+
+    def get_places(self, place_ids):
+        """Retrieve several places by their IDs, keyed by ID."""
+        return self._get_many_cached(self.place_repo, place_ids)
+
+    def get_place_owners(self, places):
+        """Resolve the owners of a list of places, keyed by owner ID."""
+        return self.get_users(place.owner_id for place in places)
 
     def get_place_by_title(self, title):
         """Retrieve a place by its title."""
@@ -81,7 +281,7 @@ class HBnBFacade:
 
     def create_place(self, place_data):
         owner_id = place_data.get('owner_id')
-        owner = self.user_repo.get(owner_id)
+        owner = self.get_user(owner_id)
         if not owner:
             raise ValueError(f"Owner with id {owner_id} not found")
 
@@ -92,14 +292,198 @@ class HBnBFacade:
 
         place = Place(**place_args)
         self.place_repo.add(place)
+        self.place_repo.index_text(place)
         return place
 
     def get_all_places(self):
         return self.place_repo.get_all()
 
-    def update_place(self, place_id, place_data):
-        self.place_repo.update(place_id, place_data)
-        return self.get_place(place_id)
+    def iter_places(self, columns=None, batch_size=1000):
+        """Stream every place ordered by ID (see Repository.iter_all)."""
+        return self.place_repo.iter_all(columns, batch_size)
+
+    def _place_criteria(self, min_price=None, max_price=None,
+                        amenity_ids=None):
+        """Validate the place list filters and build their SQL criteria."""
+        if (min_price is not None and max_price is not None and
+                min_price > max_price):
+            raise ValueError("min_price must not exceed max_price")
+        if amenity_ids:
+            found = self.get_amenities(amenity_ids)
+            missing = [i for i in amenity_ids if i not in found]
+            if missing:
+                raise ValueError(f"Amenity {missing[0]} not found")
+        return self.place_repo.criteria(min_price, max_price, amenity_ids)
+
+    def get_places_page(self, limit, after=None, columns=None,
+                        min_price=None, max_price=None, sort='id',
+                        amenity_ids=None):
+        """
+        Retrieve one page of places and the cursor of the next one.
+
+        Pass columns to load only those fields as lightweight rows.
+        min_price and max_price bound the price (inclusive) and
+        amenity_ids keeps the places having all of those amenities;
+        sort is 'price', 'created_at' or 'id', prefixed with '-' for
+        descending order. Cursors are only valid for the sort that
+        produced them.
+
+        Raises:
+            ValueError: If a filter or the cursor is invalid
+        """
+        criteria = self._place_criteria(min_price, max_price, amenity_ids)
+        return self.place_repo.get_page(limit, after, columns,
+                                        order_by=sort, criteria=criteria)
+
+    def get_place_facets(self, min_price=None, max_price=None,
+                         amenity_ids=None):
+        """
+        Count the places matching the list filters, per amenity.
+
+        Two queries whatever the number of amenities: one COUNT and one
+        GROUP BY over place_amenity; amenity names come from the cache.
+
+        Returns:
+            dict: 'total' places and 'amenities', a list of {'id',
+            'name', 'count'} for every amenity of at least one of them,
+            most frequent first
+
+        Raises:
+            ValueError: If a filter is invalid
+        """
+        criteria = self._place_criteria(min_price, max_price, amenity_ids)
+        total, counts = self.place_repo.amenity_facets(criteria)
+        amenities = self.get_amenities(counts)
+        facets = [
+            {'id': amenity_id, 'name': amenities[amenity_id].name,
+             'count': count}
+            for amenity_id, count in counts.items()
+            if amenity_id in amenities
+        ]
+        facets.sort(key=lambda f: (-f['count'], f['name']))
+        return {'total': total, 'amenities': facets}
+
+    @staticmethod
+    def _distance_page(hits, limit, after=None):
+        """
+        Return one page of (distance, row) hits, nearest first.
+
+        The cursor holds the distance and ID of the last hit, so pages
+        stay stable when places are added.
+        """
+        if after is not None:
+            last = tuple(decode_cursor(after, 2))
+            if (not isinstance(last[0], (int, float)) or
+                    not isinstance(last[1], str)):
+                raise ValueError("Invalid cursor")
+            hits = [hit for hit in hits if (hit[0], hit[1].id) > last]
+        page = heapq.nsmallest(limit + 1, hits,
+                               key=lambda hit: (hit[0], hit[1].id))
+        next_cursor = None
+        if len(page) > limit:
+            page = page[:limit]
+            next_cursor = encode_cursor([page[-1][0], page[-1][1].id])
+        return page, next_cursor
+
+    @staticmethod
+    def _check_point(latitude, longitude):
+        if not -90 <= latitude <= 90:
+            raise ValueError("Latitude must be between -90 and 90")
+        if not -180 <= longitude <= 180:
+            raise ValueError("Longitude must be between -180 and 180")
+
+    def search_places_near(self, latitude, longitude, radius_km, limit,
+                           after=None, columns=('id', 'latitude',
+                                                'longitude')):
+        """
+        Find the places within radius_km of a point, nearest first.
+
+        The bounding box of the circle is looked up through the geocell
+        index, then the haversine distance of each candidate drops the
+        corners of the box.
+
+        Args:
+            latitude (float): Latitude of the center
+            longitude (float): Longitude of the center
+            radius_km (float): Search radius in kilometers
+            limit (int): Maximum number of places to return
+            after (str, optional): Cursor returned by the previous page
+            columns (tuple): Columns to load; must include id, latitude
+            and longitude
+
+        Returns:
+            tuple: (list of (distance_km, row), next cursor or None)
+
+        Raises:
+            ValueError: If the point, radius or cursor is invalid
+        """
+        self._check_point(latitude, longitude)
+        if radius_km <= 0:
+            raise ValueError("radius_km must be positive")
+        rows = self.place_repo.get_in_boxes(
+            bbox_around(latitude, longitude, radius_km), columns)
+        hits = []
+        for row in rows:
+            distance = haversine_km(latitude, longitude,
+                                    row.latitude, row.longitude)
+            if distance <= radius_km:
+                hits.append((distance, row))
+        return self._distance_page(hits, limit, after)
+
+    def search_places_in_bbox(self, min_lat, min_lon, max_lat, max_lon,
+                              limit, after=None,
+                              columns=('id', 'latitude', 'longitude')):
+        """
+        Find the places inside a bounding box, nearest to its center first.
+
+        A box whose min_lon is greater than its max_lon crosses the
+        antimeridian.
+
+        Returns:
+            tuple: (list of (distance_km, row), next cursor or None)
+
+        Raises:
+            ValueError: If the box or cursor is invalid
+        """
+        self._check_point(min_lat, min_lon)
+        self._check_point(max_lat, max_lon)
+        if min_lat > max_lat:
+            raise ValueError("min_lat must not exceed max_lat")
+        center_lat = (min_lat + max_lat) / 2
+        center_lon = (min_lon + max_lon) / 2
+        if min_lon > max_lon:
+            center_lon = (min_lon + max_lon + 360) / 2
+            if center_lon > 180:
+                center_lon -= 360
+        rows = self.place_repo.get_in_boxes(
+            split_bbox(min_lat, min_lon, max_lat, max_lon), columns)
+        hits = [(haversine_km(center_lat, center_lon,
+                              row.latitude, row.longitude), row)
+                for row in rows]
+        return self._distance_page(hits, limit, after)
+
+    def update_place(self, place_id, place_data, expected_updated_at=None):
+        self._invalidate(self.place_repo, place_id)
+        self.place_repo.update(place_id, place_data, expected_updated_at)
+        place = self.get_place(place_id)
+        if place and set(place_data) & set(Place.__searchable__):
+            self.place_repo.index_text(place)
+        return place
+
+    def search_places(self, query, limit, after=None, columns=None):
+        """
+        Full-text search over place titles and descriptions.
+
+        Every word of query must match the start of a word of the
+        place; title matches rank above description matches.
+
+        Returns:
+            tuple: (list of places, cursor of the next page or None)
+
+        Raises:
+            ValueError: If the query has no word or the cursor is invalid
+        """
+        return self.place_repo.search(query, limit, after, columns)
 
     def create_review(self, review_data):
         user_id = review_data.get("user_id")
@@ -107,8 +491,8 @@ class HBnBFacade:
         rating = review_data.get("rating")
         text = review_data.get("text")
 
-        user = self.user_repo.get(user_id)
-        place = self.place_repo.get(place_id)
+        user = self.get_user(user_id)
+        place = self.get_place(place_id)
         if not user or not place:
             raise ValueError("Invalid user_id or place_id")
 
@@ -118,38 +502,151 @@ class HBnBFacade:
         new_review = Review(text=text, rating=rating,
                             user_id=user_id, place_id=place_id)
 
-        self.review_repo.add(new_review)
-        place.add_review(new_review)
+        # L'avis et les agrégats de la place sont écrits ensemble
+        with unit_of_work():
+            self.review_repo.add(new_review)
+            self._apply_ratings({place_id: ([rating], [])})
 
         return new_review
 
-    def get_review(self, review_id):
-        return self.review_repo.get(review_id)
+    def get_review(self, review_id, load=None):
+        return self.review_repo.get(review_id, load=load)
 
     def get_all_reviews(self):
         return self.review_repo.get_all()
 
+    def iter_reviews(self, columns=None, batch_size=1000):
+        """Stream every review ordered by ID (see Repository.iter_all)."""
+        return self.review_repo.iter_all(columns, batch_size)
+
+    def get_reviews_page(self, limit, after=None, columns=None):
+        """
+        Retrieve one page of reviews and the cursor of the next one.
+
+        Pass columns to load only those fields as lightweight rows.
+        """
+        return self.review_repo.get_page(limit, after, columns)
+
     def get_reviews_by_place(self, place_id):
-        reviews = [r for r in self.review_repo.get_all()
-                   if r.place_id == place_id]
-        return reviews
+        return self.review_repo.get_reviews_by_place(place_id)
+
+    def get_review_authors(self, reviews):
+        """Resolve the authors of a list of reviews, keyed by user ID."""
+        return self.get_users(review.user_id for review in reviews)
 
-    def update_review(self, review_id, review_data):
+    def get_place_relations(self, places, expand):
+        """
+        Load relations of a batch of places with one query per relation.
+
+        Owners and amenities go through the entity cache, so only the
+        ones not cached yet are queried.
+
+        Args:
+            places (list): Places or projected rows; rows need owner_id
+            to expand 'owner'
+            expand (iterable): Relation names among 'owner', 'amenities'
+            and 'reviews'
+
+        Returns:
+            dict: Relation name -> {place ID: owner (User or None),
+            list of amenities or list of reviews}
+        """
+        place_ids = [place.id for place in places]
+        relations = {}
+        if 'owner' in expand:
+            owners = self.get_users(place.owner_id for place in places)
+            relations['owner'] = {place.id: owners.get(place.owner_id)
+                                  for place in places}
+        if 'amenities' in expand:
+            links = self.place_repo.get_amenity_ids(place_ids)
+            amenities = self.get_amenities(
+                amenity_id for ids in links.values() for amenity_id in ids)
+            relations['amenities'] = {
+                place_id: [amenities[amenity_id]
+                           for amenity_id in links.get(place_id, ())
+                           if amenity_id in amenities]
+                for place_id in place_ids
+            }
+        if 'reviews' in expand:
+            reviews = self.review_repo.get_reviews_by_places(place_ids)
+            relations['reviews'] = {place_id: reviews.get(place_id, [])
+                                    for place_id in place_ids}
+        return relations
+
+    def get_reviews_by_user(self, user_id):
+        return self.review_repo.get_reviews_by_user(user_id)
+
+    def has_reviewed_place(self, user_id, place_id):
+        """Check whether a user has already reviewed a place."""
+        return self.review_repo.review_exists(user_id, place_id)
+
+    def update_review(self, review_id, review_data, expected_updated_at=None):
         rating = review_data.get('rating')
         if rating is not None and (not
                                    isinstance(rating,
                                               int) or not (1 <= rating <= 5)):
             raise ValueError("Rating must be an integer between 1 and 5")
 
-        self.review_repo.update(review_id, review_data)
-        return self.review_repo.get(review_id)
+        with unit_of_work():
+            review = self.review_repo.get(review_id)
+            if review is None:
+                return None
+            old = (review.place_id, review.rating)
+            self.review_repo.update(review_id, review_data,
+                                    expected_updated_at)
+            new = (review.place_id, review.rating)
+            if new != old:
+                changes = {}
+                changes.setdefault(old[0], ([], []))[1].append(old[1])
+                changes.setdefault(new[0], ([], []))[0].append(new[1])
+                self._apply_ratings(changes)
+        return review
 
     def delete_review(self, review_id):
         review = self.review_repo.get(review_id)
         if not review:
             raise ValueError(f"Review with id {review_id} not found")
 
-        self.review_repo.delete(review_id)
+        place_id, rating = review.place_id, review.rating
+        with unit_of_work():
+            self.review_repo.delete(review_id)
+            self._apply_ratings({place_id: ([], [rating])})
+
+    def _apply_ratings(self, changes):
+        """
+        Apply rating changes to the aggregates of their places.
+
+        Args:
+            changes (dict): Place ID -> (added ratings, removed ratings)
+        """
+        for place_id, (added, removed) in changes.items():
+            self._invalidate(self.place_repo, place_id)
+            self.place_repo.apply_ratings(place_id, added, removed)
+
+    def get_top_places(self, limit, after=None, columns=None):
+        """
+        Retrieve one page of the best rated places.
+
+        Places are ranked by Bayesian average rating (see
+        place_repository.bayesian_score), kept up to date by every
+        review write; places without reviews are not ranked.
+
+        Returns:
+            tuple: (list of places, cursor of the next page or None)
+        """
+        return self.place_repo.top_rated(limit, after, columns)
+
+    def recompute_place_ratings(self):
+        """
+        Rebuild the rating aggregates of every place from its reviews.
+
+        Returns:
+            int: Number of places that have at least one review
+        """
+        count = self.place_repo.recompute_ratings()
+        self.cache.clear()
+        self.response_cache.clear()
+        return count
 
     def create_amenity(self, amenity_data):
         amenity = Amenity(**amenity_data)
@@ -157,7 +654,11 @@ class HBnBFacade:
         return amenity
 
     def get_amenity(self, amenity_id):
-        return self.amenity_repo.get(amenity_id)
+        return self._get_cached(self.amenity_repo, amenity_id)
+
+    def get_amenities(self, amenity_ids):
+        """Retrieve several amenities by their IDs, keyed by ID."""
+        return self._get_many_cached(self.amenity_repo, amenity_ids)
 
     def get_amenity_by_name(self, name):
         """Retrieve an amenity by its name."""
@@ -166,13 +667,24 @@ class HBnBFacade:
     def get_all_amenities(self):
         return self.amenity_repo.get_all()
 
-    def update_amenity(self, amenity_id, amenity_data):
-        self.amenity_repo.update(amenity_id, amenity_data)
+    def get_amenities_page(self, limit, after=None, columns=None):
+        """
+        Retrieve one page of amenities and the cursor of the next one.
+
+        Pass columns to load only those fields as lightweight rows.
+        """
+        return self.amenity_repo.get_page(limit, after, columns)
+
+    def update_amenity(self, amenity_id, amenity_data,
+                       expected_updated_at=None):
+        self._invalidate(self.amenity_repo, amenity_id)
+        self.amenity_repo.update(amenity_id, amenity_data,
+                                 expected_updated_at)
         return self.get_amenity(amenity_id)
 
     def add_amenity_to_place(self, place_id, amenity_id):
-        place = self.place_repo.get(place_id)
-        amenity = self.amenity_repo.get(amenity_id)
+        place = self.get_place(place_id)
+        amenity = self.get_amenity(amenity_id)
 
         if not place:
             raise ValueError(f"Place with id {place_id} not found")
@@ -182,3 +694,243 @@ class HBnBFacade:
         place.add_amenity(amenity)
         self.place_repo.save(place)
         return place
+
+    # Token revocation
+    def revoke_token(self, jti, expires_at):
+        """
+        Revoke a JWT until it expires.
+
+        Args:
+            jti (str): The jti claim of the token
+            expires_at (int): The exp claim of the token
+        """
+        self.token_blocklist.revoke(jti, expires_at)
+
+    def is_token_revoked(self, jti):
+        """Return True if the JWT with this jti has been revoked."""
+        return self.token_blocklist.is_revoked(jti)
+
+    # Bulk operations
+    @staticmethod
+    def _build_many(rows, factory):
+        """
+        Build one object per input row, collecting validation errors.
+
+        Args:
+            rows (list): List of dictionaries to turn into objects
+            factory (callable): Builds an object from one row
+
+        Returns:
+            tuple: (list of objects, list of {'index', 'error'} dicts)
+        """
+        objs, errors = [], []
+        for index, row in enumerate(rows):
+            try:
+                if not isinstance(row, dict):
+                    raise ValueError("Each item must be an object")
+                objs.append(factory(row))
+            except (ValueError, TypeError) as e:
+                errors.append({'index': index, 'error': str(e)})
+        return objs, errors
+
+    def _add_many(self, repo, rows, factory, unique=None):
+        """
+        Validate every row, then insert them all in one transaction.
+
+        Args:
+            repo: Repository receiving the objects
+            rows (list): List of dictionaries to turn into objects
+            factory (callable): Builds an object from one row
+            unique (tuple, optional): (attribute, error message). Rows
+            whose value is already stored are rejected; the values of
+            the whole batch are looked up at once.
+
+        Returns:
+            tuple: (created objects, per-row errors)
+        """
+        rows = list(rows)
+        objs, errors = self._build_many(rows, factory)
+        if unique is not None and objs:
+            attr, message = unique
+            failed = {error['index'] for error in errors}
+            indexes = [i for i in range(len(rows)) if i not in failed]
+            existing = repo.get_existing_values(
+                attr, {getattr(obj, attr) for obj in objs})
+            errors.extend({'index': index, 'error': message}
+                          for index, obj in zip(indexes, objs)
+                          if getattr(obj, attr) in existing)
+            errors.sort(key=lambda error: error['index'])
+        if errors:
+            return [], errors
+        repo.add_many(objs)
+        return objs, []
+
+    def create_users(self, users_data):
+        """
+        Create several users in a single transaction.
+
+        Args:
+            users_data (list): List of user dictionaries
+
+        Returns:
+            tuple: (created users, per-row errors). Nothing is written
+            when at least one row is invalid.
+        """
+        seen = set()
+
+        def build(row):
+            user = User(**row)
+            if user.email in seen:
+                raise ValueError("Email already registered")
+            seen.add(user.email)
+            return user
+
+        return self._add_many(self.user_repo, users_data, build,
+                              unique=('email', "Email already registered"))
+
+    def provision_users(self, users_data, batch_size=1000):
+        """
+        Create many users, committing them batch by batch.
+
+        Unlike create_users, valid rows are created even when others are
+        rejected. Rows are validated first, registered emails are looked
+        up for the whole batch at once, the passwords of the remaining
+        rows are hashed across all cores, then users are inserted in
+        transactions of batch_size rows.
+
+        Args:
+            users_data (list): List of user dictionaries, with password
+            batch_size (int, optional): Users committed per transaction
+
+        Returns:
+            tuple: (IDs of the created users, list of {'index', 'error'}
+            dicts for the rejected rows)
+        """
+        rows, errors, seen = [], [], set()
+        for index, row in enumerate(users_data):
+            try:
+                if not isinstance(row, dict):
+                    raise ValueError("Each item must be an object")
+                user_args = row.copy()
+                password = user_args.pop('password', None)
+                if not isinstance(password, str) or not password:
+                    raise ValueError("Password is required")
+                # Le mot de passe est haché plus tard, par lots
+                user = User(**user_args)
+                if user.email in seen:
+                    raise ValueError("Email already registered")
+                seen.add(user.email)
+                rows.append((index, user, password))
+            except (ValueError, TypeError) as e:
+                errors.append({'index': index, 'error': str(e)})
+
+        registered = self.user_repo.get_existing_emails(seen)
+        for index, user, _ in rows:
+            if user.email in registered:
+                errors.append({'index': index,
+                               'error': "Email already registered"})
+        rows = [r for r in rows if r[1].email not in registered]
+
+        hashes = password_hasher.hash_many(password for _, _, password in rows)
+        for (_, user, _), password_hash in zip(rows, hashes):
+            user.password = password_hash
+
+        ids, failures = self.user_repo.add_in_batches(
+            [user for _, user, _ in rows], batch_size)
+        for start, stop, error in failures:
+            reason = getattr(error, 'orig', None) or error
+            for index, _, _ in rows[start:stop]:
+                errors.append({'index': index,
+                               'error': f"Batch rejected: {reason}"})
+        errors.sort(key=lambda e: e['index'])
+        return ids, errors
+
+    def create_places(self, places_data):
+        """
+        Create several places in a single transaction.
+
+        Owners of the whole batch are resolved with one query.
+
+        Returns:
+            tuple: (created places, per-row errors)
+        """
+        owners = self.get_users(
+            row.get('owner_id') for row in places_data
+            if isinstance(row, dict)
+        )
+
+        def build(row):
+            place_args = row.copy()
+            owner_id = place_args.pop('owner_id', None)
+            if not owners.get(owner_id):
+                raise ValueError(f"Owner with id {owner_id} not found")
+            place_args['owner'] = owners[owner_id]
+            return Place(**place_args)
+
+        places, errors = self._add_many(self.place_repo, places_data, build)
+        self.place_repo.index_text(*places)
+        return places, errors
+
+    def create_reviews(self, reviews_data):
+        """
+        Create several reviews in a single transaction.
+
+        Users, places and existing reviews of the whole batch are
+        resolved with one query each. Rows follow the rules of a single
+        review: an owner cannot review their own place and a user
+        reviews a place at most once, in the batch or before it.
+
+        Returns:
+            tuple: (created reviews, per-row errors)
+        """
+        rows = [row for row in reviews_data if isinstance(row, dict)]
+        users = self.get_users(row.get('user_id') for row in rows)
+        places = self.get_places(row.get('place_id') for row in rows)
+        reviewed = self.review_repo.get_reviewed_pairs({
+            (row.get('user_id'), row.get('place_id')) for row in rows
+            if row.get('user_id') in users and row.get('place_id') in places
+        })
+        seen = set()
+
+        def build(row):
+            user_id = row.get('user_id')
+            place_id = row.get('place_id')
+            if not users.get(user_id) or not places.get(place_id):
+                raise ValueError("Invalid user_id or place_id")
+            if places[place_id].owner_id == user_id:
+                raise ValueError("You cannot review your own place")
+            if (user_id, place_id) in reviewed or (user_id, place_id) in seen:
+                raise ValueError("You have already reviewed this place")
+            review = Review(text=row.get('text'), rating=row.get('rating'),
+                            user_id=user_id, place_id=place_id)
+            seen.add((user_id, place_id))
+            return review
+
+        with unit_of_work():
+            reviews, errors = self._add_many(
+                self.review_repo, reviews_data, build)
+            changes = {}
+            for review in reviews:
+                changes.setdefault(review.place_id, ([], []))[0].append(
+                    review.rating)
+            self._apply_ratings(changes)
+        return reviews, errors
+
+    def create_amenities(self, amenities_data):
+        """
+        Create several amenities in a single transaction.
+
+        Returns:
+            tuple: (created amenities, per-row errors)
+        """
+        seen = set()
+
+        def build(row):
+            amenity = Amenity(**row)
+            if amenity.name in seen:
+                raise ValueError("Amenity already exists")
+            seen.add(amenity.name)
+            return amenity
+
+        return self._add_many(self.amenity_repo, amenities_data, build,
+                              unique=('name', "Amenity already exists"))
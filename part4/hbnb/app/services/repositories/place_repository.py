@@ -0,0 +1,238 @@
+from collections import Counter
+from sqlalchemy import and_, case, func, or_, select, update
+from app import db
+from app.geo import cell_ranges
+from app.models.place import Place, place_amenity
+from app.models.review import Review
+from app.persistence.repository import IN_CHUNK_SIZE, SQLAlchemyRepository
+
+RATING_COLUMNS = ('review_count', 'rating_sum', 'rating_1', 'rating_2',
+                  'rating_3', 'rating_4', 'rating_5')
+
+# A priori de la moyenne bayésienne : note moyenne supposée et nombre
+# d'avis fictifs qui la portent
+DEFAULT_RATING_PRIOR = (3.0, 5)
+
+
+def rating_prior(config):
+    """Read the (mean, weight) rating prior from an app configuration."""
+    return (float(config.get('RATING_PRIOR_MEAN', DEFAULT_RATING_PRIOR[0])),
+            config.get('RATING_PRIOR_WEIGHT', DEFAULT_RATING_PRIOR[1]))
+
+
+def bayesian_score(review_count, rating_sum, prior):
+    """
+    Build the SQL expression of a place's Bayesian average rating.
+
+    The prior adds weight fictitious reviews rated mean, so a place
+    with few reviews ranks near mean and only climbs with evidence:
+    ``(weight * mean + rating_sum) / (weight + review_count)``.
+
+    Args:
+        review_count: Column or expression holding the review count
+        rating_sum: Column or expression holding the sum of ratings
+        prior (tuple): (mean, weight), see rating_prior
+
+    Returns:
+        The expression, NULL for a place without reviews
+    """
+    mean, weight = prior
+    return case(
+        (review_count > 0,
+         (weight * mean + rating_sum) / (weight + review_count)),
+        else_=None)
+
+
+def rating_aggregate_updates(prior=DEFAULT_RATING_PRIOR):
+    """
+    Build the statements recomputing every place's rating aggregates.
+
+    The first resets all places to zero, the second sets the places
+    that have reviews from one GROUP BY over the reviews table.
+
+    Args:
+        prior (tuple, optional): (mean, weight) of the Bayesian score
+
+    Returns:
+        list: Two UPDATE statements, to run in order in one transaction
+    """
+    totals = select(
+        Review.place_id,
+        func.count().label('review_count'),
+        func.sum(Review.rating).label('rating_sum'),
+        *(func.sum(case((Review.rating == stars, 1), else_=0))
+          .label(f'rating_{stars}') for stars in range(1, 6))
+    ).group_by(Review.place_id).subquery()
+    # updated_at reste inchangé : les agrégats ne modifient pas la place
+    reset = update(Place).values(
+        {**{name: 0 for name in RATING_COLUMNS},
+         'rating_score': None, 'updated_at': Place.updated_at})
+    fill = update(Place).where(Place.id == totals.c.place_id).values(
+        {**{name: totals.c[name] for name in RATING_COLUMNS},
+         'rating_score': bayesian_score(totals.c.review_count,
+                                        totals.c.rating_sum, prior),
+         'updated_at': Place.updated_at})
+    return [reset, fill]
+
+
+class PlaceRepository(SQLAlchemyRepository):
+    def __init__(self, model, rating_prior=DEFAULT_RATING_PRIOR):
+        super().__init__(model)
+        self.rating_prior = rating_prior
+
+    def get_in_boxes(self, boxes, columns):
+        """
+        Return the places inside any of the given bounding boxes.
+
+        The geocell index narrows the scan to the grid cells covering
+        each box, then exact latitude/longitude bounds drop the points of
+        the border cells that fall outside.
+
+        Args:
+            boxes (list): (min_lat, min_lon, max_lat, max_lon) tuples
+            that do not cross the antimeridian
+            columns (iterable): Column names to load
+
+        Returns:
+            list: Projected rows
+        """
+        model = self.model
+        conditions = []
+        for min_lat, min_lon, max_lat, max_lon in boxes:
+            cells = or_(*(model.geocell.between(first, last) for first, last
+                          in cell_ranges(min_lat, min_lon, max_lat, max_lon)))
+            conditions.append(and_(
+                cells,
+                model.latitude.between(min_lat, max_lat),
+                model.longitude.between(min_lon, max_lon)
+            ))
+        return self.project(columns).filter(or_(*conditions)).all()
+
+    def criteria(self, min_price=None, max_price=None, amenity_ids=None):
+        """
+        Build the SQL filters of a place list query.
+
+        Places having all of amenity_ids are found with a GROUP BY /
+        HAVING over place_amenity, served by its (amenity_id, place_id)
+        index, instead of loading every amenities collection.
+
+        Returns:
+            list: Filter expressions for query.filter()
+        """
+        criteria = []
+        if min_price is not None:
+            criteria.append(self.model.price >= min_price)
+        if max_price is not None:
+            criteria.append(self.model.price <= max_price)
+        if amenity_ids:
+            amenity_ids = set(amenity_ids)
+            having_all = db.session.query(place_amenity.c.place_id).filter(
+                place_amenity.c.amenity_id.in_(amenity_ids)
+            ).group_by(place_amenity.c.place_id).having(
+                func.count() == len(amenity_ids))
+            criteria.append(self.model.id.in_(having_all))
+        return criteria
+
+    def amenity_facets(self, criteria):
+        """
+        Count the places matching criteria, in total and per amenity.
+
+        Returns:
+            tuple: (number of places, {amenity_id: number of places})
+        """
+        matching = db.session.query(self.model.id).filter(*criteria)
+        total = matching.count()
+        counts = db.session.query(
+            place_amenity.c.amenity_id, func.count()
+        ).filter(
+            place_amenity.c.place_id.in_(matching)
+        ).group_by(place_amenity.c.amenity_id).all()
+        return total, dict(counts)
+
+    def apply_ratings(self, place_id, added=(), removed=()):
+        """
+        Update the rating aggregates of a place in place.
+
+        A single UPDATE adds the deltas to the stored values
+        (``review_count = review_count + 1``...), so concurrent writers
+        never lose each other's changes. The Bayesian score is computed
+        in the same statement from the new count and sum.
+
+        Args:
+            place_id (str): The place whose reviews changed
+            added (iterable): Ratings of the new or updated reviews
+            removed (iterable): Previous ratings of deleted or updated
+            reviews
+        """
+        added, removed = Counter(added), Counter(removed)
+        deltas = {
+            'review_count': sum(added.values()) - sum(removed.values()),
+            'rating_sum': (sum(r * n for r, n in added.items()) -
+                           sum(r * n for r, n in removed.items()))
+        }
+        for stars in range(1, 6):
+            deltas[f'rating_{stars}'] = added[stars] - removed[stars]
+        values = {getattr(self.model, name): getattr(self.model, name) + delta
+                  for name, delta in deltas.items() if delta}
+        if not values:
+            return
+        values[self.model.rating_score] = bayesian_score(
+            self.model.review_count + deltas['review_count'],
+            self.model.rating_sum + deltas['rating_sum'], self.rating_prior)
+        values[self.model.updated_at] = self.model.updated_at
+        self.model.query.filter(self.model.id == place_id).update(
+            values, synchronize_session='fetch')
+        self._commit()
+
+    def recompute_ratings(self):
+        """
+        Recompute the rating aggregates of every place from its reviews.
+
+        Returns:
+            int: Number of places that have at least one review
+        """
+        reset, fill = rating_aggregate_updates(self.rating_prior)
+        try:
+            db.session.execute(reset)
+            result = db.session.execute(fill)
+            self._commit()
+        except Exception:
+            db.session.rollback()
+            raise
+        return result.rowcount
+
+    def top_rated(self, limit, after=None, columns=None):
+        """
+        Return one page of the reviewed places, best Bayesian score first.
+
+        A backward range scan of the (rating_score, id) index: the cost
+        depends on limit, not on the number of places or reviews.
+
+        Returns:
+            tuple: (list of places, cursor of the next page or None)
+        """
+        return self.get_page(limit, after, columns,
+                             order_by='-rating_score',
+                             criteria=(self.model.rating_score.isnot(None),))
+
+    def get_amenity_ids(self, place_ids):
+        """
+        Return the amenity IDs of several places.
+
+        One query over place_amenity per IN_CHUNK_SIZE places, instead
+        of one lazy load of Place.amenities per place.
+
+        Returns:
+            dict: Place ID -> list of amenity IDs (places without
+            amenities are absent)
+        """
+        place_ids = list(place_ids)
+        links = {}
+        for start in range(0, len(place_ids), IN_CHUNK_SIZE):
+            chunk = place_ids[start:start + IN_CHUNK_SIZE]
+            rows = db.session.query(
+                place_amenity.c.place_id, place_amenity.c.amenity_id
+            ).filter(place_amenity.c.place_id.in_(chunk))
+            for place_id, amenity_id in rows:
+                links.setdefault(place_id, []).append(amenity_id)
+        return links
@@ -0,0 +1,59 @@
+from sqlalchemy import tuple_
+from app.models.review import Review
+from app import db
+from app.persistence.repository import IN_CHUNK_SIZE, SQLAlchemyRepository
+
+
+class ReviewRepository(SQLAlchemyRepository):
+    def __init__(self, model):
+        super().__init__(model)
+
+    def get_reviews_by_place(self, place_id):
+        """Return the reviews of a place (uses the place_id index)."""
+        return self.model.query.filter_by(place_id=place_id).all()
+
+    def get_reviews_by_places(self, place_ids):
+        """
+        Return the reviews of several places, one query per chunk.
+
+        Returns:
+            dict: Place ID -> list of reviews (places without reviews
+            are absent)
+        """
+        place_ids = list(place_ids)
+        reviews = {}
+        for start in range(0, len(place_ids), IN_CHUNK_SIZE):
+            chunk = place_ids[start:start + IN_CHUNK_SIZE]
+            for review in self.model.query.filter(
+                    self.model.place_id.in_(chunk)):
+                reviews.setdefault(review.place_id, []).append(review)
+        return reviews
+
+    def get_reviews_by_user(self, user_id):
+        """Return the reviews written by a user."""
+        return self.model.query.filter_by(user_id=user_id).all()
+
+    def review_exists(self, user_id, place_id):
+        """Return True if user_id has already reviewed place_id."""
+        query = self.model.query.filter_by(user_id=user_id,
+                                           place_id=place_id)
+        return db.session.query(query.exists()).scalar()
+
+    def get_reviewed_pairs(self, pairs):
+        """
+        Return the (user_id, place_id) pairs that already have a review.
+
+        One IN query over (user_id, place_id), the columns of the
+        uq_reviews_user_place index, per chunk of pairs.
+        """
+        pairs = list(pairs)
+        # Deux variables SQL par couple
+        size = IN_CHUNK_SIZE // 2
+        key = tuple_(self.model.user_id, self.model.place_id)
+        existing = set()
+        for start in range(0, len(pairs), size):
+            rows = db.session.query(self.model.user_id,
+                                    self.model.place_id).filter(
+                key.in_(pairs[start:start + size]))
+            existing.update((user_id, place_id) for user_id, place_id in rows)
+        return existing
@@ -0,0 +1,46 @@
+from app import db
+from app.persistence.repository import SQLAlchemyRepository
+
+
+class RevokedTokenRepository(SQLAlchemyRepository):
+    def __init__(self, model):
+        super().__init__(model)
+
+    def is_revoked(self, jti, now):
+        """Return True if jti is revoked and has not expired yet."""
+        query = self.model.query.filter(self.model.jti == jti,
+                                        self.model.expires_at > now)
+        return db.session.query(query.exists()).scalar()
+
+    def iter_active_jtis(self, now, batch_size=1000):
+        """Yield the jti of every revoked token still valid at now."""
+        query = db.session.query(self.model.jti).filter(
+            self.model.expires_at > now).execution_options(
+                yield_per=batch_size)
+        for (jti,) in query:
+            yield jti
+
+    def latest_revocation(self):
+        """Return the revoked_at of the latest revocation, or None."""
+        return db.session.query(db.func.max(self.model.revoked_at)).scalar()
+
+    def revoked_since(self, since):
+        """
+        Return the tokens revoked at or after since (all if None).
+
+        Returns:
+            list: (jti, revoked_at) tuples, oldest first
+        """
+        query = db.session.query(self.model.jti, self.model.revoked_at)
+        if since is not None:
+            query = query.filter(self.model.revoked_at >= since)
+        else:
+            query = query.filter(self.model.revoked_at.isnot(None))
+        return query.order_by(self.model.revoked_at).all()
+
+    def purge_expired(self, now):
+        """Delete the tokens expired at now; return how many were deleted."""
+        deleted = self.model.query.filter(
+            self.model.expires_at <= now).delete(synchronize_session=False)
+        self._commit()
+        return deleted
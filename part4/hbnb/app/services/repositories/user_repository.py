@@ -9,3 +9,7 @@ class UserRepository(SQLAlchemyRepository):
 
     def get_user_by_email(self, email):
         return self.model.query.filter_by(email=email).first()
+
+    def get_existing_emails(self, emails):
+        """Return the subset of emails already registered."""
+        return self.get_existing_values('email', emails)
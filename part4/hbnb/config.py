@@ -1,12 +1,67 @@
 """Configuration settings for the HBnB application."""
 
 import os
+from datetime import timedelta
 
 
 class Config:
     """Base configuration class with default settings."""
     SECRET_KEY = os.getenv('SECRET_KEY', 'default_secret_key')
     DEBUG = False
+    # Pagination des listes (keyset)
+    PAGE_SIZE = 50
+    MAX_PAGE_SIZE = 500
+    # Rayon maximal des recherches géographiques (?near=lat,lon)
+    GEO_MAX_RADIUS_KM = 1000
+    # Côté maximal, en degrés, des boîtes de ?bbox= (~ le carré du rayon
+    # maximal) : toutes les places trouvées sont triées à chaque page
+    GEO_MAX_BBOX_DEG = 20
+    # A priori de la moyenne bayésienne du classement GET /places/top :
+    # chaque place compte RATING_PRIOR_WEIGHT avis fictifs notés
+    # RATING_PRIOR_MEAN (après modification : flask repair-ratings)
+    RATING_PRIOR_MEAN = 3.0
+    RATING_PRIOR_WEIGHT = 5
+    # Une seule transaction (un commit) par requête HTTP
+    UNIT_OF_WORK = True
+    # Cache des entités (get_user/get_place/get_amenity) dans la façade
+    ENTITY_CACHE_SIZE = 1024
+    ENTITY_CACHE_TTL = 60
+    # Durée de validité maximale des ETag des listes (version des tables
+    # tenue par processus, voir app.persistence.versions)
+    TABLE_VERSION_TTL = 60
+    # Cache des réponses des GET publics, purgé par les écritures
+    # (RESPONSE_CACHE_SIZE = 0 le désactive)
+    RESPONSE_CACHE_SIZE = 2048
+    RESPONSE_CACHE_TTL = 30
+    # Coût bcrypt, identique sur tous les nœuds (les hachages d'un autre
+    # coût sont recalculés à la connexion), et pool de hachage des mots
+    # de passe. « flask calibrate-bcrypt » propose le coût pour qu'un
+    # hachage prenne environ BCRYPT_TARGET_MS sur la machine
+    BCRYPT_LOG_ROUNDS = int(os.getenv('BCRYPT_LOG_ROUNDS', 12))
+    BCRYPT_TARGET_MS = 250
+    BCRYPT_MIN_ROUNDS = 10
+    BCRYPT_MAX_ROUNDS = 16
+    PASSWORD_HASH_WORKERS = 2
+    PASSWORD_HASH_QUEUE_SIZE = 32
+    # Imports de masse : processus de hachage (None = tous les cœurs)
+    # et nombre d'utilisateurs par transaction
+    PASSWORD_HASH_PROCESSES = None
+    PROVISION_BATCH_SIZE = 1000
+    # Lignes lues par aller-retour et envoyées par bloc par les exports
+    # NDJSON (GET /places/export, /reviews/export)
+    EXPORT_BATCH_SIZE = 1000
+    # Cache des claims des JWT déjà vérifiés (0 pour désactiver)
+    JWT_CLAIMS_CACHE_SIZE = 4096
+    JWT_CLAIMS_CACHE_MAX_TTL = 300
+    # Jetons d'accès longs, révocables via la blocklist (jti)
+    JWT_ACCESS_TOKEN_EXPIRES = timedelta(hours=1)
+    JWT_REFRESH_TOKEN_EXPIRES = timedelta(days=30)
+    TOKEN_BLOCKLIST_BLOOM_BITS = 1 << 23  # 1 Mio, ~2 % de faux positifs
+    TOKEN_BLOCKLIST_BLOOM_HASHES = 7      # pour un million de jetons
+    TOKEN_BLOCKLIST_PURGE_INTERVAL = 300
+    # Délai pendant lequel un processus ignore les révocations faites par
+    # les autres (0 : aucune fenêtre, une requête indexée par vérification)
+    TOKEN_BLOCKLIST_SYNC_INTERVAL = 0
 
 
 class DevelopmentConfig(Config):
@@ -16,7 +71,17 @@ class DevelopmentConfig(Config):
     SQLALCHEMY_TRACK_MODIFICATIONS = False
 
 
+class TestingConfig(Config):
+    """Testing configuration using an in-memory SQLite database."""
+    TESTING = True
+    SQLALCHEMY_DATABASE_URI = 'sqlite:///:memory:'
+    BCRYPT_LOG_ROUNDS = 4
+    PASSWORD_HASH_PROCESSES = 2
+    SQLALCHEMY_TRACK_MODIFICATIONS = False
+
+
 config = {
     'development': DevelopmentConfig,
+    'testing': TestingConfig,
     'default': DevelopmentConfig
 }
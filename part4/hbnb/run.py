@@ -1,10 +1,12 @@
 """Application entry point for the HBnB Flask application."""
 
 from app import create_app, db
+from app.persistence.migrations import upgrade_schema
 
 app = create_app()
 
 if __name__ == '__main__':
     with app.app_context():
         db.create_all()  # Crée toutes les tables
+        upgrade_schema()  # Ajoute colonnes et index manquants aux tables
     app.run(debug=True)
@@ -22,6 +22,15 @@ CREATE TABLE IF NOT EXISTS places (
     price DECIMAL(10, 2) NOT NULL,
     latitude FLOAT NOT NULL,
     longitude FLOAT NOT NULL,
+    geocell INTEGER,
+    review_count INTEGER NOT NULL DEFAULT 0,
+    rating_sum INTEGER NOT NULL DEFAULT 0,
+    rating_1 INTEGER NOT NULL DEFAULT 0,
+    rating_2 INTEGER NOT NULL DEFAULT 0,
+    rating_3 INTEGER NOT NULL DEFAULT 0,
+    rating_4 INTEGER NOT NULL DEFAULT 0,
+    rating_5 INTEGER NOT NULL DEFAULT 0,
+    rating_score FLOAT,
     owner_id CHAR(36) NOT NULL,
     created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
     updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
@@ -59,3 +68,24 @@ CREATE TABLE IF NOT EXISTS place_amenity (
     FOREIGN KEY (place_id) REFERENCES places(id) ON DELETE CASCADE,
     FOREIGN KEY (amenity_id) REFERENCES amenities(id) ON DELETE CASCADE
 );
+
+
+"""Revoked_Tokens Table (JWT blocklist)"""
+CREATE TABLE IF NOT EXISTS revoked_tokens (
+    jti CHAR(36) PRIMARY KEY,
+    expires_at TIMESTAMP NOT NULL,
+    revoked_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+
+
+"""Indexes"""
+CREATE INDEX ix_places_owner_id ON places(owner_id);
+CREATE INDEX ix_places_title ON places(title);
+CREATE INDEX ix_places_price_id ON places(price, id);
+CREATE INDEX ix_places_created_at_id ON places(created_at, id);
+CREATE INDEX ix_places_geocell ON places(geocell);
+CREATE INDEX ix_places_rating_score_id ON places(rating_score, id);
+CREATE INDEX ix_reviews_place_id ON reviews(place_id);
+CREATE INDEX ix_revoked_tokens_expires_at ON revoked_tokens(expires_at);
+CREATE INDEX ix_revoked_tokens_revoked_at ON revoked_tokens(revoked_at);
+CREATE INDEX ix_place_amenity_amenity_id ON place_amenity(amenity_id, place_id);
@@ -178,28 +178,38 @@ function checkAuthentication() {
     fetchPlaces(token);
 }
 
-async function fetchPlaces(token) {
+async function fetchPlaces(token, maxPrice = 'all') {
     try {
         const headers = { 'Content-Type': 'application/json' };
         if (token) headers['Authorization'] = `Bearer ${token}`;
 
-        const response = await fetch(`${API_BASE_URL}/api/v1/places/`, {
-            method: 'GET',
-            headers: headers
+        // Filtre de prix appliqué par l'API (index sur le prix)
+        // Seuls les champs affichés par les cartes sont demandés
+        const params = new URLSearchParams({
+            sort: 'price', fields: 'id,title,price,description'
         });
+        if (maxPrice !== 'all') params.set('max_price', maxPrice);
+
+        // L'API pagine (50 par défaut) : on suit X-Next-Cursor jusqu'au bout
+        const places = [];
+        let cursor = null;
+        do {
+            if (cursor) params.set('after', cursor);
+            const response = await fetch(`${API_BASE_URL}/api/v1/places/?${params}`, {
+                method: 'GET',
+                headers: headers
+            });
 
-        if (!response.ok) throw new Error('Failed to load places.');
+            if (!response.ok) throw new Error('Failed to load places.');
 
-        const data = await response.json();
-        console.log('✓ Places received:', data);
+            const data = await response.json();
+            if (!Array.isArray(data)) throw new Error('Invalid data format.');
+            places.push(...data);
+            cursor = response.headers.get('X-Next-Cursor');
+        } while (cursor);
 
-        if (Array.isArray(data)) {
-            displayPlaces(data);
-        } else if (data.places && Array.isArray(data.places)) {
-            displayPlaces(data.places);
-        } else {
-            throw new Error('Invalid data format.');
-        }
+        console.log('✓ Places received:', places);
+        displayPlaces(places);
     } catch (error) {
         console.error('Error:', error);
         displayMessage('Failed to load places. ' + error.message, 'error');
@@ -224,12 +234,12 @@ function displayPlaces(places) {
 
         const img = document.createElement('img');
         img.src = place.image_url || '/static/images/default.png';
-        img.alt = place.name || 'Place';
+        img.alt = place.title || place.name || 'Place';
         img.classList.add('place-image');
         card.appendChild(img);
 
         const title = document.createElement('h3');
-        title.textContent = place.name || 'Unnamed place';
+        title.textContent = place.title || place.name || 'Unnamed place';
         card.appendChild(title);
 
         const price = document.createElement('p');
@@ -257,11 +267,7 @@ function displayPlaces(places) {
 }
 
 function filterPlacesByPrice(maxPrice) {
-    const cards = document.querySelectorAll('.place-card');
-    cards.forEach(card => {
-        const price = parseFloat(card.getAttribute('data-price')) || 0;
-        card.style.display = (maxPrice === 'all' || price <= parseFloat(maxPrice)) ? 'flex' : 'none';
-    });
+    fetchPlaces(getCookie('access_token'), maxPrice);
 }
 
 // ============================================
@@ -296,7 +302,9 @@ async function fetchPlaceDetails(token, placeId) {
         const headers = { 'Content-Type': 'application/json' };
         if (token) headers['Authorization'] = `Bearer ${token}`;
 
-        const response = await fetch(`${API_BASE_URL}/api/v1/places/${placeId}`, {
+        // Hôte, équipements et avis intégrés : une seule requête
+        const params = new URLSearchParams({ expand: 'owner,amenities,reviews' });
+        const response = await fetch(`${API_BASE_URL}/api/v1/places/${placeId}?${params}`, {
             method: 'GET',
             headers: headers
         });
@@ -318,7 +326,7 @@ async function fetchPlaceDetails(token, placeId) {
 function displayPlaceDetails(place) {
     const el = (id) => document.getElementById(id);
 
-    if (el('place-title')) el('place-title').textContent = place.name || 'Unnamed';
+    if (el('place-title')) el('place-title').textContent = place.title || place.name || 'Unnamed';
     if (el('host-name') && place.owner) {
         el('host-name').textContent = `${place.owner.first_name || ''} ${place.owner.last_name || ''}`.trim();
     }
@@ -379,12 +387,12 @@ function checkAuthenticationOrRedirect() {
  */
 async function loadPlaceName(placeId) {
     try {
-        const response = await fetch(`${API_BASE_URL}/api/v1/places/${placeId}`);
+        const response = await fetch(`${API_BASE_URL}/api/v1/places/${placeId}?fields=id,title`);
         if (response.ok) {
             const place = await response.json();
             const placeNameEl = document.getElementById('place-name');
             if (placeNameEl) {
-                placeNameEl.textContent = `Review for: ${place.name || 'Unknown Place'}`;
+                placeNameEl.textContent = `Review for: ${place.title || place.name || 'Unknown Place'}`;
             }
         }
     } catch (error) {
@@ -13,6 +13,23 @@ from tests.test_user_endpoints import TestUserEndpoints
 from tests.test_amenity_endpoints import TestAmenityEndpoints
 from tests.test_place_endpoints import TestPlaceEndpoints
 from tests.test_review_endpoints import TestReviewEndpoints
+from tests.test_repository import TestSQLAlchemyRepository
+from tests.test_cache import TestLRUCache, TestFacadeEntityCache
+from tests.test_hashing import TestPasswordHasher
+from tests.test_jwt_cache import TestJWTClaimsCache
+from tests.test_auth import TestBloomFilter, TestTokenRevocation
+from tests.test_provisioning import TestUserProvisioning
+from tests.test_geo import TestGeoHelpers, TestPlaceGeoSearch
+from tests.test_place_filters import TestPlaceListFilters
+from tests.test_search import TestInMemoryTextSearch, TestPlaceSearch
+from tests.test_amenity_facets import TestAmenityFacets
+from tests.test_place_ratings import TestPlaceRatings
+from tests.test_top_places import TestTopPlaces
+from tests.test_etags import TestConditionalRequests, TestTableVersions
+from tests.test_response_cache import (
+    TestResponseCacheUnit, TestResponseCache)
+from tests.test_export import TestExport
+from tests.test_place_expansion import TestPlaceExpansion
 
 # Add the parent directory to the path so we can import the app
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -27,7 +44,29 @@ def create_test_suite():
         TestUserEndpoints,
         TestAmenityEndpoints,
         TestPlaceEndpoints,
-        TestReviewEndpoints
+        TestReviewEndpoints,
+        TestSQLAlchemyRepository,
+        TestLRUCache,
+        TestFacadeEntityCache,
+        TestPasswordHasher,
+        TestJWTClaimsCache,
+        TestBloomFilter,
+        TestTokenRevocation,
+        TestUserProvisioning,
+        TestGeoHelpers,
+        TestPlaceGeoSearch,
+        TestPlaceListFilters,
+        TestInMemoryTextSearch,
+        TestPlaceSearch,
+        TestAmenityFacets,
+        TestPlaceRatings,
+        TestTopPlaces,
+        TestConditionalRequests,
+        TestTableVersions,
+        TestResponseCacheUnit,
+        TestResponseCache,
+        TestExport,
+        TestPlaceExpansion
     ]
 
     for test_class in test_classes:
@@ -0,0 +1,93 @@
+"""Test module for amenity filtering and facet counts of places."""
+
+import unittest
+from sqlalchemy import event
+from app import create_app, db
+from app.services import facade
+
+
+class TestAmenityFacets(unittest.TestCase):
+    """Test cases for ?amenities= and GET /places/facets."""
+
+    LAYOUT = {
+        'Villa': (300, ['WiFi', 'Pool', 'AC']),
+        'Loft': (120, ['WiFi', 'AC']),
+        'Cabin': (80, ['WiFi']),
+        'Tent': (20, []),
+    }
+
+    def setUp(self):
+        self.app = create_app("config.TestingConfig")
+        self.client = self.app.test_client()
+        self.ctx = self.app.app_context()
+        self.ctx.push()
+        db.create_all()
+        owner = facade.create_user({
+            'first_name': 'Facet', 'last_name': 'Owner',
+            'email': 'facet@example.com', 'password': 'secret'
+        })
+        self.amenities = {
+            name: facade.create_amenity({'name': name}).id
+            for name in ('WiFi', 'Pool', 'AC')
+        }
+        for title, (price, names) in self.LAYOUT.items():
+            place = facade.create_place({
+                'title': title, 'description': '', 'price': price,
+                'latitude': 0, 'longitude': 0, 'owner_id': owner.id
+            })
+            for name in names:
+                facade.add_amenity_to_place(place.id, self.amenities[name])
+
+    def tearDown(self):
+        db.session.remove()
+        db.drop_all()
+        self.ctx.pop()
+
+    def _ids(self, *names):
+        return ','.join(self.amenities[name] for name in names)
+
+    def test_filter_requires_every_amenity(self):
+        response = self.client.get(
+            f'/api/v1/places/?amenities={self._ids("WiFi", "AC")}'
+            '&sort=price')
+        self.assertEqual([p['title'] for p in response.get_json()],
+                         ['Loft', 'Villa'])
+
+    def test_filter_combines_with_price(self):
+        response = self.client.get(
+            f'/api/v1/places/?amenities={self._ids("WiFi")}&max_price=150'
+            '&sort=price')
+        self.assertEqual([p['title'] for p in response.get_json()],
+                         ['Cabin', 'Loft'])
+
+    def test_facets(self):
+        response = self.client.get('/api/v1/places/facets')
+        self.assertEqual(response.get_json(), {
+            'total': 4,
+            'amenities': [
+                {'id': self.amenities['WiFi'], 'name': 'WiFi', 'count': 3},
+                {'id': self.amenities['AC'], 'name': 'AC', 'count': 2},
+                {'id': self.amenities['Pool'], 'name': 'Pool', 'count': 1},
+            ]
+        })
+        response = self.client.get(
+            f'/api/v1/places/facets?amenities={self._ids("AC")}')
+        counts = {f['name']: f['count']
+                  for f in response.get_json()['amenities']}
+        self.assertEqual(counts, {'WiFi': 2, 'AC': 2, 'Pool': 1})
+
+    def test_facets_cost_a_fixed_number_of_queries(self):
+        facade.get_amenities(self.amenities.values())  # noms en cache
+        statements = []
+        event.listen(db.engine, 'before_cursor_execute',
+                     lambda *args: statements.append(args[2]))
+        facade.get_place_facets()
+        self.assertEqual(len(statements), 2)
+
+    def test_unknown_amenity(self):
+        response = self.client.get('/api/v1/places/?amenities=nope')
+        self.assertEqual(response.status_code, 400)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,113 @@
+"""Test module for refresh tokens and token revocation."""
+
+import time
+import unittest
+from app import create_app, db
+from app.services import facade
+from app.services.blocklist import BloomFilter, TokenBlocklist
+
+
+class TestBloomFilter(unittest.TestCase):
+    """Test cases for the Bloom filter of the blocklist."""
+
+    def test_no_false_negatives(self):
+        bloom = BloomFilter(size_bits=1 << 12, hashes=4)
+        items = [f'jti-{i}' for i in range(200)]
+        for item in items:
+            bloom.add(item)
+        self.assertTrue(all(item in bloom for item in items))
+        self.assertNotIn('never-added', BloomFilter(1 << 12, 4))
+
+
+class TestTokenRevocation(unittest.TestCase):
+    """Test cases for /auth/refresh, /auth/logout and the blocklist."""
+
+    def setUp(self):
+        self.app = create_app("config.TestingConfig")
+        self.client = self.app.test_client()
+        with self.app.app_context():
+            db.create_all()
+            facade.create_user({
+                'first_name': 'Jane', 'last_name': 'Doe',
+                'email': 'jane@example.com', 'password': 'secret'
+            })
+        response = self.client.post('/api/v1/auth/login', json={
+            'email': 'jane@example.com', 'password': 'secret'
+        })
+        self.tokens = response.get_json()
+
+    def _post(self, path, token):
+        return self.client.post(path,
+                                headers={'Authorization': f'Bearer {token}'})
+
+    def _get_protected(self, token):
+        return self.client.get('/api/v1/protected/',
+                               headers={'Authorization': f'Bearer {token}'})
+
+    def test_refresh_issues_access_token(self):
+        response = self._post('/api/v1/auth/refresh',
+                              self.tokens['refresh_token'])
+        self.assertEqual(response.status_code, 200)
+        access = response.get_json()['access_token']
+        self.assertEqual(self._get_protected(access).status_code, 200)
+
+    def test_access_token_cannot_refresh(self):
+        response = self._post('/api/v1/auth/refresh',
+                              self.tokens['access_token'])
+        self.assertEqual(response.status_code, 422)
+
+    def test_logout_revokes_token(self):
+        access = self.tokens['access_token']
+        self.assertEqual(self._get_protected(access).status_code, 200)
+        self.assertEqual(
+            self._post('/api/v1/auth/logout', access).status_code, 200)
+        self.assertEqual(self._get_protected(access).status_code, 401)
+
+    def test_revoked_refresh_token_is_rejected(self):
+        refresh = self.tokens['refresh_token']
+        self._post('/api/v1/auth/logout', refresh)
+        response = self._post('/api/v1/auth/refresh', refresh)
+        self.assertEqual(response.status_code, 401)
+
+    def test_unrevoked_tokens_skip_the_database(self):
+        self._get_protected(self.tokens['access_token'])
+        stats = facade.token_blocklist.stats()
+        self.assertGreaterEqual(stats['lookups'], 1)
+        self.assertEqual(stats['db_lookups'], 0)
+
+    def test_refresh_rebuilds_filter_from_table(self):
+        self._post('/api/v1/auth/logout', self.tokens['access_token'])
+        with self.app.app_context():
+            facade.token_blocklist.refresh()
+        self.assertEqual(facade.token_blocklist.stats()['bloom_items'], 1)
+        self.assertEqual(
+            self._get_protected(self.tokens['access_token']).status_code, 401)
+
+    def test_revocation_reaches_other_processes(self):
+        with self.app.app_context():
+            # Deux processus : chacun son filtre, la même table
+            worker_a = TokenBlocklist(facade.revoked_token_repo)
+            worker_b = TokenBlocklist(facade.revoked_token_repo)
+            self.assertFalse(worker_b.is_revoked('jti-1'))
+
+            worker_a.revoke('jti-1', int(time.time()) + 3600)
+            self.assertTrue(worker_b.is_revoked('jti-1'))
+            self.assertFalse(worker_b.is_revoked('jti-2'))
+            self.assertEqual(worker_b.stats()['syncs'], 3)
+
+    def test_sync_interval_bounds_the_queries(self):
+        now = [0.0]
+        with self.app.app_context():
+            blocklist = TokenBlocklist(facade.revoked_token_repo,
+                                       sync_interval=10,
+                                       clock=lambda: now[0])
+            for _ in range(3):
+                self.assertFalse(blocklist.is_revoked('jti-1'))
+            self.assertEqual(blocklist.stats()['syncs'], 1)
+            now[0] = 11
+            self.assertFalse(blocklist.is_revoked('jti-1'))
+            self.assertEqual(blocklist.stats()['syncs'], 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
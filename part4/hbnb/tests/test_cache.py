@@ -0,0 +1,75 @@
+"""Test module for the facade entity cache."""
+
+import unittest
+from sqlalchemy import event
+from app import create_app, db
+from app.services import facade
+from app.services.cache import LRUCache
+
+
+class TestLRUCache(unittest.TestCase):
+    """Test cases for the bounded LRU/TTL cache."""
+
+    def setUp(self):
+        self.now = 0
+        self.cache = LRUCache(maxsize=2, ttl=10, clock=lambda: self.now)
+
+    def test_evicts_least_recently_used(self):
+        self.cache.set('a', 1)
+        self.cache.set('b', 2)
+        self.cache.get('a')
+        self.cache.set('c', 3)
+        self.assertIsNone(self.cache.get('b'))
+        self.assertEqual(self.cache.get('a'), 1)
+        self.assertEqual(self.cache.stats()['evictions'], 1)
+
+    def test_entries_expire(self):
+        self.cache.set('a', 1)
+        self.now = 11
+        self.assertIsNone(self.cache.get('a'))
+        self.assertEqual(self.cache.stats()['misses'], 1)
+
+
+class TestFacadeEntityCache(unittest.TestCase):
+    """Test cases for read-through caching in HBnBFacade."""
+
+    def setUp(self):
+        self.app = create_app("config.TestingConfig")
+        self.ctx = self.app.app_context()
+        self.ctx.push()
+        db.create_all()
+        self.user = facade.create_user({
+            'first_name': 'Jane', 'last_name': 'Doe',
+            'email': 'jane@example.com', 'password': 'secret'
+        })
+        self.statements = []
+        event.listen(db.engine, 'before_cursor_execute', self._count)
+
+    def tearDown(self):
+        event.remove(db.engine, 'before_cursor_execute', self._count)
+        db.session.remove()
+        db.drop_all()
+        self.ctx.pop()
+
+    def _count(self, conn, cursor, statement, *args):
+        self.statements.append(statement)
+
+    def test_hit_does_not_query(self):
+        facade.get_user(self.user.id)
+        db.session.remove()
+        self.statements.clear()
+
+        user = facade.get_user(self.user.id)
+        self.assertEqual(user.first_name, 'Jane')
+        self.assertEqual(self.statements, [])
+        self.assertEqual(facade.cache.stats()['hits'], 1)
+
+    def test_update_invalidates(self):
+        facade.get_user(self.user.id)
+        facade.update_user(self.user.id, {'first_name': 'Janet'})
+        db.session.remove()
+        self.assertEqual(facade.get_user(self.user.id).first_name, 'Janet')
+
+
+if __name__ == '__main__':
+    unittest.main()
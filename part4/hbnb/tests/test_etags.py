@@ -0,0 +1,218 @@
+"""Test module for ETags and conditional requests."""
+
+import unittest
+from datetime import datetime
+from flask_jwt_extended import create_access_token
+from sqlalchemy import event, update
+from app import create_app, db
+from app.models import Amenity, Place
+from app.persistence.repository import ConcurrentUpdateError
+from app.persistence.versions import TableVersions
+from app.services import facade
+
+
+class TestConditionalRequests(unittest.TestCase):
+    """Test cases for If-None-Match on GET and If-Match on PUT."""
+
+    def setUp(self):
+        self.app = create_app("config.TestingConfig")
+        self.client = self.app.test_client()
+        self.ctx = self.app.app_context()
+        self.ctx.push()
+        db.create_all()
+        self.owner = facade.create_user({
+            'first_name': 'Etag', 'last_name': 'Owner',
+            'email': 'etag@example.com', 'password': 'secret'
+        })
+        self.guest = facade.create_user({
+            'first_name': 'Etag', 'last_name': 'Guest',
+            'email': 'guest@example.com', 'password': 'secret'
+        })
+        self.place = facade.create_place({
+            'title': 'Mill', 'description': '', 'price': 70,
+            'latitude': 0, 'longitude': 0, 'owner_id': self.owner.id
+        })
+        self.amenity = facade.create_amenity({'name': 'Sauna'})
+        db.session.commit()
+        self.owner_headers = self._auth(self.owner.id)
+        self.admin_headers = self._auth(self.owner.id, is_admin=True)
+
+    def tearDown(self):
+        db.session.remove()
+        db.drop_all()
+        self.ctx.pop()
+
+    def _auth(self, user_id, is_admin=False):
+        token = create_access_token(identity=user_id,
+                                    additional_claims={'is_admin': is_admin})
+        return {'Authorization': f'Bearer {token}'}
+
+    def _revalidate(self, url, etag):
+        return self.client.get(url, headers={'If-None-Match': etag})
+
+    def test_item_revalidation(self):
+        url = f'/api/v1/amenities/{self.amenity.id}'
+        first = self.client.get(url)
+        etag = first.headers['ETag']
+        self.assertTrue(etag.startswith('"'))
+
+        cached = self._revalidate(url, etag)
+        self.assertEqual(cached.status_code, 304)
+        self.assertEqual(cached.data, b'')
+        self.assertEqual(cached.headers['ETag'], etag)
+        self.assertEqual(self._revalidate(url, f'W/{etag}').status_code, 304)
+
+        facade.update_amenity(self.amenity.id, {'name': 'Steam room'})
+        db.session.commit()
+        fresh = self._revalidate(url, etag)
+        self.assertEqual(fresh.status_code, 200)
+        self.assertNotEqual(fresh.headers['ETag'], etag)
+
+    def test_place_etag_follows_rating_aggregates(self):
+        url = f'/api/v1/places/{self.place.id}'
+        etag = self.client.get(url).headers['ETag']
+        facade.create_review({'text': 'Calm', 'rating': 4,
+                              'user_id': self.guest.id,
+                              'place_id': self.place.id})
+        response = self._revalidate(url, etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.get_json()['review_count'], 1)
+
+    def test_list_revalidation_costs_no_query(self):
+        url = '/api/v1/places/?limit=10'
+        etag = self.client.get(url).headers['ETag']
+        self.assertNotEqual(
+            self.client.get('/api/v1/places/?limit=5').headers['ETag'], etag)
+
+        statements = []
+
+        def record(conn, cursor, statement, *args):
+            statements.append(statement)
+
+        event.listen(db.engine, 'before_cursor_execute', record)
+        try:
+            self.assertEqual(self._revalidate(url, etag).status_code, 304)
+        finally:
+            event.remove(db.engine, 'before_cursor_execute', record)
+        self.assertEqual(statements, [])
+
+        facade.create_place({
+            'title': 'Barn', 'description': '', 'price': 40,
+            'latitude': 0, 'longitude': 0, 'owner_id': self.owner.id
+        })
+        db.session.commit()
+        response = self._revalidate(url, etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.get_json()), 2)
+
+    def test_bulk_update_changes_list_etag(self):
+        url = '/api/v1/places/top'
+        etag = self.client.get(url).headers['ETag']
+        facade.create_review({'text': 'Calm', 'rating': 5,
+                              'user_id': self.guest.id,
+                              'place_id': self.place.id})
+        self.assertEqual(self._revalidate(url, etag).status_code, 200)
+
+    def test_if_match_guards_updates(self):
+        url = f'/api/v1/places/{self.place.id}'
+        etag = self.client.get(url).headers['ETag']
+
+        updated = self.client.put(
+            url, json={'title': 'Old mill'},
+            headers={**self.owner_headers, 'If-Match': etag})
+        self.assertEqual(updated.status_code, 200)
+        new_etag = updated.headers['ETag']
+        self.assertNotEqual(new_etag, etag)
+        self.assertEqual(self.client.get(url).headers['ETag'], new_etag)
+
+        stale = self.client.put(
+            url, json={'title': 'Lost update'},
+            headers={**self.owner_headers, 'If-Match': etag})
+        self.assertEqual(stale.status_code, 412)
+        self.assertEqual(self.client.get(url).get_json()['title'], 'Old mill')
+
+        for headers in ({}, {'If-Match': '*'}):
+            response = self.client.put(url, json={'title': 'Mill'},
+                                       headers={**self.owner_headers,
+                                                **headers})
+            self.assertEqual(response.status_code, 200)
+
+    def test_interleaved_updates_of_one_version(self):
+        url = f'/api/v1/places/{self.place.id}'
+        etag = self.client.get(url).headers['ETag']
+
+        # Un autre processus écrit entre la vérification de l'ETag,
+        # servie par le cache d'entités encore valide, et l'écriture
+        with db.engine.begin() as conn:
+            conn.execute(
+                update(Place.__table__).where(Place.id == self.place.id)
+                .values(title='Sawmill', updated_at=datetime(2030, 1, 1)))
+        self.assertEqual(facade.get_place(self.place.id).title, 'Mill')
+        stale = self.client.put(
+            url, json={'title': 'Lost update'},
+            headers={**self.owner_headers, 'If-Match': etag})
+        self.assertEqual(stale.status_code, 412)
+        db.session.expire_all()
+        self.assertEqual(db.session.get(Place, self.place.id).title,
+                         'Sawmill')
+
+        # Deux écritures de la même version : seule la première passe
+        version = datetime(2030, 1, 1)
+        facade.update_place(self.place.id, {'title': 'Watermill'}, version)
+        db.session.commit()
+        with self.assertRaises(ConcurrentUpdateError):
+            facade.update_place(self.place.id, {'title': 'Windmill'},
+                                version)
+        db.session.expire_all()
+        self.assertEqual(db.session.get(Place, self.place.id).title,
+                         'Watermill')
+
+    def test_if_match_on_amenity(self):
+        url = f'/api/v1/amenities/{self.amenity.id}'
+        response = self.client.put(
+            url, json={'name': 'Hammam'},
+            headers={**self.admin_headers, 'If-Match': '"stale"'})
+        self.assertEqual(response.status_code, 412)
+
+
+class TestTableVersions(unittest.TestCase):
+    """Test cases for the per-table write counters."""
+
+    def setUp(self):
+        self.app = create_app("config.TestingConfig")
+        self.ctx = self.app.app_context()
+        self.ctx.push()
+        db.create_all()
+
+    def tearDown(self):
+        db.session.remove()
+        db.drop_all()
+        self.ctx.pop()
+
+    def _add_amenity(self, name):
+        db.session.add(Amenity(name=name))
+        db.session.flush()
+
+    def test_commit_bumps_and_rollback_discards(self):
+        before = facade.get_table_version(Amenity)
+        self._add_amenity('Garden')
+        db.session.rollback()
+        self.assertEqual(facade.get_table_version(Amenity), before)
+        self._add_amenity('Garden')
+        db.session.commit()
+        self.assertNotEqual(facade.get_table_version(Amenity), before)
+
+    def test_versions_expire_with_ttl(self):
+        now = [0.0]
+        versions = TableVersions(ttl=60, clock=lambda: now[0])
+        version = versions.version('places')
+        now[0] = 59
+        self.assertEqual(versions.version('places'), version)
+        now[0] = 61
+        self.assertNotEqual(versions.version('places'), version)
+        self.assertNotEqual(TableVersions(ttl=60).version('places'),
+                            TableVersions(ttl=60).version('places'))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,101 @@
+"""Test module for the streamed NDJSON exports."""
+
+import json
+import unittest
+from flask_jwt_extended import create_access_token
+from app import create_app, db
+from app.models import Amenity
+from app.persistence.repository import InMemoryRepository
+from app.services import facade
+
+
+class TestExport(unittest.TestCase):
+    """Test cases for GET /places/export and /reviews/export."""
+
+    def setUp(self):
+        self.app = create_app("config.TestingConfig")
+        self.app.config['EXPORT_BATCH_SIZE'] = 2
+        self.client = self.app.test_client()
+        self.ctx = self.app.app_context()
+        self.ctx.push()
+        db.create_all()
+        owner = facade.create_user({
+            'first_name': 'Export', 'last_name': 'Owner',
+            'email': 'export@example.com', 'password': 'secret'
+        })
+        guest = facade.create_user({
+            'first_name': 'Export', 'last_name': 'Guest',
+            'email': 'guest@example.com', 'password': 'secret'
+        })
+        self.places = [facade.create_place({
+            'title': f'Place {i}', 'description': 'Quiet', 'price': 10 + i,
+            'latitude': 0, 'longitude': 0, 'owner_id': owner.id
+        }) for i in range(5)]
+        facade.create_review({'text': 'Nice', 'rating': 4,
+                              'user_id': guest.id,
+                              'place_id': self.places[0].id})
+        db.session.commit()
+        self.admin = self._auth(owner.id, True)
+
+    def tearDown(self):
+        db.session.remove()
+        db.drop_all()
+        self.ctx.pop()
+
+    def _auth(self, user_id, is_admin):
+        token = create_access_token(identity=user_id,
+                                    additional_claims={'is_admin': is_admin})
+        return {'Authorization': f'Bearer {token}'}
+
+    def test_requires_admin(self):
+        for url in ('/api/v1/places/export', '/api/v1/reviews/export'):
+            response = self.client.get(
+                url, headers=self._auth(self.places[0].owner_id, False))
+            self.assertEqual(response.status_code, 403)
+
+    def test_places_export(self):
+        response = self.client.get('/api/v1/places/export',
+                                   headers=self.admin)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.mimetype, 'application/x-ndjson')
+        rows = [json.loads(line) for line in response.data.splitlines()]
+        self.assertEqual([row['id'] for row in rows],
+                         sorted(place.id for place in self.places))
+        first = next(row for row in rows if row['id'] == self.places[0].id)
+        self.assertEqual(first['review_count'], 1)
+        self.assertIsInstance(first['created_at'], str)
+
+    def test_reviews_export(self):
+        response = self.client.get('/api/v1/reviews/export',
+                                   headers=self.admin)
+        rows = [json.loads(line) for line in response.data.splitlines()]
+        self.assertEqual(len(rows), 1)
+        self.assertEqual(rows[0]['rating'], 4)
+        self.assertEqual(rows[0]['place_id'], self.places[0].id)
+
+    def test_body_is_streamed_in_batches(self):
+        response = self.client.get('/api/v1/places/export',
+                                   headers=self.admin, buffered=False)
+        self.assertTrue(response.is_streamed)
+        chunks = iter(response.response)
+        self.assertEqual(next(chunks).count(b'\n'), 2)
+        self.assertEqual(sum(chunk.count(b'\n') for chunk in chunks), 3)
+        response.close()
+
+    def test_iter_all_keeps_the_identity_map_empty(self):
+        db.session.expunge_all()
+        rows = facade.iter_places(('id', 'title'), batch_size=2)
+        self.assertEqual(len(list(rows)), 5)
+        self.assertEqual(len(db.session.identity_map), 0)
+
+    def test_in_memory_iter_all(self):
+        repo = InMemoryRepository()
+        for name in ('b', 'a'):
+            amenity = Amenity(name=name)
+            amenity.id = name
+            repo.add(amenity)
+        self.assertEqual([a.id for a in repo.iter_all()], ['a', 'b'])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,114 @@
+"""Test module for geographic place search."""
+
+import unittest
+from sqlalchemy import text
+from app import create_app, db
+from app.geo import bbox_around, cell_ranges, geocell, haversine_km
+from app.persistence.migrations import upgrade_schema
+from app.services import facade
+
+
+class TestGeoHelpers(unittest.TestCase):
+    """Test cases for the helpers of app.geo."""
+
+    def test_haversine(self):
+        # Paris - Londres : environ 344 km
+        self.assertAlmostEqual(haversine_km(48.8566, 2.3522,
+                                            51.5074, -0.1278), 343.6,
+                               delta=1)
+
+    def test_bbox_wraps_antimeridian(self):
+        boxes = bbox_around(0, 179.9, 50)
+        self.assertEqual(len(boxes), 2)
+        self.assertEqual(boxes[0][3], 180.0)
+        self.assertEqual(boxes[1][1], -180.0)
+
+    def test_cell_ranges_cover_the_box(self):
+        ranges = cell_ranges(48.8, 2.2, 48.95, 2.45)
+        self.assertEqual(len(ranges), 2)
+        cell = geocell(48.86, 2.35)
+        self.assertTrue(any(lo <= cell <= hi for lo, hi in ranges))
+
+
+class TestPlaceGeoSearch(unittest.TestCase):
+    """Test cases for the near and bbox searches of GET /places/."""
+
+    PLACES = {
+        'Louvre': (48.8606, 2.3376),
+        'Versailles': (48.8049, 2.1204),
+        'Lyon': (45.7640, 4.8357),
+        'Fiji East': (-17.0, 179.95),
+        'Fiji West': (-17.0, -179.95),
+    }
+
+    def setUp(self):
+        self.app = create_app("config.TestingConfig")
+        self.client = self.app.test_client()
+        self.ctx = self.app.app_context()
+        self.ctx.push()
+        db.create_all()
+        owner = facade.create_user({
+            'first_name': 'Geo', 'last_name': 'Owner',
+            'email': 'geo@example.com', 'password': 'secret'
+        })
+        for title, (latitude, longitude) in self.PLACES.items():
+            facade.create_place({
+                'title': title, 'description': '', 'price': 100,
+                'latitude': latitude, 'longitude': longitude,
+                'owner_id': owner.id
+            })
+
+    def tearDown(self):
+        db.session.remove()
+        db.drop_all()
+        self.ctx.pop()
+
+    def _titles(self, query):
+        response = self.client.get(f'/api/v1/places/?{query}')
+        self.assertEqual(response.status_code, 200, response.get_json())
+        return [place['title'] for place in response.get_json()]
+
+    def test_near_sorts_by_distance_within_radius(self):
+        self.assertEqual(self._titles('near=48.8584,2.2945&radius_km=30'),
+                         ['Louvre', 'Versailles'])
+
+    def test_near_pages_follow_distance(self):
+        response = self.client.get(
+            '/api/v1/places/?near=48.8584,2.2945&radius_km=500&limit=2')
+        self.assertEqual([p['title'] for p in response.get_json()],
+                         ['Louvre', 'Versailles'])
+        cursor = response.headers['X-Next-Cursor']
+        self.assertEqual(
+            self._titles(f'near=48.8584,2.2945&radius_km=500&after={cursor}'),
+            ['Lyon'])
+
+    def test_near_crosses_antimeridian(self):
+        self.assertEqual(self._titles('near=-17,179.99&radius_km=20'),
+                         ['Fiji East', 'Fiji West'])
+
+    def test_bbox(self):
+        self.assertEqual(self._titles('bbox=45,2,49,5'),
+                         ['Lyon', 'Louvre', 'Versailles'])
+        self.assertCountEqual(self._titles('bbox=-18,179,-16,-179'),
+                              ['Fiji East', 'Fiji West'])
+
+    def test_invalid_parameters(self):
+        for query in ('near=1', 'near=100,0', 'near=0,0&radius_km=5000',
+                      'bbox=1,2,3', 'near=0,0&bbox=0,0,1,1',
+                      'bbox=-90,-180,90,180&limit=5', 'bbox=0,150,10,-170',
+                      'bbox=0,-170,10,170', 'bbox=0,-180,10,180'):
+            response = self.client.get(f'/api/v1/places/?{query}')
+            self.assertEqual(response.status_code, 400, query)
+
+    def test_upgrade_schema_backfills_geocell(self):
+        db.session.execute(text('DROP INDEX ix_places_geocell'))
+        db.session.execute(text('ALTER TABLE places DROP COLUMN geocell'))
+        db.session.commit()
+        self.assertEqual(upgrade_schema(),
+                         ['places.geocell', 'ix_places_geocell'])
+        self.assertEqual(self._titles('near=48.8584,2.2945&radius_km=30'),
+                         ['Louvre', 'Versailles'])
+
+
+if __name__ == '__main__':
+    unittest.main()
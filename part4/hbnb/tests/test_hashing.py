@@ -0,0 +1,76 @@
+"""Test module for the bcrypt worker pool."""
+
+import threading
+import unittest
+from flask_bcrypt import Bcrypt
+from app import create_app
+from app.hashing import PasswordHasher, PasswordHasherBusy
+
+
+class TestPasswordHasher(unittest.TestCase):
+    """Test cases for PasswordHasher."""
+
+    def setUp(self):
+        self.hasher = PasswordHasher(Bcrypt(), workers=1, queue_size=0,
+                                     rounds=4)
+
+    def test_hash_and_verify(self):
+        password_hash = self.hasher.hash('secret')
+        self.assertTrue(password_hash.startswith('$2b$04$'))
+        self.assertTrue(self.hasher.verify(password_hash, 'secret'))
+        self.assertFalse(self.hasher.verify(password_hash, 'wrong'))
+        self.assertFalse(self.hasher.verify('not-a-hash', 'secret'))
+        self.assertEqual(self.hasher.stats()['completed'], 4)
+
+    def test_needs_rehash(self):
+        password_hash = self.hasher.hash('secret')
+        self.assertFalse(self.hasher.needs_rehash(password_hash))
+        self.hasher.rounds = 5
+        self.assertTrue(self.hasher.needs_rehash(password_hash))
+        # Un coût trop élevé est ramené au coût configuré
+        self.hasher.rounds = 4
+        self.assertTrue(self.hasher.needs_rehash(
+            password_hash.replace('$04$', '$05$', 1)))
+
+    def test_calibrate_command(self):
+        app = create_app("config.TestingConfig")
+        result = app.test_cli_runner().invoke(
+            args=['calibrate-bcrypt', '--target-ms', '0'])
+        self.assertEqual(result.exit_code, 0, result.output)
+        self.assertIn("BCRYPT_LOG_ROUNDS=10 (currently 4)", result.output)
+        self.assertEqual(app.config['BCRYPT_LOG_ROUNDS'], 4)
+
+    def test_hash_many_uses_processes(self):
+        hasher = PasswordHasher(Bcrypt(), rounds=4, processes=2)
+        passwords = [f'secret{i}' for i in range(10)]
+        hashes = hasher.hash_many(passwords)
+        self.assertEqual(len(hashes), 10)
+        self.assertTrue(hasher.verify(hashes[7], 'secret7'))
+        self.assertEqual(hasher.stats()['completed'], 11)
+
+    def test_calibrate_stays_in_bounds(self):
+        self.assertEqual(self.hasher.calibrate(0, 4, 6), 4)
+        self.assertEqual(self.hasher.calibrate(10 ** 6, 4, 6), 6)
+
+    def test_rejects_when_full(self):
+        release = threading.Event()
+        started = threading.Event()
+
+        def block():
+            started.set()
+            release.wait()
+
+        worker = threading.Thread(target=self.hasher._submit, args=(block,))
+        worker.start()
+        started.wait()
+        try:
+            with self.assertRaises(PasswordHasherBusy):
+                self.hasher.hash('secret')
+            self.assertEqual(self.hasher.stats()['rejected'], 1)
+        finally:
+            release.set()
+            worker.join()
+
+
+if __name__ == '__main__':
+    unittest.main()
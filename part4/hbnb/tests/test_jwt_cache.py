@@ -0,0 +1,57 @@
+"""Test module for the verified JWT claims cache."""
+
+import inspect
+import unittest
+from datetime import timedelta
+from unittest import mock
+from flask_jwt_extended import JWTManager, create_access_token
+from app import create_app, db, jwt
+
+
+class TestJWTClaimsCache(unittest.TestCase):
+    """Test cases for CachingJWTManager."""
+
+    def setUp(self):
+        self.app = create_app("config.TestingConfig")
+        self.client = self.app.test_client()
+        with self.app.app_context():
+            db.create_all()
+            self.token = create_access_token(identity='user-1')
+        jwt.claims_cache.clear()
+
+    def _get(self, token):
+        return self.client.get('/api/v1/protected/',
+                               headers={'Authorization': f'Bearer {token}'})
+
+    def test_repeated_token_hits_cache(self):
+        for _ in range(3):
+            self.assertEqual(self._get(self.token).status_code, 200)
+        stats = jwt.claims_cache.stats()
+        self.assertEqual(stats['misses'], 1)
+        self.assertEqual(stats['hits'], 2)
+
+    def test_decode_hook_is_called(self):
+        # Le cache repose sur une méthode privée de flask-jwt-extended
+        base = inspect.signature(JWTManager._decode_jwt_from_config)
+        self.assertEqual(list(base.parameters), [
+            'self', 'encoded_token', 'csrf_value', 'allow_expired'])
+        with mock.patch.object(jwt, '_decode_jwt_from_config',
+                               wraps=jwt._decode_jwt_from_config) as hook:
+            self.assertEqual(self._get(self.token).status_code, 200)
+        hook.assert_called_once()
+
+    def test_tampered_token_is_rejected(self):
+        self._get(self.token)
+        tampered = self.token[:-2] + ('AA' if self.token[-2:] != 'AA' else 'BB')
+        self.assertEqual(self._get(tampered).status_code, 422)
+
+    def test_expired_token_is_not_cached(self):
+        with self.app.app_context():
+            token = create_access_token(identity='user-1',
+                                        expires_delta=timedelta(seconds=-1))
+        self.assertEqual(self._get(token).status_code, 401)
+        self.assertEqual(len(jwt.claims_cache), 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,142 @@
+"""Test module for sparse fieldsets and expansions on place endpoints."""
+
+import unittest
+from sqlalchemy import event
+from app import create_app, db
+from app.services import facade
+
+
+class TestPlaceExpansion(unittest.TestCase):
+    """Test cases for ?fields= and ?expand= on place endpoints."""
+
+    def setUp(self):
+        self.app = create_app("config.TestingConfig")
+        self.client = self.app.test_client()
+        self.ctx = self.app.app_context()
+        self.ctx.push()
+        db.create_all()
+        self.owner = facade.create_user({
+            'first_name': 'Expand', 'last_name': 'Owner',
+            'email': 'owner@example.com', 'password': 'secret'
+        })
+        self.guest = facade.create_user({
+            'first_name': 'Expand', 'last_name': 'Guest',
+            'email': 'guest@example.com', 'password': 'secret'
+        })
+        self.wifi = facade.create_amenity({'name': 'Wifi'})
+        self.place = self._place('Cabin')
+
+    def tearDown(self):
+        db.session.remove()
+        db.drop_all()
+        self.ctx.pop()
+
+    def _place(self, title):
+        place = facade.create_place({
+            'title': title, 'description': 'Quiet', 'price': 50,
+            'latitude': 0, 'longitude': 0, 'owner_id': self.owner.id
+        })
+        facade.add_amenity_to_place(place.id, self.wifi.id)
+        db.session.commit()
+        return place
+
+    def _count_queries(self, url):
+        statements = []
+
+        def record(conn, cursor, statement, *args):
+            statements.append(statement)
+
+        event.listen(db.engine, 'before_cursor_execute', record)
+        try:
+            response = self.client.get(url)
+        finally:
+            event.remove(db.engine, 'before_cursor_execute', record)
+        self.assertEqual(response.status_code, 200)
+        return len(statements)
+
+    def test_fields_select_the_returned_keys(self):
+        listed = self.client.get('/api/v1/places/?fields=title,owner_id')
+        self.assertEqual(listed.get_json(), [
+            {'title': 'Cabin', 'owner_id': self.owner.id}])
+
+        detail = self.client.get(
+            f'/api/v1/places/{self.place.id}?fields=id,rating_histogram')
+        self.assertEqual(detail.get_json(), {
+            'id': self.place.id,
+            'rating_histogram': {'1': 0, '2': 0, '3': 0, '4': 0, '5': 0}})
+
+    def test_default_view_is_unchanged(self):
+        body = self.client.get('/api/v1/places/').get_json()
+        self.assertEqual(set(body[0]), {'id', 'title', 'price',
+                                        'review_count', 'average_rating'})
+
+    def test_unknown_field_or_relation(self):
+        for query in ('fields=title,password', 'expand=owner,guests'):
+            for url in ('/api/v1/places/', f'/api/v1/places/{self.place.id}'):
+                response = self.client.get(f'{url}?{query}')
+                self.assertEqual(response.status_code, 400)
+                self.assertIn('error', response.get_json())
+
+    def test_expand_embeds_relations(self):
+        facade.create_review({'text': 'Lovely', 'rating': 5,
+                              'user_id': self.guest.id,
+                              'place_id': self.place.id})
+        body = self.client.get(
+            f'/api/v1/places/{self.place.id}'
+            '?expand=owner,amenities,reviews').get_json()
+        self.assertEqual(body['title'], 'Cabin')
+        self.assertEqual(body['owner'], {'id': self.owner.id,
+                                         'first_name': 'Expand',
+                                         'last_name': 'Owner'})
+        self.assertEqual(body['amenities'],
+                         [{'id': self.wifi.id, 'name': 'Wifi'}])
+        self.assertEqual(len(body['reviews']), 1)
+        self.assertEqual(body['reviews'][0]['rating'], 5)
+        self.assertEqual(body['reviews'][0]['user']['last_name'], 'Guest')
+
+    def test_expansion_cost_does_not_grow_with_the_page(self):
+        url = '/api/v1/places/?expand=owner,amenities,reviews&limit=50'
+        places = [self.place] + [self._place(f'Hut {i}') for i in range(5)]
+        for place in places:
+            facade.create_review({'text': 'Fine', 'rating': 4,
+                                  'user_id': self.guest.id,
+                                  'place_id': place.id})
+        few = self._count_queries(url.replace('50', '1'))
+        self.assertEqual(self._count_queries(url), few)
+        self.assertEqual(len(self.client.get(url).get_json()), 6)
+
+    def test_relation_change_refreshes_expanded_views(self):
+        url = f'/api/v1/places/{self.place.id}?expand=amenities'
+        first = self.client.get(url)
+        plain_etag = self.client.get(
+            f'/api/v1/places/{self.place.id}').headers['ETag']
+        self.assertNotEqual(first.headers['ETag'], plain_etag)
+
+        facade.update_amenity(self.wifi.id, {'name': 'Fibre'})
+        db.session.commit()
+        response = self.client.get(
+            url, headers={'If-None-Match': first.headers['ETag']})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.get_json()['amenities'][0]['name'], 'Fibre')
+
+    def test_author_rename_refreshes_expanded_reviews(self):
+        facade.create_review({'text': 'Lovely', 'rating': 5,
+                              'user_id': self.guest.id,
+                              'place_id': self.place.id})
+        url = f'/api/v1/places/{self.place.id}?expand=reviews'
+        first = self.client.get(url)
+        self.assertEqual(first.get_json()['reviews'][0]['user']['last_name'],
+                         'Guest')
+
+        facade.update_user(self.guest.id, {'last_name': 'Visitor'})
+        db.session.commit()
+        response = self.client.get(
+            url, headers={'If-None-Match': first.headers['ETag']})
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response.headers['ETag'], first.headers['ETag'])
+        self.assertEqual(
+            response.get_json()['reviews'][0]['user']['last_name'], 'Visitor')
+
+
+if __name__ == '__main__':
+    unittest.main()
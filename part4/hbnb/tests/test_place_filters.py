@@ -0,0 +1,93 @@
+"""Test module for price filtering and sorting of the places list."""
+
+import unittest
+from datetime import datetime, timedelta
+from app import create_app, db
+from app.models.place import Place
+from app.services import facade
+
+
+class TestPlaceListFilters(unittest.TestCase):
+    """Test cases for min_price, max_price and sort on GET /places/."""
+
+    PRICES = [80, 20, 50, 50, 50, 120, 10]
+
+    def setUp(self):
+        self.app = create_app("config.TestingConfig")
+        self.client = self.app.test_client()
+        self.ctx = self.app.app_context()
+        self.ctx.push()
+        db.create_all()
+        owner = facade.create_user({
+            'first_name': 'Price', 'last_name': 'Owner',
+            'email': 'price@example.com', 'password': 'secret'
+        })
+        start = datetime(2024, 1, 1)
+        for i, price in enumerate(self.PRICES):
+            place = facade.create_place({
+                'title': f'Place {i}', 'description': '', 'price': price,
+                'latitude': 0, 'longitude': 0, 'owner_id': owner.id
+            })
+            place.created_at = start + timedelta(days=i)
+        db.session.commit()
+
+    def tearDown(self):
+        db.session.remove()
+        db.drop_all()
+        self.ctx.pop()
+
+    def _walk(self, query, limit=2):
+        """Follow X-Next-Cursor and return every item of every page."""
+        items, cursor = [], None
+        while True:
+            url = f'/api/v1/places/?{query}&limit={limit}'
+            if cursor:
+                url += f'&after={cursor}'
+            response = self.client.get(url)
+            self.assertEqual(response.status_code, 200, response.get_json())
+            items.extend(response.get_json())
+            cursor = response.headers.get('X-Next-Cursor')
+            if not cursor:
+                return items
+
+    def test_price_band_sorted_by_price(self):
+        items = self._walk('min_price=20&max_price=80&sort=price')
+        self.assertEqual([p['price'] for p in items],
+                         [20, 50, 50, 50, 80])
+        self.assertEqual(len({p['id'] for p in items}), 5)
+
+    def test_descending_price(self):
+        items = self._walk('sort=-price')
+        self.assertEqual([p['price'] for p in items],
+                         sorted(self.PRICES, reverse=True))
+
+    def test_sort_by_created_at(self):
+        items = self._walk('sort=-created_at', limit=3)
+        self.assertEqual([p['title'] for p in items],
+                         [f'Place {i}' for i in range(6, -1, -1)])
+
+    def test_invalid_parameters(self):
+        for query in ('min_price=abc', 'max_price=-1', 'sort=title',
+                      'min_price=100&max_price=10'):
+            response = self.client.get(f'/api/v1/places/?{query}')
+            self.assertEqual(response.status_code, 400, query)
+
+    def test_cursor_of_another_sort_is_rejected(self):
+        response = self.client.get('/api/v1/places/?sort=price&limit=1')
+        cursor = response.headers['X-Next-Cursor']
+        response = self.client.get(f'/api/v1/places/?after={cursor}')
+        self.assertEqual(response.status_code, 400)
+
+    def test_price_page_uses_index(self):
+        query = facade.place_repo.project(('id', 'price')).filter(
+            Place.price >= 20).order_by(Place.price, Place.id)
+        sql = str(query.statement.compile(
+            compile_kwargs={'literal_binds': True}))
+        plan = db.session.execute(
+            db.text(f'EXPLAIN QUERY PLAN {sql}')).fetchall()
+        self.assertIn('ix_places_price_id', str(plan))
+        self.assertNotIn('TEMP B-TREE', str(plan))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,141 @@
+"""Test module for the denormalized rating aggregates of places."""
+
+import unittest
+from sqlalchemy import text
+from app import create_app, db
+from app.models.place import Place
+from app.persistence.migrations import upgrade_schema
+from app.services import facade
+from app.services.repositories.place_repository import RATING_COLUMNS
+
+
+class TestPlaceRatings(unittest.TestCase):
+    """Test cases for review_count, rating_sum and the rating histogram."""
+
+    def setUp(self):
+        self.app = create_app("config.TestingConfig")
+        self.client = self.app.test_client()
+        self.ctx = self.app.app_context()
+        self.ctx.push()
+        db.create_all()
+        self.owner = facade.create_user({
+            'first_name': 'Rating', 'last_name': 'Owner',
+            'email': 'owner@example.com', 'password': 'secret'
+        })
+        self.users = [facade.create_user({
+            'first_name': 'Guest', 'last_name': str(i),
+            'email': f'guest{i}@example.com', 'password': 'secret'
+        }) for i in range(3)]
+        self.place = facade.create_place({
+            'title': 'Chalet', 'description': '', 'price': 90,
+            'latitude': 45.9, 'longitude': 6.9, 'owner_id': self.owner.id
+        })
+
+    def tearDown(self):
+        db.session.remove()
+        db.drop_all()
+        self.ctx.pop()
+
+    def _review(self, user, rating):
+        return facade.create_review({
+            'text': 'Stay', 'rating': rating,
+            'user_id': user.id, 'place_id': self.place.id
+        })
+
+    def _stored(self):
+        """Read the aggregates from the database, bypassing every cache."""
+        row = db.session.execute(
+            db.select(*(getattr(Place, name) for name in RATING_COLUMNS))
+            .where(Place.id == self.place.id)).one()
+        return dict(zip(RATING_COLUMNS, row))
+
+    def _expected(self, *ratings):
+        values = {'review_count': len(ratings), 'rating_sum': sum(ratings)}
+        for stars in range(1, 6):
+            values[f'rating_{stars}'] = ratings.count(stars)
+        return values
+
+    def test_review_writes_update_the_aggregates(self):
+        first = self._review(self.users[0], 5)
+        self._review(self.users[1], 3)
+        self.assertEqual(self._stored(), self._expected(5, 3))
+
+        facade.update_review(first.id, {'rating': 2})
+        self.assertEqual(self._stored(), self._expected(2, 3))
+
+        facade.delete_review(first.id)
+        self.assertEqual(self._stored(), self._expected(3))
+
+    def test_bulk_review_creation_updates_the_aggregates(self):
+        _, errors = facade.create_reviews([
+            {'text': 'Stay', 'rating': rating, 'user_id': user.id,
+             'place_id': self.place.id}
+            for user, rating in zip(self.users, (4, 4, 1))
+        ])
+        self.assertEqual(errors, [])
+        self.assertEqual(self._stored(), self._expected(4, 4, 1))
+
+    def test_bulk_reviews_reject_own_place_and_duplicates(self):
+        self._review(self.users[0], 5)
+        rows = [
+            {'text': 'Stay', 'rating': 4, 'user_id': user.id,
+             'place_id': self.place.id}
+            for user in (self.owner, self.users[0], self.users[1],
+                         self.users[1])
+        ]
+        reviews, errors = facade.create_reviews(rows)
+        self.assertEqual(reviews, [])
+        self.assertEqual(errors, [
+            {'index': 0, 'error': "You cannot review your own place"},
+            {'index': 1, 'error': "You have already reviewed this place"},
+            {'index': 3, 'error': "You have already reviewed this place"},
+        ])
+        self.assertEqual(self._stored(), self._expected(5))
+
+    def test_place_responses_expose_the_aggregates(self):
+        self._review(self.users[0], 5)
+        self._review(self.users[1], 4)
+        detail = self.client.get(f'/api/v1/places/{self.place.id}')
+        body = detail.get_json()
+        self.assertEqual(body['review_count'], 2)
+        self.assertEqual(body['average_rating'], 4.5)
+        self.assertEqual(body['rating_histogram'],
+                         {'1': 0, '2': 0, '3': 0, '4': 1, '5': 1})
+
+        listed = self.client.get('/api/v1/places/').get_json()
+        self.assertEqual(listed[0]['review_count'], 2)
+        self.assertEqual(listed[0]['average_rating'], 4.5)
+
+    def test_place_without_reviews(self):
+        body = self.client.get(f'/api/v1/places/{self.place.id}').get_json()
+        self.assertEqual(body['review_count'], 0)
+        self.assertIsNone(body['average_rating'])
+
+    def test_repair_recomputes_drifted_aggregates(self):
+        self._review(self.users[0], 5)
+        self._review(self.users[1], 2)
+        db.session.execute(text(
+            "UPDATE places SET review_count = 9, rating_sum = 1, rating_5 = 0"))
+        db.session.commit()
+
+        result = self.app.test_cli_runner().invoke(args=['repair-ratings'])
+        self.assertIn('Recomputed rating aggregates of 1 place(s)',
+                      result.output)
+        self.assertEqual(self._stored(), self._expected(5, 2))
+        body = self.client.get(f'/api/v1/places/{self.place.id}').get_json()
+        self.assertEqual(body['review_count'], 2)
+
+    def test_upgrade_schema_backfills_the_aggregates(self):
+        self._review(self.users[0], 4)
+        self._review(self.users[1], 4)
+        for name in RATING_COLUMNS:
+            db.session.execute(text(f'ALTER TABLE places DROP COLUMN {name}'))
+        db.session.commit()
+        self.assertEqual(upgrade_schema(),
+                         [f'places.{name}' for name in RATING_COLUMNS])
+        db.session.expire_all()
+        self.assertEqual(self._stored(), self._expected(4, 4))
+
+
+if __name__ == '__main__':
+    unittest.main()
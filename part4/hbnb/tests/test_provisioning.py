@@ -0,0 +1,96 @@
+"""Test module for bulk user provisioning."""
+
+import json
+import os
+import tempfile
+import unittest
+from unittest import mock
+from flask_jwt_extended import create_access_token
+from app import create_app, db, password_hasher
+from app.hashing import PasswordHasherBusy
+from app.services import facade
+
+
+class TestUserProvisioning(unittest.TestCase):
+    """Test cases for provision_users, its endpoint and CLI command."""
+
+    def setUp(self):
+        self.app = create_app("config.TestingConfig")
+        self.ctx = self.app.app_context()
+        self.ctx.push()
+        db.create_all()
+        facade.create_user({'first_name': 'Old', 'last_name': 'User',
+                            'email': 'old@example.com', 'password': 'pw'})
+
+    def tearDown(self):
+        db.session.remove()
+        db.drop_all()
+        self.ctx.pop()
+
+    @staticmethod
+    def _row(i, **extra):
+        row = {'first_name': f'User{i}', 'last_name': 'Test',
+               'email': f'user{i}@example.com', 'password': f'pw{i}'}
+        row.update(extra)
+        return row
+
+    def test_valid_rows_are_created_and_rejects_reported(self):
+        rows = [self._row(i) for i in range(10)]
+        rows[2] = self._row(2, email='old@example.com')
+        rows[4] = self._row(1)
+        rows[6] = self._row(6, password='')
+        rows[8] = 'not an object'
+        ids, errors = facade.provision_users(rows, batch_size=3)
+
+        self.assertEqual(len(ids), 6)
+        self.assertEqual([e['index'] for e in errors], [2, 4, 6, 8])
+        self.assertEqual(errors[0]['error'], "Email already registered")
+        user = facade.get_user_by_email('user9@example.com')
+        self.assertTrue(user.verify_password('pw9'))
+
+    def test_endpoint_requires_admin(self):
+        token = create_access_token(identity='someone')
+        response = self.app.test_client().post(
+            '/api/v1/users/provision', json=[self._row(1)],
+            headers={'Authorization': f'Bearer {token}'})
+        self.assertEqual(response.status_code, 403)
+
+    def test_endpoint_reports_rows(self):
+        token = create_access_token(identity='admin',
+                                    additional_claims={'is_admin': True})
+        response = self.app.test_client().post(
+            '/api/v1/users/provision',
+            json=[self._row(1), self._row(2, email='bad')],
+            headers={'Authorization': f'Bearer {token}'})
+        self.assertEqual(response.status_code, 201)
+        body = response.get_json()
+        self.assertEqual(body['created'], 1)
+        self.assertEqual(body['errors'][0]['index'], 1)
+
+    def test_endpoint_busy_hasher(self):
+        token = create_access_token(identity='admin',
+                                    additional_claims={'is_admin': True})
+        with mock.patch.object(password_hasher, 'hash_many',
+                               side_effect=PasswordHasherBusy('Busy')):
+            response = self.app.test_client().post(
+                '/api/v1/users/provision', json=[self._row(1)],
+                headers={'Authorization': f'Bearer {token}'})
+        self.assertEqual(response.status_code, 503)
+        self.assertEqual(response.headers['Retry-After'], '1')
+        self.assertIsNone(facade.get_user_by_email('user1@example.com'))
+
+    def test_cli_command(self):
+        fd, path = tempfile.mkstemp(suffix='.json')
+        with os.fdopen(fd, 'w') as f:
+            json.dump([self._row(1), self._row(2)], f)
+        try:
+            result = self.app.test_cli_runner().invoke(
+                args=['provision-users', path])
+        finally:
+            os.remove(path)
+        self.assertEqual(result.exit_code, 0, result.output)
+        self.assertIn("Created 2 user(s), rejected 0", result.output)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,186 @@
+"""Test module for the SQLAlchemy repository layer."""
+
+import unittest
+from sqlalchemy import event, text
+from app import create_app, db
+from app.models.amenity import Amenity
+from app.persistence.migrations import upgrade_schema
+from app.persistence.repository import SQLAlchemyRepository, unit_of_work
+from app.services import facade
+
+
+class TestSQLAlchemyRepository(unittest.TestCase):
+    """Test cases for SQLAlchemyRepository on an in-memory database."""
+
+    def setUp(self):
+        self.app = create_app("config.TestingConfig")
+        self.client = self.app.test_client()
+        self.ctx = self.app.app_context()
+        self.ctx.push()
+        db.create_all()
+        self.amenity_repo = SQLAlchemyRepository(Amenity)
+        for name in ("WiFi", "Pool", "Parking", "Kitchen", "Garden"):
+            self.amenity_repo.add(Amenity(name=name))
+
+    def tearDown(self):
+        db.session.remove()
+        db.drop_all()
+        self.ctx.pop()
+
+    def test_get_page_walks_every_row_once(self):
+        seen = []
+        items, cursor = self.amenity_repo.get_page(2)
+        seen.extend(items)
+        while cursor:
+            items, cursor = self.amenity_repo.get_page(2, cursor)
+            seen.extend(items)
+        self.assertEqual([a.id for a in seen],
+                         sorted(a.id for a in self.amenity_repo.get_all()))
+
+    def test_get_page_rejects_bad_cursor(self):
+        with self.assertRaises(ValueError):
+            self.amenity_repo.get_page(2, "not-a-cursor")
+
+    def test_list_endpoint_sends_next_cursor(self):
+        response = self.client.get('/api/v1/amenities/?limit=3')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.get_json()), 3)
+        cursor = response.headers['X-Next-Cursor']
+
+        response = self.client.get(f'/api/v1/amenities/?limit=3&after={cursor}')
+        self.assertEqual(len(response.get_json()), 2)
+        self.assertNotIn('X-Next-Cursor', response.headers)
+
+    def test_get_page_projects_columns(self):
+        rows, _ = self.amenity_repo.get_page(10, columns=('name',))
+        self.assertEqual(len(rows), 5)
+        self.assertNotIsInstance(rows[0], Amenity)
+        self.assertEqual(rows[0]._fields, ('id', 'name'))
+
+    def test_get_many(self):
+        ids = [a.id for a in self.amenity_repo.get_all()[:3]]
+        found = self.amenity_repo.get_many(ids + ['unknown'])
+        self.assertEqual(set(found), set(ids))
+        self.assertEqual(facade.get_amenities(ids).keys(), found.keys())
+
+    def test_bulk_writes(self):
+        new = [Amenity(name=f"Extra {i}") for i in range(3)]
+        self.amenity_repo.add_many(new)
+        self.assertEqual(len(self.amenity_repo.get_all()), 8)
+
+        self.amenity_repo.update_many({new[0].id: {'name': 'Sauna'}})
+        self.assertEqual(self.amenity_repo.get(new[0].id).name, 'Sauna')
+
+        self.amenity_repo.delete_many([a.id for a in new])
+        self.assertEqual(len(self.amenity_repo.get_all()), 5)
+
+    def test_add_many_is_all_or_nothing(self):
+        with self.assertRaises(Exception):
+            self.amenity_repo.add_many([Amenity(name="Sauna"),
+                                        Amenity(name="WiFi")])
+        self.assertIsNone(self.amenity_repo.get_by_attribute('name', 'Sauna'))
+
+    def test_failed_bulk_write_keeps_the_unit_of_work(self):
+        with unit_of_work():
+            self.amenity_repo.add(Amenity(name="Sauna"))
+            with self.assertRaises(Exception):
+                self.amenity_repo.add_many([Amenity(name="Hammam"),
+                                            Amenity(name="WiFi")])
+            wifi = self.amenity_repo.get_by_attribute('name', 'WiFi')
+            with self.assertRaises(ValueError):
+                self.amenity_repo.update_many({wifi.id: {'name': ''}})
+            self.amenity_repo.add(Amenity(name="Jacuzzi"))
+        for name in ('Sauna', 'Jacuzzi', 'WiFi'):
+            self.assertIsNotNone(
+                self.amenity_repo.get_by_attribute('name', name))
+        self.assertIsNone(self.amenity_repo.get_by_attribute('name', 'Hammam'))
+
+    def test_bulk_create_checks_uniqueness_in_one_query(self):
+        created, errors = facade.create_amenities([
+            {'name': 'Sauna'}, {'name': 'WiFi'}, {'name': 'Sauna'},
+            {'name': ''}
+        ])
+        self.assertEqual(created, [])
+        self.assertEqual([e['index'] for e in errors], [1, 2, 3])
+        self.assertEqual(errors[0]['error'], "Amenity already exists")
+
+        statements = []
+
+        def record(conn, cursor, statement, *args):
+            if statement.startswith('SELECT'):
+                statements.append(statement)
+
+        event.listen(db.engine, 'before_cursor_execute', record)
+        try:
+            created, errors = facade.create_amenities(
+                [{'name': f'Extra {i}'} for i in range(20)])
+        finally:
+            event.remove(db.engine, 'before_cursor_execute', record)
+        self.assertEqual((len(created), errors), (20, []))
+        self.assertEqual(len(statements), 1)
+
+    def test_unit_of_work_rolls_back_every_write(self):
+        with self.assertRaises(RuntimeError):
+            with unit_of_work():
+                self.amenity_repo.add(Amenity(name="Sauna"))
+                self.amenity_repo.update(
+                    self.amenity_repo.get_by_attribute('name', 'WiFi').id,
+                    {'name': 'Fiber'})
+                raise RuntimeError("abort")
+        self.assertIsNone(self.amenity_repo.get_by_attribute('name', 'Sauna'))
+        self.assertIsNotNone(
+            self.amenity_repo.get_by_attribute('name', 'WiFi'))
+
+    def test_review_queries(self):
+        owner = facade.create_user({'first_name': 'Jane', 'last_name': 'Doe',
+                                    'email': 'jane@example.com',
+                                    'password': 'secret'})
+        guest = facade.create_user({'first_name': 'John', 'last_name': 'Doe',
+                                    'email': 'john@example.com',
+                                    'password': 'secret'})
+        place = facade.create_place({'title': 'Loft', 'description': '',
+                                     'price': 80, 'latitude': 10,
+                                     'longitude': 10, 'owner_id': owner.id})
+        facade.create_review({'text': 'Great', 'rating': 5,
+                              'user_id': guest.id, 'place_id': place.id})
+
+        self.assertEqual(len(facade.get_reviews_by_place(place.id)), 1)
+        self.assertEqual(len(facade.get_reviews_by_user(guest.id)), 1)
+        self.assertTrue(facade.has_reviewed_place(guest.id, place.id))
+        self.assertFalse(facade.has_reviewed_place(owner.id, place.id))
+        with self.assertRaises(Exception):
+            facade.create_review({'text': 'Again', 'rating': 4,
+                                  'user_id': guest.id, 'place_id': place.id})
+
+    def test_relationship_loading_strategies(self):
+        owner = facade.create_user({'first_name': 'Jane', 'last_name': 'Doe',
+                                    'email': 'jane@example.com',
+                                    'password': 'secret'})
+        place = facade.create_place({'title': 'Loft', 'description': '',
+                                     'price': 80, 'latitude': 10,
+                                     'longitude': 10, 'owner_id': owner.id})
+        place_id = place.id
+        facade.add_amenity_to_place(
+            place_id, self.amenity_repo.get_by_attribute('name', 'WiFi').id)
+        db.session.expunge_all()
+
+        loaded = facade.place_repo.get(place_id, load={'amenities': 'joined',
+                                                       'reviews': 'raise'})
+        self.assertEqual([a.name for a in loaded.amenities], ['WiFi'])
+        with self.assertRaises(Exception):
+            loaded.reviews
+        with self.assertRaises(ValueError):
+            facade.place_repo.get(place_id, load={'amenities': 'eager'})
+
+    def test_upgrade_schema_adds_missing_indexes(self):
+        db.session.execute(text('DROP INDEX ix_places_title'))
+        db.session.commit()
+        self.assertEqual(upgrade_schema(), ['ix_places_title'])
+        self.assertEqual(upgrade_schema(), [])
+
+        result = self.app.test_cli_runner().invoke(args=['upgrade-db'])
+        self.assertIn('Schema up to date', result.output)
+
+
+if __name__ == '__main__':
+    unittest.main()
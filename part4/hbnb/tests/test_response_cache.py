@@ -0,0 +1,144 @@
+"""Test module for the HTTP response cache of public GET endpoints."""
+
+import unittest
+from sqlalchemy import event
+from app import create_app, db
+from app.services import facade
+from app.services.cache import ResponseCache
+
+
+class TestResponseCacheUnit(unittest.TestCase):
+    """Test cases for ResponseCache on its own."""
+
+    def setUp(self):
+        self.now = [0.0]
+        self.cache = ResponseCache(maxsize=2, ttl=10,
+                                   clock=lambda: self.now[0])
+
+    def test_purge_by_surrogate_key(self):
+        self.cache.set('/places/a', 'A', ['places:a'])
+        self.cache.set('/places/', 'list', ['places'])
+        self.cache.purge_writes({'places'}, set())
+        self.assertIsNone(self.cache.get('/places/'))
+        self.assertEqual(self.cache.get('/places/a'), 'A')
+        self.cache.purge_writes(set(), {('places', 'a')})
+        self.assertIsNone(self.cache.get('/places/a'))
+
+    def test_size_bound_and_ttl(self):
+        for key in ('a', 'b', 'c'):
+            self.cache.set(key, key, ['t'])
+        self.assertIsNone(self.cache.get('a'))
+        self.assertEqual(self.cache.get('c'), 'c')
+        self.now[0] = 11
+        self.assertIsNone(self.cache.get('c'))
+
+    def test_response_built_during_a_purge_is_not_cached(self):
+        generation = self.cache.generation
+        self.cache.purge('places')
+        self.cache.set('/places/', 'stale', ['places'], generation)
+        self.assertIsNone(self.cache.get('/places/'))
+
+    def test_disabled(self):
+        cache = ResponseCache(maxsize=0)
+        cache.set('a', 'A', ['t'])
+        self.assertIsNone(cache.get('a'))
+
+
+class TestResponseCache(unittest.TestCase):
+    """Test cases for cached_response on the API endpoints."""
+
+    def setUp(self):
+        self.app = create_app("config.TestingConfig")
+        self.client = self.app.test_client()
+        self.ctx = self.app.app_context()
+        self.ctx.push()
+        db.create_all()
+        self.owner = facade.create_user({
+            'first_name': 'Cache', 'last_name': 'Owner',
+            'email': 'cache@example.com', 'password': 'secret'
+        })
+        self.guest = facade.create_user({
+            'first_name': 'Cache', 'last_name': 'Guest',
+            'email': 'guest@example.com', 'password': 'secret'
+        })
+        self.places = [facade.create_place({
+            'title': title, 'description': '', 'price': 60,
+            'latitude': 0, 'longitude': 0, 'owner_id': self.owner.id
+        }) for title in ('Dune', 'Cove')]
+        db.session.commit()
+        self.statements = []
+        event.listen(db.engine, 'before_cursor_execute', self._record)
+
+    def tearDown(self):
+        event.remove(db.engine, 'before_cursor_execute', self._record)
+        db.session.remove()
+        db.drop_all()
+        self.ctx.pop()
+
+    def _record(self, conn, cursor, statement, *args):
+        self.statements.append(statement)
+
+    def _get(self, url, **kwargs):
+        """GET url and return (response, number of SQL statements)."""
+        count = len(self.statements)
+        response = self.client.get(url, **kwargs)
+        return response, len(self.statements) - count
+
+    def _url(self, place):
+        return f'/api/v1/places/{place.id}'
+
+    def test_hits_skip_the_database(self):
+        for url in ('/api/v1/places/?limit=5', self._url(self.places[0]),
+                    '/api/v1/places/top', '/api/v1/users/'):
+            first, queries = self._get(url)
+            self.assertGreater(queries, 0, url)
+            second, queries = self._get(url)
+            self.assertEqual(queries, 0, url)
+            self.assertEqual(second.data, first.data)
+            self.assertEqual(second.headers['ETag'], first.headers['ETag'])
+
+            cached, queries = self._get(
+                url, headers={'If-None-Match': first.headers['ETag']})
+            self.assertEqual(cached.status_code, 304)
+            self.assertEqual(queries, 0)
+
+    def test_query_parameter_order_shares_the_entry(self):
+        self._get('/api/v1/places/?limit=5&sort=price')
+        _, queries = self._get('/api/v1/places/?sort=price&limit=5')
+        self.assertEqual(queries, 0)
+
+    def test_place_update_purges_its_pages_only(self):
+        dune, cove = self.places
+        for url in ('/api/v1/places/', self._url(dune), self._url(cove)):
+            self._get(url)
+        facade.update_place(dune.id, {'title': 'Dune house'})
+        db.session.commit()
+
+        hits = facade.response_cache.stats()['hits']
+        response, _ = self._get(self._url(dune))
+        self.assertEqual(response.get_json()['title'], 'Dune house')
+        response, _ = self._get('/api/v1/places/')
+        self.assertIn('Dune house', [p['title'] for p in response.get_json()])
+        self.assertEqual(facade.response_cache.stats()['hits'], hits)
+        self._get(self._url(cove))
+        self.assertEqual(facade.response_cache.stats()['hits'], hits + 1)
+
+    def test_review_purges_the_place_aggregates(self):
+        dune = self.places[0]
+        self._get(self._url(dune))
+        self._get(f'{self._url(dune)}/reviews')
+        facade.create_review({'text': 'Windy', 'rating': 3,
+                              'user_id': self.guest.id, 'place_id': dune.id})
+        body = self._get(self._url(dune))[0].get_json()
+        self.assertEqual(body['review_count'], 1)
+        reviews = self._get(f'{self._url(dune)}/reviews')[0].get_json()
+        self.assertEqual([r['text'] for r in reviews], ['Windy'])
+
+    def test_errors_are_not_cached(self):
+        self._get('/api/v1/places/missing')
+        _, queries = self._get('/api/v1/places/missing')
+        self.assertGreater(queries, 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
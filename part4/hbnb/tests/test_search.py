@@ -0,0 +1,149 @@
+"""Test module for full-text search over places."""
+
+import unittest
+from types import SimpleNamespace
+from unittest.mock import patch
+from sqlalchemy import text
+from app import create_app, db
+from app.persistence.migrations import upgrade_schema
+from app.persistence.repository import (
+    InMemoryRepository, SQLAlchemyRepository
+)
+from app.services import facade
+
+
+class TestInMemoryTextSearch(unittest.TestCase):
+    """Test cases for the token index of InMemoryRepository."""
+
+    def setUp(self):
+        self.repo = InMemoryRepository(text_fields=('title', 'description'),
+                                       text_weights=(10.0, 1.0))
+        for obj_id, title, description in (
+                ('1', 'Beach house', 'Quiet place near the sea'),
+                ('2', 'City loft', 'Close to the beach and shops'),
+                ('3', 'Mountain chalet', 'Skiing and hiking')):
+            obj = SimpleNamespace(id=obj_id, title=title,
+                                  description=description)
+            self.repo.add(obj)
+            self.repo.index_text(obj)
+
+    def _ids(self, query, limit=10, after=None):
+        items, cursor = self.repo.search(query, limit, after)
+        return [obj.id for obj in items], cursor
+
+    def test_title_match_ranks_first(self):
+        self.assertEqual(self._ids('beach')[0], ['1', '2'])
+
+    def test_prefix_and_all_terms(self):
+        self.assertEqual(self._ids('ski')[0], ['3'])
+        self.assertEqual(self._ids('beach shop')[0], ['2'])
+
+    def test_pagination(self):
+        first, cursor = self._ids('beach', limit=1)
+        second, cursor = self._ids('beach', limit=1, after=cursor)
+        self.assertEqual(first + second, ['1', '2'])
+        self.assertIsNone(cursor)
+
+    def test_reindex_and_delete(self):
+        obj = self.repo.get('3')
+        obj.title = 'Beach chalet'
+        self.repo.index_text(obj)
+        self.assertEqual(self._ids('mountain')[0], [])
+        self.repo.delete('1')
+        self.assertEqual(self._ids('beach')[0], ['3', '2'])
+
+
+class TestPlaceSearch(unittest.TestCase):
+    """Test cases for GET /places/search on SQLite FTS5."""
+
+    def setUp(self):
+        self.app = create_app("config.TestingConfig")
+        self.client = self.app.test_client()
+        self.ctx = self.app.app_context()
+        self.ctx.push()
+        db.create_all()
+        self.owner = facade.create_user({
+            'first_name': 'Text', 'last_name': 'Owner',
+            'email': 'text@example.com', 'password': 'secret'
+        })
+        self.places = {}
+        for title, description in (
+                ('Beach house', 'Quiet place near the sea'),
+                ('City loft', 'Close to the beach and shops'),
+                ('Chalet à Chamonix', 'Skiing and hiking'),
+                ('Garden flat', 'Sunny terrace')):
+            self.places[title] = self._create(title, description)
+
+    def tearDown(self):
+        db.session.remove()
+        db.drop_all()
+        self.ctx.pop()
+
+    def _create(self, title, description):
+        return facade.create_place({
+            'title': title, 'description': description, 'price': 80,
+            'latitude': 0, 'longitude': 0, 'owner_id': self.owner.id
+        })
+
+    def _titles(self, query):
+        response = self.client.get(f'/api/v1/places/search?{query}')
+        self.assertEqual(response.status_code, 200, response.get_json())
+        return [place['title'] for place in response.get_json()]
+
+    def test_ranked_prefix_search(self):
+        self.assertEqual(self._titles('q=beach'), ['Beach house', 'City loft'])
+        self.assertEqual(self._titles('q=sho'), ['City loft'])
+        self.assertEqual(self._titles('q=chalet%20chamonix'),
+                         ['Chalet à Chamonix'])
+
+    def test_diacritics_are_ignored(self):
+        self.assertEqual(self._titles('q=a%20chamonix'),
+                         ['Chalet à Chamonix'])
+
+    def test_pagination(self):
+        response = self.client.get('/api/v1/places/search?q=beach&limit=1')
+        cursor = response.headers['X-Next-Cursor']
+        self.assertEqual(self._titles(f'q=beach&limit=1&after={cursor}'),
+                         ['City loft'])
+
+    def test_update_reindexes(self):
+        place_id = self.places['Garden flat'].id
+        facade.update_place(place_id, {'title': 'Garden by the beach'})
+        self.assertIn('Garden by the beach', self._titles('q=beach'))
+        self.assertEqual(self._titles('q=flat'), [])
+
+    def test_query_syntax_is_not_interpreted(self):
+        self.assertEqual(self._titles('q=beach%20OR%20%22NEAR('),
+                         [])
+        response = self.client.get('/api/v1/places/search?q=%20')
+        self.assertEqual(response.status_code, 400)
+
+    def test_upgrade_schema_builds_index(self):
+        db.session.execute(text('DROP TABLE places_fts'))
+        db.session.commit()
+        self.assertEqual(upgrade_schema(), ['places_fts'])
+        self.assertEqual(self._titles('q=garden'), ['Garden flat'])
+
+    def test_delete_many_drops_index_entries(self):
+        ids = [self.places['Beach house'].id, self.places['City loft'].id]
+        facade.place_repo.delete_many(ids)
+        count = db.session.execute(
+            text('SELECT COUNT(*) FROM places_fts')).scalar()
+        self.assertEqual(count, 2)
+        self.assertEqual(self._titles('q=beach'), [])
+
+    def test_like_fallback_without_fts(self):
+        db.session.execute(text('DROP TABLE places_fts'))
+        db.session.commit()
+        with patch.object(SQLAlchemyRepository, '_uses_fts',
+                          return_value=False):
+            place = self._create('Beach hut', 'Tiny')
+            facade.update_place(place.id, {'title': 'Beach cabin'})
+            self.assertEqual(self._titles('q=BEACH%20sho'), ['City loft'])
+            self.assertEqual(self._titles('q=beach%20cab'), ['Beach cabin'])
+            facade.place_repo.delete(place.id)
+            self.assertEqual(self._titles('q=cabin'), [])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,100 @@
+"""Test module for the Bayesian ranking of GET /places/top."""
+
+import unittest
+from app import create_app, db
+from app.models.place import Place
+from app.services import facade
+
+
+class TestTopPlaces(unittest.TestCase):
+    """Test cases for the maintained rating_score leaderboard."""
+
+    def setUp(self):
+        self.app = create_app("config.TestingConfig")
+        self.client = self.app.test_client()
+        self.ctx = self.app.app_context()
+        self.ctx.push()
+        db.create_all()
+        owner = facade.create_user({
+            'first_name': 'Top', 'last_name': 'Owner',
+            'email': 'top@example.com', 'password': 'secret'
+        })
+        self.users = [facade.create_user({
+            'first_name': 'Guest', 'last_name': str(i),
+            'email': f'guest{i}@example.com', 'password': 'secret'
+        }) for i in range(6)]
+        self.places = {title: facade.create_place({
+            'title': title, 'description': '', 'price': 50,
+            'latitude': 0, 'longitude': 0, 'owner_id': owner.id
+        }) for title in ('Single', 'Steady', 'Poor', 'Empty')}
+
+    def tearDown(self):
+        db.session.remove()
+        db.drop_all()
+        self.ctx.pop()
+
+    def _rate(self, title, *ratings):
+        return [facade.create_review({
+            'text': 'Stay', 'rating': rating, 'user_id': user.id,
+            'place_id': self.places[title].id
+        }) for user, rating in zip(self.users, ratings)]
+
+    def _top(self, query=''):
+        response = self.client.get(f'/api/v1/places/top{query}')
+        self.assertEqual(response.status_code, 200)
+        return response
+
+    def test_prior_outweighs_a_single_review(self):
+        self._rate('Single', 5)
+        self._rate('Steady', 5, 5, 4, 5, 5, 4)
+        self._rate('Poor', 1, 2)
+        body = self._top().get_json()
+        self.assertEqual([p['title'] for p in body],
+                         ['Steady', 'Single', 'Poor'])
+        # (5 * 3.0 + 28) / (5 + 6)
+        self.assertEqual(body[0]['score'], round(43 / 11, 3))
+        self.assertEqual(body[1]['average_rating'], 5.0)
+
+    def test_review_writes_move_places(self):
+        single = self._rate('Single', 5)[0]
+        self._rate('Poor', 4)
+        self.assertEqual(self._top().get_json()[0]['title'], 'Single')
+        facade.update_review(single.id, {'rating': 1})
+        self.assertEqual(self._top().get_json()[0]['title'], 'Poor')
+        facade.delete_review(single.id)
+        self.assertEqual([p['title'] for p in self._top().get_json()],
+                         ['Poor'])
+
+    def test_pagination(self):
+        self._rate('Single', 5)
+        self._rate('Steady', 4)
+        self._rate('Poor', 2)
+        first = self._top('?limit=2')
+        cursor = first.headers['X-Next-Cursor']
+        second = self._top(f'?limit=2&after={cursor}').get_json()
+        self.assertEqual([p['title'] for p in first.get_json() + second],
+                         ['Single', 'Steady', 'Poor'])
+        self.assertEqual(self.client.get(
+            '/api/v1/places/top?after=bad').status_code, 400)
+
+    def test_served_from_the_score_index(self):
+        query = facade.place_repo.project(('id', 'rating_score')).filter(
+            Place.rating_score.isnot(None)).order_by(
+                Place.rating_score.desc(), Place.id.desc()).limit(5)
+        sql = str(query.statement.compile(
+            compile_kwargs={'literal_binds': True}))
+        plan = db.session.execute(
+            db.text(f'EXPLAIN QUERY PLAN {sql}')).fetchall()
+        self.assertIn('ix_places_rating_score_id', str(plan))
+        self.assertNotIn('TEMP B-TREE', str(plan))
+
+    def test_repair_uses_the_configured_prior(self):
+        self._rate('Single', 5)
+        self.app.config['RATING_PRIOR_WEIGHT'] = 0
+        facade.init_app(self.app)
+        facade.recompute_place_ratings()
+        self.assertEqual(self._top().get_json()[0]['score'], 5.0)
+
+
+if __name__ == '__main__':
+    unittest.main()